@@ -0,0 +1,57 @@
+"""
+benchmark_led_resolver.py
+This script measures the LED_BUILTIN resolution for every variant header of a core.
+Usage: python pyScripts/benchmark_led_resolver.py ./esp_data/esp32-core-<version> [esp32]
+
+Part of repository: www.github.com/hredan/esp-board-overview
+Author: hredan
+Copyright (c) 2025 hredan
+"""
+import os
+import sys
+import time
+from collections.abc import Callable
+
+from helper.board_data import BoardList
+from helper.find_led_builtin_gpio import FindLedBuiltinGpio
+from helper.header_evaluator import HeaderEvaluator, HeaderScanner
+
+REPEAT = 20
+
+def line_mode(header_data: bytes, predefined: dict[str, int]) -> int:
+    """ Resolve LED_BUILTIN by lexing the header line by line """
+    evaluator = HeaderEvaluator(predefined)
+    for line in header_data.decode("utf8", errors="replace").splitlines():
+        gpio_led = evaluator.find_symbol(line, "LED_BUILTIN")
+        if gpio_led is not None:
+            return gpio_led
+    return -1
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+    core_path = sys.argv[1]
+    core_name = sys.argv[2] if len(sys.argv) > 2 else "esp32"
+    variants_path = os.path.join(core_path, "variants")
+    headers: list[bytes] = []
+    for entry in sorted(os.listdir(variants_path)):
+        header_path = os.path.join(variants_path, entry, "pins_arduino.h")
+        if os.path.isfile(header_path):
+            with open(header_path, "rb") as infile:
+                headers.append(infile.read())
+    led_finder = FindLedBuiltinGpio(core_path, core_name, BoardList())
+    print(f"variant headers: {len(headers)}")
+    modes: dict[str, Callable[[bytes], int]] = {
+        "line mode": lambda header: line_mode(header, led_finder.predefined),
+        "scan mode": lambda header: led_finder.find_led_gpio(HeaderScanner(header, led_finder.predefined)),
+    }
+    for mode, resolve in modes.items():
+        resolved = sum(1 for header in headers if resolve(header) != -1)
+        start = time.perf_counter()
+        for _ in range(REPEAT):
+            for header in headers:
+                resolve(header)
+        duration = (time.perf_counter() - start) / REPEAT
+        print(f"{mode}: resolved LED_BUILTIN: {resolved}, time per run: {duration * 1000:.2f} ms "
+              f"({duration / max(len(headers), 1) * 1e6:.1f} us/header)")
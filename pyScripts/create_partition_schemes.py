@@ -1,7 +1,10 @@
 """ Create esp32 board partition schemes from esp32 core """
 import os
 import json
+from typing import Any, cast
 from helper.index_data import get_core_list
+from helper.core_dialect import get_dialect
+from helper.partition_layout import SchemeLayouts, SchemeStore, read_partition_csv
 
 ESP_DATA_PATH = "./esp_data"
 
@@ -11,45 +14,25 @@ def load_scheme(scheme_name: str, version: str) -> list[dict[str, str]]:
     :param scheme_name: The name of the partition scheme to load.
     :return: The partition scheme data.
     """
-    csv_file_path = f"{ESP_DATA_PATH}/esp32-core-{version}/tools/partitions/{scheme_name}.csv"
+    core_directory = get_dialect("esp32").archive_directory(version)
+    csv_file_path = f"{ESP_DATA_PATH}/{core_directory}/tools/partitions/{scheme_name}.csv"
     if not os.path.exists(csv_file_path):
         print(f"Partition scheme file not found: {csv_file_path}")
         return []
 
-    with open(csv_file_path, 'r', encoding='utf-8') as csv_file:
-        csv_lines = csv_file.read().strip().split('\n')
-        partition_scheme: list[dict[str, str]] = []
-        for line in csv_lines:
-            #print (f"Line {index}: {line}")
-            if line.startswith('#') or not line.strip():
-                continue
-
-            parts = line.split(',')
-            if len(parts) < 5:
-                print(f"Invalid line in {scheme_name}.csv: {line}")
-                continue
-            name, type_, subtype, offset_, size_ = parts[:5]
-            partition_scheme.append({
-                "name": name.strip(),
-                "type": type_.strip(),
-                "subtype": subtype.strip(),
-                "offset": offset_.strip(),
-                "size": size_.strip()
-            })
-        if not partition_scheme:
-            print(f"No valid partition data found in {scheme_name}.csv")
-            return []
-        #print(f"Loaded partition scheme: {scheme_name}")
-        return partition_scheme
+    partition_scheme = read_partition_csv(csv_file_path)
+    if not partition_scheme:
+        print(f"No valid partition data found in {scheme_name}.csv")
+    return partition_scheme
 
 if __name__ == "__main__":
-    schemes = {}
+    schemes: dict[str, list[dict[str, str]]] = {}
     core_list = get_core_list()
     esp32_core = next((core for core in core_list if core["core_name"] == "esp32"), None)
     if esp32_core:
         with open(f"{ESP_DATA_PATH}/esp32_partitions.json", 'r', encoding='utf-8') \
             as file_board_partions:
-            board_partition = json.load(file_board_partions)
+            board_partition = cast(dict[str, dict[str, Any]], json.load(file_board_partions))
 
         for board, scheme_data in board_partition.items():
             if "schemes" in scheme_data:
@@ -67,6 +50,14 @@ if __name__ == "__main__":
                         esp32_core["installed_version"]
                     )
 
+        # each distinct layout is stored once, the build names are aliases of the layout ids
+        scheme_store = SchemeStore.from_schemes(schemes)
+        print(f"partition schemes: {len(scheme_store.aliases)}, distinct layouts: {len(scheme_store.layouts)}")
         PARTITION_SCHEMES_PATH = f"{ESP_DATA_PATH}/esp32_partition_schemes.json"
         with open(PARTITION_SCHEMES_PATH, 'w', encoding='utf-8') as file_out:
-            json.dump(schemes, file_out, ensure_ascii=False, indent=4)
+            file_out.write(scheme_store.to_json())
+
+        # computed sizes of the schemes and the boards offering them
+        scheme_layouts = SchemeLayouts.from_schemes(scheme_store.expand(), board_partition)
+        with open(f"{ESP_DATA_PATH}/esp32_scheme_layouts.json", 'w', encoding='utf-8') as file_out:
+            file_out.write(scheme_layouts.to_json())
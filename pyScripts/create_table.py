@@ -12,9 +12,12 @@ import json
 
 from helper.collecting_core_data import CollectingCoreData
 from helper.index_data import get_core_list
+from helper.core_dialect import get_dialect
+from helper.data_cache import DataCache
 
 if __name__ == "__main__":
     ESP_DATA_PATH = "./esp_data"
+    cache = DataCache(ESP_DATA_PATH)
     core_list_path = os.path.join(ESP_DATA_PATH, "core_list.json")
     core_info_list = get_core_list()
     with open(core_list_path, 'w', encoding='utf-8') as f:
@@ -23,16 +26,31 @@ if __name__ == "__main__":
     for core_info in core_info_list:
         core_name = core_info["core_name"]
         core_version = core_info["latest_version"]
-        if core_name == "esp8266":
-            core_data_path = f"./esp_data/{core_name}-{core_version}"
-        else:
-            core_data_path = f"./esp_data/{core_name}-core-{core_version}"
+        core_data_path = cache.get(get_dialect(core_name).archive_directory(core_version), version=core_version)
+        if core_data_path is None:
+            raise ValueError(f"Error: {core_name} {core_version} is not in the cache, run get_esp_data.py first")
         cd = CollectingCoreData(core_info["core_name"], core_info["installed_version"], core_data_path)
+        # the snapshot is reused by later runs as long as the core files are unchanged
+        snapshot_path = os.path.join(ESP_DATA_PATH, core_name + "_snapshot.pickle")
+        snapshot_loaded = cd.load_snapshot(snapshot_path)
         print(f"### core: {core_name} ###")
         print(f"number of boards: {len(cd.boards)}")
         print(f"number of boards without led: {cd.num_of_boards_without_led}")
+        print("boards per mcu: " + ", ".join(f"{mcu} {len(rows)}"
+                                             for mcu, rows in cd.board_table.group_by("mcu").items()))
+        print(f"number of partition schemes larger than flash: {len(cd.flash_mismatches)}")
         # save data in json file
         json_path = os.path.join(ESP_DATA_PATH, core_info['core_name'] + ".json")
         cd.boards_export_json(filename=json_path)
+        cd.search_index_export_json(filename=os.path.join(ESP_DATA_PATH, core_info['core_name'] \
+                                                          + "_search.json"))
         cd.partitions_export_json(filename=os.path.join(ESP_DATA_PATH, core_info['core_name'] \
                                                         + "_partitions.json"))
+        pin_files = cd.pins_export_json(os.path.join(ESP_DATA_PATH, core_info['core_name'] + "_pins"))
+        print(f"number of variant pin tables: {len(pin_files)}")
+        print("stage timings: " + ", ".join(f"{stage} {seconds * 1000:.1f} ms"
+                                            for stage, seconds in cd.timings.items()))
+        if not snapshot_loaded:
+            cd.save_snapshot(snapshot_path)
+    # the last use of the cores is updated for the eviction of get_esp_data.py
+    cache.save()
@@ -10,8 +10,17 @@ Copyright (c) 2025 hredan
 import re
 import os.path
 import json
+import time
+import argparse
+import sys
 
 from helper.collecting_core_data import CollectingCoreData
+from helper.core_watcher import CoreWatcher
+from helper.core_dialect import get_dialect
+from helper.core_discovery import discover_cores, collect_installed_cores
+
+# packages directory of the arduino-cli installed by Scripts/install_esp_cores.sh
+ARDUINO_PACKAGES_PATH = os.path.expanduser("~/.arduino15/packages")
 
 def get_installed_core_info(core_list_path_: str) -> list[dict[str, str]]:
     """
@@ -41,8 +50,77 @@ def get_installed_core_info(core_list_path_: str) -> list[dict[str, str]]:
         print(f"Error: could not find {core_list_path_}")
     return core_list
 
+def export_core_data(core_data_: CollectingCoreData, esp_data_path: str):
+    """
+    Write the json files of a core.
+    :param core_data_: collected core data
+    :param esp_data_path: output directory
+    """
+    core_data_.export_json(esp_data_path)
+
+def watch_cores(core_data_list: list[CollectingCoreData], esp_data_path: str, interval: float):
+    """
+    Poll the installed cores and rewrite the json files of a core after its files changed.
+    :param core_data_list: collected data of the watched cores, kept between iterations
+    :param esp_data_path: output directory
+    :param interval: poll interval in seconds
+    """
+    watchers = [(core_data_, CoreWatcher(core_data_.core_path)) for core_data_ in core_data_list]
+    print(f"watching {len(watchers)} core(s), press Ctrl+C to stop")
+    try:
+        while True:
+            time.sleep(interval)
+            for core_data_, watcher in watchers:
+                changed_files = watcher.poll()
+                if changed_files:
+                    start = time.perf_counter()
+                    core_data_.refresh(changed_files)
+                    export_core_data(core_data_, esp_data_path)
+                    duration = (time.perf_counter() - start) * 1000
+                    print(f"core: {core_data_.core_name}, changed files: {len(changed_files)}, "
+                          f"updated in {duration:.0f} ms")
+    except KeyboardInterrupt:
+        print("stopped watching")
+
+def collect_discovered_cores(data_path: str, esp_data_path: str, jobs: int | None):
+    """
+    Collect all cores installed in an Arduino data directory and write a combined report.
+    The json files of a core are named <core>-<version>, e.g. esp32-3.3.0.json.
+    :param data_path: Arduino data directory, e.g. ~/.arduino15
+    :param esp_data_path: output directory
+    :param jobs: number of worker processes
+    """
+    cores = discover_cores(data_path)
+    print(f"found {len(cores)} installed core(s) in {data_path}")
+    report = collect_installed_cores(cores, esp_data_path, jobs)
+    with open(os.path.join(esp_data_path, "installed_cores.json"), 'w', encoding='utf-8') as file:
+        json.dump(report, file, ensure_ascii=False, indent=4)
+    for entry in report:
+        core_id = f"{entry['packager']}:{entry['core_name']} {entry['version']}"
+        if "error" in entry:
+            print(f"{core_id}: {entry['error']}")
+        else:
+            print(f"{core_id}: boards: {entry['boards']}, without led: {entry['boards_without_led']}, "
+                  f"schemes larger than flash: {entry['flash_mismatches']}")
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Create the board tables from the installed cores.")
+    parser.add_argument("--watch", action="store_true",
+                        help="keep running and update the json files when the core files change")
+    parser.add_argument("--interval", type=float, default=0.5,
+                        help="poll interval in seconds for --watch (default: 0.5)")
+    parser.add_argument("--data-dir", default="",
+                        help="collect every core version installed in this Arduino data directory")
+    parser.add_argument("--jobs", type=int, default=None,
+                        help="number of worker processes for --data-dir (default: number of CPUs)")
+    args = parser.parse_args()
+    if args.data_dir and args.watch:
+        parser.error("--watch can not be combined with --data-dir")
+
     ESP_DATA_PATH = os.path.join(os.path.dirname(__file__), "../esp_data")
+    if args.data_dir:
+        collect_discovered_cores(args.data_dir, ESP_DATA_PATH, args.jobs)
+        sys.exit(0)
     # core_list.txt is created by Scripts/install_esp_cores.sh
     core_list_path = os.path.join(ESP_DATA_PATH, "core_list.txt")
     core_info_list = get_installed_core_info(core_list_path)
@@ -50,15 +128,17 @@ if __name__ == "__main__":
     core_list_path = os.path.join(ESP_DATA_PATH, "core_list.json")
     with open(core_list_path, 'w', encoding='utf-8') as f:
         json.dump(core_info_list, f, ensure_ascii=False, indent=4)
+    collected_cores: list[CollectingCoreData] = []
     for core_info in core_info_list:
         core_name = core_info["core_name"]
         core_version = core_info["installed_version"]
-        core_data_path = "/home/vscode/.arduino15/packages/" + \
-            f"{core_name}/hardware/{core_name}/{core_version}"
+        core_data_path = get_dialect(core_name).installed_path(ARDUINO_PACKAGES_PATH, core_version)
         core_data = CollectingCoreData(core_name, core_version, core_data_path)
         print(f"core: {core_name}")
         print(f"number of boards: {len(core_data.boards)}")
         print(f"number of boards without led: {core_data.num_of_boards_without_led}")
-        csv_path = os.path.join(ESP_DATA_PATH, core_name + ".csv")
-        json_path = os.path.join(ESP_DATA_PATH, core_name + ".json")
-        core_data.boards_export_json(filename=json_path)
+        print(f"number of partition schemes larger than flash: {len(core_data.flash_mismatches)}")
+        export_core_data(core_data, ESP_DATA_PATH)
+        collected_cores.append(core_data)
+    if args.watch:
+        watch_cores(collected_cores, ESP_DATA_PATH, args.interval)
@@ -7,44 +7,33 @@ Author: hredan
 Copyright (c) 2025 hredan
 """
 import os
-import shutil
-import urllib.request
-import json
 import zipfile
-
-
-def cleanup_directory(directory_path: str):
-    """
-    Remove the directory if it exists and create a new one.
-    :param directory_path: Path to the directory to be removed and created.
-    """
-    if os.path.exists(directory_path):
-        for filename in os.listdir(directory_path):
-            file_path = os.path.join(directory_path, filename)
-            if os.path.isfile(file_path) or os.path.islink(file_path):
-                os.unlink(file_path)
-            elif os.path.isdir(file_path):
-                shutil.rmtree(file_path)
-    else:
-        os.mkdir(directory_path)
-
-def download_file(url: str, save_path: str):
-    """
-    Download a file from a URL and save it to a specified path.
-    :param url: URL of the file to download.
-    :param save_path: Path where the downloaded file will be saved.
-    """
-    urllib.request.urlretrieve(url, save_path)
-    print(f"Downloaded {url} to {save_path}")
-
-def read_json_file(file_path: str):
+import asyncio
+import argparse
+
+from helper.chunked_download import ChunkOptions, ChunkedTransport
+from helper.core_catalog import CoreCatalog, load_core_catalog
+from helper.core_dialect import get_dialect
+from helper.data_cache import CACHE_INDEX_FILE, DEFAULT_MAX_BYTES, DataCache
+from helper.index_fetcher import AsyncFetcher
+from helper.index_stream import PlatformEntry, iter_platforms
+from helper.remote_zip import ArchiveSource, extract_remote_members
+from helper.verified_download import file_matches_checksum
+
+# prefix of the checksum of cores extracted with range requests, their archive was not verified
+PARTIAL_CHECKSUM_PREFIX = "partial:"
+
+def read_latest_platform(file_path: str) -> PlatformEntry:
     """
-    Read a JSON file and return its content.
-    :param file_path: Path to the JSON file.
-    :return: Content of the JSON file.
+    Stream a package index file and return the latest platform of the first package.
+    :param file_path: Path to the package index file.
+    :return: Latest platform entry.
     """
     with open(file_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+        platform = next(iter_platforms(f, latest_only=True), None)
+    if platform is None:
+        raise ValueError(f"Error: no platform found in {file_path}")
+    return platform
 
 def get_file_name_from_url(url: str):
     """
@@ -64,38 +53,175 @@ def extract_zip_file(zip_path: str, extract_to: str):
         zip_ref.extractall(extract_to)
         print(f"Extracted {zip_path} to {extract_to}")
 
-def get_esp_data(directory_path: str, url: str):
+def print_progress(url: str, received: int, total: int):
     """
-    Main function to get ESP data.
-    :param directory_path: Path to the directory where ESP data will be stored.
+    Print the progress of a chunked download.
+    :param url: URL of the download.
+    :param received: Received bytes.
+    :param total: Size of the file in bytes.
     """
+    print(f"Downloading {get_file_name_from_url(url)}: {received * 100 // total}% of {total} bytes")
 
-    index_file_name = get_file_name_from_url(url)
-    download_file(url, os.path.join(directory_path, index_file_name))
-
-    index_data = read_json_file(os.path.join(directory_path, index_file_name))
-    core = index_data["packages"][0]["name"]
-    last_core_version = index_data["packages"][0]["platforms"][0]["version"]
-    last_source_url = index_data["packages"][0]["platforms"][0]["url"]
-
-    archive_name = get_file_name_from_url(last_source_url)
-    download_file(last_source_url, os.path.join(directory_path, archive_name))
+def is_core_data_member(name: str) -> bool:
+    """
+    Check if a member of a core archive is needed to create the tables:
+    boards.txt, the headers of the variants and cores and the partition csv files.
+    :param name: member name, the first directory is the core directory, e.g. esp32-core-3.3.0
+    """
+    parts = name.split('/')[1:]
+    if parts == ["boards.txt"]:
+        return True
+    if not parts or not name.endswith((".h", ".csv")):
+        return False
+    if parts[0] == "variants":
+        return name.endswith(".h")
+    if parts[0] == "cores":
+        return len(parts) == 3 and name.endswith(".h")
+    return parts[:2] == ["tools", "partitions"] and len(parts) == 3 and name.endswith(".csv")
+
+def get_core_directory(platform: PlatformEntry) -> str:
+    """
+    Get the directory name of the extracted archive of a platform, e.g. esp32-core-3.3.0.
+    :param platform: Platform entry of the package index.
+    :return: Directory name.
+    """
+    return get_dialect(platform.package).archive_directory(platform.version)
 
-    extract_zip_file(os.path.join(directory_path, archive_name), directory_path)
+async def fetch_indexes(fetcher: AsyncFetcher, cache: DataCache, catalog: CoreCatalog) -> list[PlatformEntry]:
+    """
+    Download the package indexes of the catalog into the cache.
+    :return: Latest platform of each index in the order of the catalog.
+    """
+    index_paths = await fetcher.fetch_all([(entry.index_url, cache.get_path(entry.index_file_name))
+                                           for entry in catalog])
+    for entry in catalog:
+        cache.put(entry.index_file_name, url=entry.index_url)
+    return [read_latest_platform(index_path) for index_path in index_paths]
 
-    return core, last_core_version
+def adopt_unindexed_core(cache: DataCache, platform: PlatformEntry):
+    """
+    Add the extracted core of an esp_data directory without cache_index.json, e.g. of an older version,
+    to the cache if its archive matches the checksum of the index. Other cores are fetched again.
+    :param platform: Platform entry of the package index.
+    """
+    core_directory = get_core_directory(platform)
+    archive_name = get_file_name_from_url(platform.url)
+    if cache.has_index or not os.path.isdir(cache.get_path(core_directory)):
+        return
+    if file_matches_checksum(cache.get_path(archive_name), platform.checksum, platform.size):
+        cache.put(archive_name, platform.url, platform.version, platform.checksum)
+        cache.put(core_directory, platform.url, platform.version, platform.checksum)
+        print(f"Added {core_directory} of an esp_data directory without {CACHE_INDEX_FILE} to the cache")
+
+def get_missing_cores(cache: DataCache, platforms: list[PlatformEntry], partial: bool = False) -> list[PlatformEntry]:
+    """
+    Check the extracted cores of the cache, cores extracted from an archive with the checksum
+    of the index are reused, outdated or incomplete extractions are removed.
+    Cores extracted with range requests are only reused by partial fetches, a full fetch downloads
+    and verifies their archive.
+    :param partial: The cores are fetched with HTTP Range requests.
+    :return: Platforms whose core has to be fetched.
+    """
+    missing: list[PlatformEntry] = []
+    for platform in platforms:
+        core_directory = get_core_directory(platform)
+        adopt_unindexed_core(cache, platform)
+        checksums = {platform.checksum, PARTIAL_CHECKSUM_PREFIX + platform.checksum} if partial \
+            else {platform.checksum}
+        entry = cache.entries.get(core_directory)
+        if entry is None or entry.checksum not in checksums or cache.get(core_directory) is None:
+            cache.remove(core_directory)
+            missing.append(platform)
+        else:
+            print(f"Reused {core_directory} of the cache")
+    return missing
+
+async def fetch_cores(fetcher: AsyncFetcher, platforms: list[PlatformEntry], directory_path: str,
+                      partial: bool = False):
+    """
+    Download and extract the archives of the platforms.
+    :param partial: Only fetch the members needed for the tables with HTTP Range requests.
+    """
+    if partial:
+        member_lists = await asyncio.gather(*(asyncio.to_thread(
+            extract_remote_members, ArchiveSource(platform.url, platform.checksum, platform.size),
+            is_core_data_member, directory_path) for platform in platforms))
+        for platform, members in zip(platforms, member_lists):
+            print(f"Extracted {len(members)} members of {platform.url}")
+        return
+    archive_paths = await fetcher.fetch_platforms(platforms, directory_path)
+    for archive_path in fetcher.skipped:
+        print(f"Skipped download, {archive_path} matches the index checksum")
+    await asyncio.gather(*(asyncio.to_thread(extract_zip_file, archive_path, directory_path)
+                           for archive_path in archive_paths))
+
+def put_cores(cache: DataCache, platforms: list[PlatformEntry], partial: bool = False):
+    """
+    Add the fetched archives and extracted cores of the platforms to the cache.
+    Cores of a partial fetch without verified archive get the checksum with PARTIAL_CHECKSUM_PREFIX.
+    :param platforms: Platforms fetched by fetch_cores.
+    :param partial: The cores were fetched with HTTP Range requests.
+    """
+    for platform in platforms:
+        archive_name = get_file_name_from_url(platform.url)
+        archive_path = cache.get_path(archive_name)
+        # partial fetches only keep the archive if the server did not support range requests
+        verified = not partial or file_matches_checksum(archive_path, platform.checksum, platform.size)
+        if verified and os.path.isfile(archive_path):
+            cache.put(archive_name, platform.url, platform.version, platform.checksum)
+        checksum = platform.checksum if verified else PARTIAL_CHECKSUM_PREFIX + platform.checksum
+        cache.put(get_core_directory(platform), platform.url, platform.version, checksum)
+
+async def get_all_esp_data(cache: DataCache, catalog: CoreCatalog, concurrency: int = 4,
+                           partial: bool = False, chunks: int = 0) -> list[tuple[str, str]]:
+    """
+    Get the data of all cores in the catalog, indexes and archives are downloaded concurrently.
+    Cores of the cache extracted from an archive with the checksum of the index are reused and
+    least recently used entries are removed if the cache is larger than its byte budget.
+    :param cache: Cache in the directory where ESP data will be stored.
+    :param catalog: Core catalog with the package index URLs.
+    :param concurrency: Maximum number of parallel downloads.
+    :param partial: Only fetch the members of the archives needed for the tables with HTTP Range
+        requests, archives of servers without range support are downloaded completely.
+    :param chunks: Download each archive with this number of parallel range requests,
+        0 for a single stream per archive.
+    :return: List of core name and last version tuples.
+    """
+    try:
+        fetcher = AsyncFetcher(concurrency=concurrency)
+        # only the archives are fetched with parallel range requests, the indexes are small
+        archive_fetcher = AsyncFetcher(ChunkedTransport(options=ChunkOptions(num_chunks=chunks),
+                                                        progress=print_progress),
+                                       concurrency=concurrency) if chunks > 1 else fetcher
+        try:
+            platforms = await fetch_indexes(fetcher, cache, catalog)
+            missing = get_missing_cores(cache, platforms, partial)
+            await fetch_cores(archive_fetcher, missing, cache.cache_dir, partial)
+        finally:
+            fetcher.close()
+            archive_fetcher.close()
+        put_cores(cache, missing, partial)
+        for key in cache.evict():
+            print(f"Removed {key} from the cache")
+    finally:
+        cache.save()
+    return [(platform.package, platform.version) for platform in platforms]
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Download and extract the ESP core source data.")
+    parser.add_argument("--partial", action="store_true",
+                        help="only fetch boards.txt, headers and partition csv files of the archives "
+                             "with HTTP range requests")
+    parser.add_argument("--chunks", type=int, default=0,
+                        help="download each archive with this number of parallel range requests")
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_MAX_BYTES // 1024 ** 2,
+                        help="byte budget of the cache in MB, least recently used entries are removed")
+    args = parser.parse_args()
     ESP_DATA_PATH = "./esp_data"
 
-    index_list = [
-        "https://espressif.github.io/arduino-esp32/package_esp32_index.json",
-        "https://arduino.esp8266.com/stable/package_esp8266com_index.json"
-    ]
-
-    # Get ESP data
-    cleanup_directory(ESP_DATA_PATH)
-    for index_url in index_list:
-        core_name, last_version = get_esp_data(ESP_DATA_PATH, index_url)
+    # Get ESP data, indexes, archives and extracted cores are kept in the cache of ESP_DATA_PATH
+    esp_data_cache = DataCache(ESP_DATA_PATH, args.cache_size * 1024 ** 2)
+    for core_name, last_version in asyncio.run(get_all_esp_data(esp_data_cache, load_core_catalog(),
+                                                                  partial=args.partial, chunks=args.chunks)):
         print(f"Core: {core_name}, Last Version: {last_version}")
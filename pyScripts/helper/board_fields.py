@@ -0,0 +1,172 @@
+"""
+This module provides the declarative description of the boards.txt keys collected into BoardData.
+A FieldSpec maps a key path after the board id, e.g. "build.mcu" or "menu.eesz.*.build.flash_size",
+to a field declared by BoardData. All specs of a core are compiled once into a trie of the key path segments,
+so every boards.txt line is split once and matched against all fields in a single walk.
+Part of repository: www.github.com/hredan/esp-board-overview
+Author: hredan
+Copyright (c) 2025 hredan
+"""
+from collections.abc import Callable, Iterable
+from typing import NamedTuple
+
+from helper.board_data import BoardData
+
+# segment of a key path matching any single segment, e.g. the menu option of a menu
+WILDCARD = "*"
+
+class FieldSpec(NamedTuple):
+    """
+    boards.txt key of a BoardData field.
+    :param key_path: key after "<board_id>.", "*" matches any segment, e.g. "menu.eesz.*.build.flash_size"
+    :param field: field declared by BoardData, set by its set_<field> method if there is one
+    :param multi: the field is a list and every matching key adds a value, e.g. the flash sizes of a menu
+    :param skip: values of the wildcard segments which are ignored, e.g. the "autoflash" menu option
+    :param convert: conversion of the value, e.g. "4M" -> "4MB"
+    """
+    key_path: str
+    field: str
+    multi: bool = False
+    skip: tuple[str, ...] = ()
+    convert: Callable[[str], str] | None = None
+
+    @property
+    def segments(self) -> list[str]:
+        """ Segments of the key path """
+        return self.key_path.split(".")
+
+    def check_field(self):
+        """
+        Check the field is declared by BoardData, a list for multi value fields.
+        :raises ValueError: if the field is unknown or of another kind
+        """
+        default = getattr(BoardData(), self.field, None)
+        if default is None or callable(default):
+            raise ValueError(f"Error: key path {self.key_path} maps to {self.field}, which is no field of BoardData")
+        if isinstance(default, list) != self.multi:
+            kind = "a multi value" if self.multi else "a single value"
+            raise ValueError(f"Error: key path {self.key_path} maps {self.field} as {kind} field")
+
+    def apply(self, board: BoardData, value: str):
+        """ Set the value to the field of board """
+        setter: Callable[[str], None] | None = getattr(board, f"set_{self.field}", None)
+        if setter is not None:
+            setter(value)
+        elif self.multi:
+            values: list[str] = getattr(board, self.field)
+            if value not in values:
+                values.append(value)
+        else:
+            setattr(board, self.field, value)
+
+class _TrieNode:
+    """ Node of the key path trie """
+    __slots__ = ("children", "wildcard", "spec")
+
+    def __init__(self):
+        self.children: dict[str, _TrieNode] = {}
+        self.wildcard: _TrieNode | None = None
+        self.spec: FieldSpec | None = None
+
+    def add(self, spec: FieldSpec):
+        """
+        Add the spec at the node of its key path below this node.
+        :raises ValueError: if the key path is already used by another spec
+        """
+        node = self
+        for segment in spec.segments:
+            if segment == WILDCARD:
+                if node.wildcard is None:
+                    node.wildcard = _TrieNode()
+                node = node.wildcard
+            else:
+                node = node.children.setdefault(segment, _TrieNode())
+        if node.spec is not None:
+            raise ValueError(f"Error: key path {spec.key_path} is used by {node.spec.field} and {spec.field}")
+        node.spec = spec
+
+    def match(self, segments: list[str], position: int, captured: list[str]) -> FieldSpec | None:
+        """
+        Get the spec of the segments from position on below this node.
+        :param captured: values of the wildcard segments matched so far
+        """
+        if position == len(segments):
+            if self.spec is None or any(value in self.spec.skip for value in captured):
+                return None
+            return self.spec
+        child = self.children.get(segments[position])
+        if child is not None:
+            spec = child.match(segments, position + 1, captured)
+            if spec is not None:
+                return spec
+        if self.wildcard is not None:
+            return self.wildcard.match(segments, position + 1, captured + [segments[position]])
+        return None
+
+class KeyPathMatcher:
+    """
+    Trie of the key paths of field specs.
+    Exact segments are matched before wildcards, each key path can only be used by one spec
+    and each spec must map to a field declared by BoardData.
+    """
+    def __init__(self, specs: Iterable[FieldSpec]):
+        self.specs = list(specs)
+        self.__root = _TrieNode()
+        for spec in self.specs:
+            spec.check_field()
+            self.__root.add(spec)
+
+    def match(self, key_path: str) -> FieldSpec | None:
+        """
+        Get the spec of a key path after the board id.
+        :return: spec or None if no spec matches or a wildcard segment is skipped by the spec
+        """
+        return self.__root.match(key_path.split("."), 0, [])
+
+    def match_key(self, board_id: str, key: str) -> FieldSpec | None:
+        """
+        Get the spec of a boards.txt key of a board, "<board_id>.<key path>".
+        :return: spec or None if the key is not a key of the board or of a spec
+        """
+        if len(key) <= len(board_id) or key[len(board_id)] != "." or not key.startswith(board_id):
+            return None
+        return self.match(key[len(board_id) + 1:])
+
+    def match_line(self, board_id: str, line: str) -> tuple[FieldSpec, str] | None:
+        """
+        Match a boards.txt line of a board, "<board_id>.<key path>=<value>".
+        :return: spec and converted value, None if the line is not a key of a spec or the value is empty
+        """
+        key, value = split_line(line)
+        spec = self.match_key(board_id, key) if value else None
+        if spec is None:
+            return None
+        return spec, spec.convert(value) if spec.convert is not None else value
+
+def split_line(line: str) -> tuple[str, str]:
+    """
+    Split a boards.txt line into key and value.
+    :return: key and value without line break, the value is "" for lines without "="
+    """
+    key, _, value = line.partition("=")
+    return key, value.split("\n", 1)[0]
+
+def get_board_id(key: str, value: str) -> str:
+    """
+    Get the board id of the name key which starts a board, e.g. "d1_mini.name".
+    :return: board id or "" if the key is not a name key or the name is empty
+    """
+    if value and key.endswith(".name") and len(key) > len(".name"):
+        return key[:-len(".name")]
+    return ""
+
+def add_byte_unit(flash_size: str) -> str:
+    """ Align the flash size unit of esp8266 with esp32, e.g. "4M" -> "4MB" """
+    return flash_size if flash_size.endswith("B") else flash_size + "B"
+
+# fields of the generic core
+BOARD_FIELDS = [
+    FieldSpec("build.variant", "variant"),
+    FieldSpec("build.mcu", "mcu"),
+    FieldSpec("build.flash_size", "flash_size", multi=True),
+]
@@ -0,0 +1,120 @@
+"""
+This module builds a search index over the board names, ids, variants and MCUs.
+The index maps the trigrams of the lower case words to sorted lists of board positions
+in the exported board json (sorted by board id), a query intersects the lists of its trigrams.
+Part of repository: www.github.com/hredan/esp-board-overview
+Author: hredan
+Copyright (c) 2025 hredan
+"""
+import json
+import re
+from collections.abc import Iterable
+from typing import Any
+
+from helper.board_data import BoardData
+
+GRAM_SIZE = 3
+SEARCH_FIELDS = ["name", "board", "variant", "mcu"]
+_WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+def get_words(text: str) -> list[str]:
+    """ lower case words of a text, separators like ' ', '_', '-' and '.' are dropped """
+    return _WORD_PATTERN.findall(text.lower())
+
+def get_grams(word: str) -> set[str]:
+    """ trigrams of a word, words shorter than a trigram are a gram on its own """
+    if len(word) <= GRAM_SIZE:
+        return {word}
+    return {word[index:index + GRAM_SIZE] for index in range(len(word) - GRAM_SIZE + 1)}
+
+def get_search_text(board: BoardData) -> str:
+    """ searchable text of a board """
+    return " ".join(str(getattr(board, field)) for field in SEARCH_FIELDS)
+
+class BoardSearchIndex:
+    """
+    Inverted index of board trigrams.
+    grams maps a trigram to the sorted positions of the boards containing it.
+    """
+    def __init__(self, boards: list[str], grams: dict[str, list[int]]):
+        self.boards = boards
+        self.grams = grams
+        self.__short_grams: dict[str, set[int]] = {}
+
+    @classmethod
+    def from_boards(cls, boards: Iterable[BoardData]) -> "BoardSearchIndex":
+        """ Build the index in the order of the exported board json """
+        sorted_boards = sorted(boards, key=lambda board: board.board)
+        grams: dict[str, list[int]] = {}
+        for position, board in enumerate(sorted_boards):
+            board_grams: set[str] = set()
+            for word in get_words(get_search_text(board)):
+                board_grams |= get_grams(word)
+            for gram in board_grams:
+                # positions are increasing, the posting lists stay sorted
+                grams.setdefault(gram, []).append(position)
+        return cls([board.board for board in sorted_boards], dict(sorted(grams.items())))
+
+    @classmethod
+    def from_json(cls, text: str) -> "BoardSearchIndex":
+        """ Load an exported index """
+        data: dict[str, Any] = json.loads(text)
+        return cls(list(data["boards"]), dict(data["grams"]))
+
+    def to_json(self) -> str:
+        """ Convert the index to compact JSON format """
+        return json.dumps({"gram_size": GRAM_SIZE, "boards": self.boards, "grams": self.grams},
+                          separators=(",", ":"))
+
+    def __word_positions(self, word: str) -> set[int]:
+        if len(word) >= GRAM_SIZE:
+            positions: set[int] | None = None
+            for gram in get_grams(word):
+                posting = self.grams.get(gram)
+                if posting is None:
+                    return set()
+                positions = set(posting) if positions is None else positions.intersection(posting)
+            return positions or set()
+        # shorter words are part of several grams
+        if word not in self.__short_grams:
+            short_positions: set[int] = set()
+            for gram, posting in self.grams.items():
+                if word in gram:
+                    short_positions.update(posting)
+            self.__short_grams[word] = short_positions
+        return self.__short_grams[word]
+
+    def search(self, query: str) -> list[int]:
+        """
+        Search boards containing all words of the query, a word can be a part of a word,
+        e.g. "c3 mini" finds "LOLIN C3 Mini". A board can contain all trigrams of a word
+        without the word, the positions are candidates, search_boards verifies them.
+        :param query: search text
+        :return: sorted positions of the found boards
+        """
+        words = get_words(query)
+        if not words:
+            return list(range(len(self.boards)))
+        positions: set[int] | None = None
+        for word in sorted(words, key=len, reverse=True):
+            word_positions = self.__word_positions(word)
+            positions = word_positions if positions is None else positions & word_positions
+            if not positions:
+                return []
+        return sorted(positions or set())
+
+def search_boards(index: BoardSearchIndex, boards: list[BoardData], query: str) -> list[BoardData]:
+    """
+    Search boards by a partial name, id, variant or MCU.
+    :param index: index of the boards
+    :param boards: boards in the order of the index (exported board json)
+    :param query: search text
+    :return: boards containing all words of the query
+    """
+    words = get_words(query)
+    found: list[BoardData] = []
+    for position in index.search(query):
+        text = " ".join(get_words(get_search_text(boards[position])))
+        if all(word in text for word in words):
+            found.append(boards[position])
+    return found
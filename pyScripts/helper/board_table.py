@@ -0,0 +1,219 @@
+"""
+This module provides a columnar table of boards.
+MCU and variant are dictionary encoded ints, the flash sizes a bitmask over a size ladder
+and the built-in LED an int with LED_NONE for "N/A". The columns are arrays of the array module.
+Part of repository: www.github.com/hredan/esp-board-overview
+Author: hredan
+Copyright (c) 2025 hredan
+"""
+import json
+from array import array
+from collections.abc import Iterable
+from typing import Any
+
+from helper.board_data import BoardData, BoardList
+
+# canonical flash sizes, a flash size is a bit of the flash mask in this order
+FLASH_SIZE_LADDER = ["256KB", "512KB", "1MB", "2MB", "4MB", "8MB", "16MB", "32MB", "64MB", "128MB"]
+# the flash mask is an unsigned 64 bit int
+MAX_FLASH_SIZES = 64
+LED_NONE = -1
+NOT_AVAILABLE = "N/A"
+
+class _Column:
+    """
+    Column of the int code of each row, e.g. dictionary encoded strings, the code of a value
+    is its position in values. The sorted rows of each key are built on the first use after an append.
+    """
+    def __init__(self, typecode: str, values: Iterable[str] = ()):
+        self.codes: "array[int]" = array(typecode)
+        self.values: list[str] = []
+        self.lookup: dict[str, int] = {}
+        self.__rows: dict[int, list[int]] | None = None
+        for value in values:
+            self.encode(value)
+
+    def encode(self, value: str) -> int:
+        """ get the code of a value, new values are added """
+        code = self.lookup.get(value)
+        if code is None:
+            code = len(self.values)
+            self.lookup[value] = code
+            self.values.append(value)
+        return code
+
+    def append(self, code: int):
+        """ Append the code of a new row """
+        self.codes.append(code)
+        self.__rows = None
+
+    def get_keys(self, code: int) -> Iterable[int]:
+        """ get the keys of a code in the rows index, the code itself """
+        return (code,)
+
+    def get_rows(self) -> dict[int, list[int]]:
+        """ get the sorted rows of each key """
+        if self.__rows is None:
+            rows: dict[int, list[int]] = {}
+            for row, code in enumerate(self.codes):
+                for key in self.get_keys(code):
+                    rows.setdefault(key, []).append(row)
+            self.__rows = rows
+        return self.__rows
+
+    def find_rows(self, value: str) -> list[int]:
+        """ get the sorted rows of a value """
+        return self.get_rows().get(self.lookup.get(value, -1), [])
+
+class _FlashColumn(_Column):
+    """ Flash masks, the values are the flash sizes of the bits and the keys of a mask are its bits """
+    def get_keys(self, code: int) -> Iterable[int]:
+        return [bit for bit in range(code.bit_length()) if code >> bit & 1]
+
+class _LedColumn(_Column):
+    """ GPIO of the built-in LED, the key is 1 for rows with and 0 for rows without LED """
+    def get_keys(self, code: int) -> Iterable[int]:
+        return (int(code != LED_NONE),)
+
+class BoardTable:
+    """
+    Columnar table of boards, a row is a board.
+    Flash size lists which are not in the order of the flash mask are kept in flash_order,
+    so the conversion back to BoardData and JSON is lossless.
+    """
+    def __init__(self):
+        self.names: list[str] = []
+        self.board_ids: list[str] = []
+        self.mcu = _Column("I")
+        self.variant = _Column("I")
+        self.flash = _FlashColumn("Q", FLASH_SIZE_LADDER)
+        self.led = _LedColumn("i")
+        self.flash_order: dict[int, list[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self.board_ids)
+
+    def encode_flash(self, flash_sizes: list[str]) -> int:
+        """ get the flash mask of flash sizes, sizes which are not in the ladder get a new bit """
+        mask = 0
+        for flash_size in flash_sizes:
+            bit = self.flash.encode(flash_size)
+            if bit >= MAX_FLASH_SIZES:
+                raise ValueError(f"Error: more than {MAX_FLASH_SIZES} different flash sizes")
+            mask |= 1 << bit
+        return mask
+
+    def decode_flash(self, mask: int) -> list[str]:
+        """ get the flash sizes of a flash mask in the order of the bits """
+        return [value for bit, value in enumerate(self.flash.values) if mask >> bit & 1]
+
+    def append(self, board: BoardData):
+        """ Append a board as a new row """
+        row = len(self.board_ids)
+        self.names.append(board.name)
+        self.board_ids.append(board.board)
+        self.mcu.append(self.mcu.encode(board.mcu))
+        self.variant.append(self.variant.encode(board.variant))
+        mask = self.encode_flash(board.flash_size)
+        self.flash.append(mask)
+        if self.decode_flash(mask) != board.flash_size:
+            self.flash_order[row] = list(board.flash_size)
+        if board.led_builtin == NOT_AVAILABLE:
+            self.led.append(LED_NONE)
+        else:
+            gpio = int(board.led_builtin)
+            if gpio == LED_NONE or str(gpio) != board.led_builtin:
+                raise ValueError(f"Error: invalid built-in LED '{board.led_builtin}' of {board.board}")
+            self.led.append(gpio)
+
+    @classmethod
+    def from_boards(cls, boards: Iterable[BoardData]) -> "BoardTable":
+        """ Create a table from boards, the rows are in the order of boards """
+        table = cls()
+        for board in boards:
+            table.append(board)
+        return table
+
+    @classmethod
+    def from_json(cls, text: str) -> "BoardTable":
+        """ Create a table from the JSON of BoardList.to_json """
+        boards: list[dict[str, Any]] = json.loads(text)
+        table = cls()
+        for board_dict in boards:
+            board = BoardData()
+            board.set_name(board_dict["name"])
+            board.set_variant(board_dict["variant"])
+            board.set_mcu(board_dict["mcu"])
+            board.flash_size = list(board_dict["flash_size"])
+            board.set_led_builtin(board_dict["led_builtin"])
+            board.set_board_id(board_dict["board"])
+            table.append(board)
+        return table
+
+    def get_board(self, row: int) -> BoardData:
+        """ Convert a row back to BoardData """
+        board = BoardData()
+        board.set_name(self.names[row])
+        board.set_variant(self.variant.values[self.variant.codes[row]])
+        board.set_mcu(self.mcu.values[self.mcu.codes[row]])
+        board.flash_size = list(self.flash_order.get(row, self.decode_flash(self.flash.codes[row])))
+        gpio = self.led.codes[row]
+        board.set_led_builtin(NOT_AVAILABLE if gpio == LED_NONE else str(gpio))
+        board.set_board_id(self.board_ids[row])
+        return board
+
+    def to_boards(self, rows: Iterable[int] | None = None) -> BoardList:
+        """ Convert rows, default all rows, back to a BoardList """
+        if rows is None:
+            rows = range(len(self))
+        return BoardList(self.get_board(row) for row in rows)
+
+    def to_json(self) -> str:
+        """ Convert the table to the JSON format of BoardList.to_json """
+        return self.to_boards().to_json()
+
+    def filter(self, mcu: str | None = None, variant: str | None = None,
+               flash_size: str | None = None, has_led: bool | None = None) -> list[int]:
+        """
+        Get the rows matching all given conditions.
+        :param mcu: MCU of the board, e.g. "esp32c3"
+        :param variant: variant of the board
+        :param flash_size: flash size the board offers, e.g. "4MB"
+        :param has_led: True for boards with and False for boards without built-in LED
+        :return: sorted list of rows
+        """
+        conditions: list[list[int]] = []
+        if mcu is not None:
+            conditions.append(self.mcu.find_rows(mcu))
+        if variant is not None:
+            conditions.append(self.variant.find_rows(variant))
+        if flash_size is not None:
+            conditions.append(self.flash.find_rows(flash_size))
+        if has_led is not None:
+            conditions.append(self.led.get_rows().get(int(has_led), []))
+        if not conditions:
+            return list(range(len(self)))
+        # intersect the rows starting with the smallest list
+        conditions.sort(key=len)
+        rows = conditions[0]
+        for other_rows in conditions[1:]:
+            found = set(other_rows)
+            rows = [row for row in rows if row in found]
+        return list(rows)
+
+    def group_by(self, column: str) -> dict[str, list[int]]:
+        """
+        Get the rows of each value of a column.
+        :param column: "mcu", "variant", "led_builtin" or "flash_size",
+                       a board is in the group of each of its flash sizes
+        :return: dictionary of value and sorted rows
+        """
+        if column in ("mcu", "variant", "flash_size"):
+            encoded: _Column = getattr(self, "flash" if column == "flash_size" else column)
+            return {encoded.values[code]: list(rows) for code, rows in sorted(encoded.get_rows().items())}
+        if column == "led_builtin":
+            groups: dict[str, list[int]] = {}
+            for row, gpio in enumerate(self.led.codes):
+                groups.setdefault(NOT_AVAILABLE if gpio == LED_NONE else str(gpio), []).append(row)
+            return groups
+        raise ValueError(f"Error: unknown column {column}")
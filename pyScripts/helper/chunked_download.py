@@ -0,0 +1,165 @@
+"""
+This module provides parallel chunked downloads of large files, e.g. core archives.
+If the server advertises "Accept-Ranges: bytes", the file is split into byte ranges which are
+fetched concurrently into a preallocated temporary file. Each chunk is retried on its own,
+the assembled file is verified before it is renamed to the save path.
+Part of repository: www.github.com/hredan/esp-board-overview
+Author: hredan
+Copyright (c) 2025 hredan
+"""
+import http.client
+import re
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import NamedTuple
+
+from helper.index_fetcher import HttpTransport, RangeNotSupported
+from helper.verified_download import ChecksumError, file_matches_checksum, temporary_download
+
+MIN_CHUNK_SIZE = 256 * 1024
+MAX_CHUNK_SIZE = 16 * 1024 * 1024
+RETRIES = 3
+RETRY_DELAY = 0.5
+_CONTENT_RANGE_PATTERN = re.compile(r"bytes (\d+)-(\d+)/(\d+)")
+
+# progress callback: url, received bytes and total bytes
+Progress = Callable[[str, int, int], None]
+
+def split_ranges(size: int, num_chunks: int, min_chunk_size: int = MIN_CHUNK_SIZE,
+                 max_chunk_size: int = MAX_CHUNK_SIZE) -> list[tuple[int, int]]:
+    """
+    Split a file into byte ranges, at least num_chunks ranges if the chunks are not smaller
+    than min_chunk_size and no range larger than max_chunk_size.
+    :return: list of (first, last) byte positions, last is inclusive like in the Range header
+    """
+    if size <= 0:
+        return []
+    chunk_size = min(max(-(-size // max(num_chunks, 1)), min_chunk_size), max_chunk_size)
+    return [(start, min(start + chunk_size, size) - 1) for start in range(0, size, chunk_size)]
+
+def count_missing_bytes(written: list[tuple[int, int]], size: int) -> int:
+    """
+    Count the bytes of a file which are not covered by the written ranges.
+    :param written: list of (start, end) byte positions, end is exclusive
+    :return: number of bytes not written
+    """
+    missing = 0
+    covered = 0
+    for start, end in sorted(written):
+        if start > covered:
+            missing += start - covered
+        covered = max(covered, end)
+    return missing + max(size - covered, 0)
+
+class ChunkOptions(NamedTuple):
+    """Options of the chunked download."""
+    # number of parallel range requests of a file
+    num_chunks: int = 4
+    # files smaller than two chunks are downloaded with a single request
+    min_chunk_size: int = MIN_CHUNK_SIZE
+    # retries of a failed chunk request, the delay grows with each attempt
+    retries: int = RETRIES
+    retry_delay: float = RETRY_DELAY
+
+class ChunkedTransport:
+    """
+    Transport for the AsyncFetcher downloading each file with num_chunks parallel range requests.
+    Servers without range support and files smaller than two chunks are downloaded with a single request.
+    Unknown file sizes are requested with an additional range request of the first byte,
+    so small files like package indexes should use the HttpTransport.
+    """
+    def __init__(self, transport: HttpTransport | None = None, options: ChunkOptions = ChunkOptions(),
+                 progress: Progress | None = None):
+        self.__own_transport = transport is None
+        self.transport = transport if transport is not None else HttpTransport(max_connections=options.num_chunks)
+        self.options = options
+        self.progress = progress
+        # number of retried chunk requests
+        self.num_of_retries = 0
+        self.__lock = threading.Lock()
+
+    def close(self):
+        """Close the idle connections of the default transport."""
+        if self.__own_transport:
+            self.transport.close()
+
+    def get_range_size(self, url: str) -> int:
+        """
+        Request the first byte of url to check the range support of the server.
+        :return: size of the file, 0 if the server does not advertise range support
+        """
+        try:
+            status, headers, _ = self.transport.request(url, {"Range": "bytes=0-0"}, require_partial=True)
+        except RangeNotSupported:
+            return 0
+        match_range = _CONTENT_RANGE_PATTERN.fullmatch(headers.get("content-range", ""))
+        if status != 206 or match_range is None or headers.get("accept-ranges", "").lower() != "bytes":
+            return 0
+        return int(match_range.group(3))
+
+    def fetch(self, url: str, save_path: str, checksum: str = "", size: int = 0) -> None:
+        """
+        Download url to save_path, with parallel range requests if the server supports them.
+        :raises OSError: if a chunk could not be downloaded after all retries
+        :raises ChecksumError: if checksum or size do not match
+        """
+        if 0 < size < 2 * self.options.min_chunk_size:
+            self.transport.fetch(url, save_path, checksum, size)
+            return
+        range_size = self.get_range_size(url)
+        if range_size < 2 * self.options.min_chunk_size:
+            self.transport.fetch(url, save_path, checksum, size)
+            return
+        if size and range_size != size:
+            raise ChecksumError(f"Error: size of {url} is {range_size} bytes, expected {size}")
+        self.__fetch_chunks(url, save_path, checksum, range_size)
+
+    def __fetch_chunks(self, url: str, save_path: str, checksum: str, size: int):
+        """
+        fetch the chunks into a preallocated temporary file and rename it after the verification,
+        the written ranges must cover the file as the preallocated size is no proof of the content
+        """
+        with temporary_download(save_path) as temp_path:
+            with open(temp_path, 'wb') as file:
+                file.truncate(size)
+            written: list[tuple[int, int]] = []
+            with ThreadPoolExecutor(max_workers=self.options.num_chunks) as executor:
+                futures = {executor.submit(self.__fetch_chunk, url, temp_path, byte_range, size): byte_range[0]
+                           for byte_range in split_ranges(size, self.options.num_chunks, self.options.min_chunk_size)}
+                for future in as_completed(futures):
+                    written.append((futures[future], futures[future] + future.result()))
+                    if self.progress is not None:
+                        self.progress(url, sum(end - start for start, end in written), size)
+            missing = count_missing_bytes(written, size)
+            if missing:
+                raise ChecksumError(f"Error: {missing} of {size} bytes of {save_path} were not downloaded")
+            if checksum and not file_matches_checksum(temp_path, checksum, size):
+                raise ChecksumError(f"Error: checksum of {save_path} does not match {checksum}")
+
+    def __fetch_chunk(self, url: str, temp_path: str, byte_range: tuple[int, int], size: int) -> int:
+        """
+        fetch a chunk and write it at its position, failed requests are retried
+        :return: number of written bytes
+        """
+        first, last = byte_range
+        for attempt in range(self.options.retries + 1):
+            try:
+                status, headers, body = self.transport.request(url, {"Range": f"bytes={first}-{last}"},
+                                                               require_partial=True)
+                if status != 206 or headers.get("content-range", "") != f"bytes {first}-{last}/{size}" \
+                        or len(body) != last - first + 1:
+                    raise OSError(f"Error: unexpected response {status} for range {first}-{last} of {url}")
+            except (OSError, http.client.HTTPException):
+                if attempt == self.options.retries:
+                    raise
+                with self.__lock:
+                    self.num_of_retries += 1
+                time.sleep(self.options.retry_delay * (attempt + 1))
+                continue
+            with open(temp_path, 'r+b') as file:
+                file.seek(first)
+                file.write(body)
+            return len(body)
+        return 0
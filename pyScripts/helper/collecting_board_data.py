@@ -1,10 +1,13 @@
 """ Module for collecting board data from boards.txt """
-import re
 import os
 import logging
 import sys
+from collections.abc import Iterable, Iterator
 from helper.board_data import BoardList, BoardData
+from helper.board_fields import get_board_id, split_line
 from helper.find_led_builtin_gpio import FindLedBuiltinGpio
+from helper.header_evaluator import HeaderCache
+from helper.core_dialect import CoreDialect, get_dialect
 
 log_board = logging.getLogger(__name__)
 log_board.setLevel(logging.ERROR)
@@ -14,91 +17,76 @@ if os.environ.get('LOG_STDOUT') == '1':
 
 class CollectingBoardData:
     """ Class for collecting board data from boards.txt """
-    def __init__(self, core_name: str, core_path: str):
+    def __init__(self, core_name: str, core_path: str, header_cache: HeaderCache | None = None,
+                 dialect: CoreDialect | None = None):
         self.core_name = core_name
+        # the key path trie of the board fields is compiled once per dialect
+        self.dialect = dialect if dialect is not None else get_dialect(core_name)
         self.core_path = core_path
+        self.header_cache = header_cache
         self.boards_list: BoardList = BoardList()
         self.board_data: BoardData = BoardData()
         self.num_of_boards_without_led = 0
-        self.name = ""
-
-    def __get_board_name(self, line:str)-> tuple[str, str]:
-        match_board = re.match(r"(.+)\.name=(.+)", line)
-        if match_board:
-            board_id=match_board.group(1)
-            name_full=match_board.group(2)
-
-            return board_id, name_full
-        return "", ""
-
-    def __get_variant(self, line:str) -> bool:
-        match_variant = re.match(self.name + r"\.build\.variant=(.+)", line)
-        if match_variant:
-            self.board_data.set_variant(match_variant.group(1))
-            return True
-        return False
-
-    def __get_mcu(self, line:str) -> bool:
-        match_mcu = re.match(self.name + r"\.build\.mcu=(.+)", line)
-        if match_mcu:
-            self.board_data.set_mcu(match_mcu.group(1))
-            return True
-        return False
-
-    def __get_flash_size_esp8266(self, line:str) -> bool:
-        pattern = self.name + r"\.menu\.eesz\.(.+)\.build\.flash_size=(.+)"
-        match_partition = re.match(pattern, line)
-        if match_partition:
-            flash_partition = match_partition.group(1)
-            if flash_partition == "autoflash":
-                return False
-            # align flash size unit with esp32 (M-> MB or K-> KB)
-            flash_size = match_partition.group(2)
-            if flash_size[-1] != "B":
-                flash_size = flash_size + "B"
-            self.board_data.set_flash_size(flash_size)
-            return True
-        return False
-
-    def __get_flash_size_esp32(self, line:str) -> bool:
-        match_flash = re.match(self.name + r"\.build\.flash_size=(.+)", line)
-        if match_flash:
-            self.board_data.set_flash_size(match_flash.group(1))
-            return True
-        return False
-
-    def __get_flash_size(self, line:str) -> bool:
-        if self.core_name == "esp8266":
-            return self.__get_flash_size_esp8266(line)
-        return self.__get_flash_size_esp32(line)
 
     def collect_board_data(self, board_txt_line: str) -> str:
-        """ Collecting board data """
+        """ Collecting board data, the line is split once and matched against all fields """
+        board_id, completed_board = self.__collect_line(board_txt_line)
+        # if there is already a board collected, save it before starting a new one
+        if completed_board is not None:
+            self.boards_list.append(completed_board)
+        return board_id
+
+    def __collect_line(self, board_txt_line: str) -> tuple[str, BoardData | None]:
+        """
+        Collect a line into the current board.
+        :return: board id if the line starts a new board and the previous board if it is completed
+        """
+        key, value = split_line(board_txt_line)
+        if not value:
+            return "", None
         # collect board name and id
-        board_id, name_full = self.__get_board_name(board_txt_line)
+        board_id = get_board_id(key, value)
         if board_id:
-            self.name = board_id
-            # if there is already a board collected, save it before starting a new one
-            if self.board_data.name:
-                self.boards_list.append(self.board_data)
+            completed_board = self.board_data if self.board_data.name else None
             self.board_data = BoardData()
-            self.board_data.set_name(name_full)
+            self.board_data.set_name(value)
             self.board_data.set_board_id(board_id)
-            return board_id
-        if self.__get_variant(board_txt_line):
-            return ""
-        if self.__get_mcu(board_txt_line):
-            return ""
-        if self.__get_flash_size(board_txt_line):
-            return ""
-        return ""
+            return board_id, completed_board
+        current_id = self.board_data.board
+        spec = self.dialect.board_matcher.match_key(current_id, key) if current_id else None
+        if spec is not None:
+            spec.apply(self.board_data, spec.convert(value) if spec.convert is not None else value)
+        return "", None
+
+    def iter_boards(self, board_txt_lines: Iterable[str], find_leds: bool = True) -> Iterator[BoardData]:
+        """
+        Yield each board as soon as its block of boards.txt ends, the built-in LED is resolved per board.
+        The boards are not added to boards_list, so only the current board is kept in memory.
+        :param board_txt_lines: lines of boards.txt, e.g. the open file
+        :param find_leds: False leaves the LEDs unresolved
+        """
+        led_finder = FindLedBuiltinGpio(self.core_path, self.core_name, BoardList(),
+                                        self.header_cache) if find_leds else None
+        for line in board_txt_lines:
+            _, completed_board = self.__collect_line(line)
+            if completed_board is not None:
+                yield self.__finish_board(completed_board, led_finder)
+        # the last board ends with the file
+        if self.board_data.name:
+            completed_board, self.board_data = self.board_data, BoardData()
+            yield self.__finish_board(completed_board, led_finder)
+
+    def __finish_board(self, board: BoardData, led_finder: FindLedBuiltinGpio | None) -> BoardData:
+        if led_finder is not None and not led_finder.find_board_led_builtin(board):
+            self.num_of_boards_without_led += 1
+        return board
 
     def final_data(self):
         """ finalize collected data after board.txt is parsed """
         # append the last collected board data
         if self.board_data.name:
             self.boards_list.append(self.board_data)
-        led_finder = FindLedBuiltinGpio(self.core_path, self.core_name, self.boards_list)
+        led_finder = FindLedBuiltinGpio(self.core_path, self.core_name, self.boards_list, self.header_cache)
         self.num_of_boards_without_led = led_finder.find_led_builtin()
 
     def get_collected_data(self):
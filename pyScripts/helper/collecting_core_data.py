@@ -8,9 +8,25 @@ Author: hredan
 Copyright (c) 2025 hredan"""
 import logging
 import os
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from functools import cached_property
+from typing import Any
 
+from helper.board_data import BoardData, BoardList
+from helper.board_fields import get_board_id, split_line
 from helper.collecting_partition_data import CollectingPartitionData
 from helper.collecting_board_data import CollectingBoardData
+from helper.find_led_builtin_gpio import FindLedBuiltinGpio
+from helper.core_dialect import CoreDialect, get_dialect
+from helper.board_search import BoardSearchIndex
+from helper.board_table import BoardTable
+from helper.flash_fit import FlashMismatch, collect_flash_sizes, find_flash_mismatches
+from helper.partition_layout import compute_layout, read_partition_csv
+from helper.partitions_data import PartitionList
+from helper.variant_pins import VariantPins
+from helper.core_snapshot import get_input_fingerprint, load_snapshot, save_snapshot
 
 LOG_FILE = "./esp_data/core_data.log"
 # if os.path.exists(LOG_FILE):
@@ -23,12 +39,20 @@ class CollectingCoreData:
     This class is used to parse the boards.txt file of an Arduino core and extract
     information about the boards, including the LED_BUILTIN and flash size.
     """
-    def __init__(self, core_name:str, core_version: str,
-                 core_path: str):
+    # fields of the collected data stored in a snapshot
+    SNAPSHOT_FIELDS = ("boards", "partitions", "num_of_boards_without_led", "flash_mismatches")
+
+    def __init__(self, core_name:str, core_version: str, core_path: str):
+        """
+        The stages of the collection are computed on first access of boards, partitions,
+        num_of_boards_without_led or flash_mismatches, e.g. partitions do not resolve the LEDs.
+        Collected data can be saved with save_snapshot and loaded by later runs with load_snapshot.
+        """
         self.core_name = core_name
         self.core_version = core_version
         self.core_path = core_path
-        self.num_of_boards_without_led = 0
+        # duration of each computed stage in seconds
+        self.timings: dict[str, float] = {}
         if not os.path.exists(self.core_path):
             raise ValueError(f"Error: could not found {self.core_path}")
 
@@ -36,30 +60,170 @@ class CollectingCoreData:
         if not os.path.exists(self.boards_txt):
             raise ValueError(f"Error: could not found {self.boards_txt}")
 
-        self.__get_data()
-        #self.__set_boars_without_led()
+        # parsed headers stay resident, e.g. between refreshes in watch mode
+        self.header_cache = FindLedBuiltinGpio.create_header_cache(self.core_path, self.core_name)
+        self.variant_pins = VariantPins(self.core_path, self.header_cache)
+
+    @property
+    def dialect(self) -> CoreDialect:
+        """ Dialect of the core, e.g. the macros of LED_BUILTIN and the partition scheme support """
+        return get_dialect(self.core_name)
+
+    @contextmanager
+    def __timed(self, stage: str) -> Iterator[None]:
+        start = time.perf_counter()
+        yield
+        self.timings[stage] = time.perf_counter() - start
+        logging.info("%s %s: %.1f ms", self.core_name, stage, self.timings[stage] * 1000)
 
+    def __reset(self, *stages: str):
+        """ Forget computed stages, they are computed again on next access """
+        for stage in stages:
+            self.__dict__.pop(stage, None)
 
-    def __get_data(self):
-        board_data: CollectingBoardData = CollectingBoardData(self.core_name, self.core_path)
-        partition_data: CollectingPartitionData = CollectingPartitionData(self.core_name, self.core_path)
+    @cached_property
+    def boards_txt_lines(self) -> list[str]:
+        """ Lines of boards.txt, read once for all stages """
+        with self.__timed("read"):
+            with open(self.boards_txt, 'r', encoding='utf8') as infile:
+                return infile.readlines()
 
-        name=""
+    @cached_property
+    def parsed_boards(self) -> BoardList:
+        """ Boards of boards.txt without LED resolution, boards resolves the LEDs of the same list """
+        lines = self.boards_txt_lines
+        with self.__timed("boards"):
+            board_data = CollectingBoardData(self.core_name, self.core_path, self.header_cache, self.dialect)
+            return BoardList(board_data.iter_boards(lines, find_leds=False))
+
+    @cached_property
+    def boards(self) -> BoardList:
+        """ Boards of boards.txt with the LED_BUILTIN resolved from the variant headers """
+        boards = self.parsed_boards
+        with self.__timed("leds"):
+            FindLedBuiltinGpio(self.core_path, self.core_name, boards, self.header_cache).find_led_builtin()
+        return boards
+
+    @cached_property
+    def num_of_boards_without_led(self) -> int:
+        """ Number of boards without a resolved LED_BUILTIN """
+        return sum(1 for board in self.boards if board.led_builtin == "N/A")
+
+    @cached_property
+    def board_table(self) -> BoardTable:
+        """ Columnar table of the boards for filters and groups, e.g. the number of boards per MCU """
+        return BoardTable.from_boards(self.boards)
+
+    def iter_boards(self, find_leds: bool = True) -> Iterator[BoardData]:
+        """
+        Stream the boards of boards.txt, each board is yielded as soon as its block ends
+        with its LED_BUILTIN resolved. Nothing is cached, e.g. for exporters of large cores.
+        :param find_leds: False leaves the LEDs unresolved
+        """
+        board_data = CollectingBoardData(self.core_name, self.core_path, self.header_cache, self.dialect)
         with open(self.boards_txt, 'r', encoding='utf8') as infile:
-            for line in infile:
-                board_id: str = board_data.collect_board_data(line)
-                if board_id:
-                    name = board_id
-                    partition_data.add_partition(name)
+            yield from board_data.iter_boards(infile, find_leds)
 
+    @cached_property
+    def partitions(self) -> PartitionList:
+        """ Partition schemes of the boards, the LEDs are not resolved """
+        lines = self.boards_txt_lines
+        with self.__timed("partitions"):
+            partition_data = CollectingPartitionData(self.core_name, self.core_path, self.dialect)
+            for line in lines:
+                board_id = get_board_id(*split_line(line))
+                if board_id:
+                    partition_data.add_partition(board_id)
                 partition_data.collect_partition_data(line)
+            partition_data.check_partitions()
+            return partition_data.get_partitions_data()
 
-        partition_data.check_partitions()
-        self.partitions = partition_data.get_partitions_data()
+    @cached_property
+    def flash_mismatches(self) -> list[FlashMismatch]:
+        """ Partition schemes which do not fit into any flash size of the boards, see flash_fit.py """
+        if not self.dialect.partition_schemes:
+            return []
+        lines, partitions = self.boards_txt_lines, self.partitions
+        with self.__timed("flash_fit"):
+            flash_sizes = collect_flash_sizes(lines, self.dialect.flash_fields)
+            scheme_ends: dict[str, int] = {}
+            for partition_data in partitions.values():
+                builds = [partition_data.default] + [scheme.build for scheme in partition_data.schemes.values()]
+                for build in builds:
+                    csv_path = f"{self.core_path}/tools/partitions/{build}.csv"
+                    if build and build not in scheme_ends and os.path.exists(csv_path):
+                        rows = read_partition_csv(csv_path)
+                        if rows:
+                            scheme_ends[build] = compute_layout(rows)["end"]
+            return find_flash_mismatches(flash_sizes, partitions, scheme_ends)
 
-        board_data.final_data()
-        self.boards = board_data.get_collected_data()
-        self.num_of_boards_without_led = board_data.num_of_boards_without_led
+    def refresh(self, changed_files: list[str]):
+        """
+        Update the collected data after files of the core changed.
+        boards.txt changes collect all data again, partition csv changes only the partitions
+        and header changes only the LEDs of the boards whose pins_arduino.h includes a changed header.
+        :param changed_files: paths of the added, modified or removed files
+        """
+        changed_headers = [path for path in changed_files if path.endswith(".h")]
+        for path in changed_headers:
+            self.header_cache.invalidate(path)
+        if changed_headers:
+            self.variant_pins.clear()
+        if os.path.join(self.core_path, "boards.txt") in changed_files:
+            self.__reset("boards_txt_lines", "parsed_boards", "boards", "num_of_boards_without_led",
+                         "board_table", "partitions", "flash_mismatches")
+            return
+        if any(path.endswith(".csv") for path in changed_files):
+            self.__reset("partitions", "flash_mismatches")
+        # LEDs which were not resolved yet are resolved from the changed headers on first access
+        if changed_headers and "boards" in self.__dict__:
+            # boards whose pins_arduino.h is a changed header or includes one
+            dependents: set[str] = set()
+            for path in changed_headers:
+                dependents.update(self.header_cache.get_dependents(path))
+            affected = BoardList(board for board in self.boards if os.path.realpath(
+                f"{self.core_path}/variants/{board.variant}/pins_arduino.h") in dependents)
+            for board in affected:
+                board.set_led_builtin("N/A")
+            FindLedBuiltinGpio(self.core_path, self.core_name, affected, self.header_cache).find_led_builtin()
+            self.__reset("num_of_boards_without_led", "board_table")
+
+    def get_fingerprint(self) -> str:
+        """ Fingerprint of the core version and the input files of the collection """
+        return get_input_fingerprint(self.core_path, self.core_name, self.core_version)
+
+    def save_snapshot(self, path: str):
+        """
+        Save the collected data as binary snapshot with the fingerprint of the input files.
+        Stages which were not accessed yet are computed, save after the data was used.
+        :param path: path of the snapshot file, e.g. esp_data/esp32_snapshot.pickle
+        :return: None
+        """
+        save_snapshot(path, self.get_fingerprint(),
+                      {field: getattr(self, field) for field in self.SNAPSHOT_FIELDS})
+
+    def load_snapshot(self, path: str) -> bool:
+        """
+        Load the collected data of a binary snapshot.
+        :param path: path of the snapshot file
+        :return: False if there is no valid snapshot of this schema version and fingerprint, the data is unchanged
+        """
+        data = load_snapshot(path, self.get_fingerprint())
+        if data is None or not self.__is_valid_snapshot(data):
+            return False
+        for field in self.SNAPSHOT_FIELDS:
+            setattr(self, field, data[field])
+        self.__reset("board_table")
+        return True
+
+    @staticmethod
+    def __is_valid_snapshot(data: dict[str, Any]) -> bool:
+        """ Check the snapshot has all fields with the current classes, e.g. boards with all fields of BoardData """
+        board_fields = set(vars(BoardData()))
+        return isinstance(data.get("boards"), BoardList) and isinstance(data.get("partitions"), PartitionList) \
+            and isinstance(data.get("num_of_boards_without_led"), int) \
+            and isinstance(data.get("flash_mismatches"), list) \
+            and all(isinstance(board, BoardData) and set(vars(board)) == board_fields for board in data["boards"])
 
     def partitions_export_json(self, filename:str):
         """
@@ -78,3 +242,36 @@ class CollectingCoreData:
         """
         with open(filename, "w", encoding='utf8') as file:
             file.write(self.boards.to_json())
+
+    def search_index_export_json(self, filename:str):
+        """
+        Export the search index of the boards to a JSON file, the index refers to the
+        positions of the boards in the file of boards_export_json.
+        :param filename: The name of the JSON file to export to.
+        :return: None
+        """
+        with open(filename, "w", encoding='utf8') as file:
+            file.write(BoardSearchIndex.from_boards(self.boards).to_json())
+
+    def pins_export_json(self, directory: str) -> list[str]:
+        """
+        Export the pin table of each variant of the boards to <directory>/<variant>.json.
+        :param directory: The directory of the JSON files, e.g. esp_data/esp32_pins.
+        :return: names of the written files
+        """
+        return self.variant_pins.export_json(directory, self.boards)
+
+    def export_json(self, directory: str, name: str = ""):
+        """
+        Export the boards, the search index, the pin tables of the variants
+        and for cores with partition schemes the partitions.
+        :param directory: output directory
+        :param name: base name of the files, default is the core name
+        :return: None
+        """
+        name = name or self.core_name
+        self.boards_export_json(filename=os.path.join(directory, name + ".json"))
+        self.search_index_export_json(filename=os.path.join(directory, name + "_search.json"))
+        self.pins_export_json(os.path.join(directory, name + "_pins"))
+        if self.dialect.partition_schemes:
+            self.partitions_export_json(filename=os.path.join(directory, name + "_partitions.json"))
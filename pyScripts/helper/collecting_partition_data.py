@@ -4,6 +4,7 @@ import os
 import sys
 import logging
 from helper.partitions_data import PartitionList, PartitionData, Scheme
+from helper.core_dialect import CoreDialect, get_dialect
 
 log_partition = logging.getLogger(__name__ + ".partition")
 #enable stdout logging for debugging
@@ -11,8 +12,10 @@ if os.environ.get('LOG_STDOUT') == '1':
     log_partition.addHandler(logging.StreamHandler(sys.stdout))
 class CollectingPartitionData:
     """ Class for collecting partition data from boards.txt """
-    def __init__(self, core_name:str, core_path: str):
+    def __init__(self, core_name:str, core_path: str, dialect: CoreDialect | None = None):
         self.core_name = core_name
+        self.dialect = dialect if dialect is not None else get_dialect(core_name)
+        self.partition_schemes = self.dialect.partition_schemes
         self.core_path = core_path
         self.board_id = ""
         self.partition_name = ""
@@ -96,7 +99,7 @@ class CollectingPartitionData:
         """
         Check if the partitions have a default partition and at least one scheme.
         """
-        if self.core_name == "esp32":
+        if self.partition_schemes:
             self.__check_esp32_partitions()
 
     def add_partition(self, board_name:str):
@@ -106,7 +109,7 @@ class CollectingPartitionData:
 
     def collect_partition_data(self, line: str):
         """ Collecting partition data """
-        if self.core_name == "esp32":
+        if self.partition_schemes:
             # esp32 pattern
             self.__get_default_partition(line)
             self.__get_partition_name(line)
@@ -0,0 +1,48 @@
+"""
+This module provides the catalog of Arduino cores and their package index URLs.
+Part of repository: www.github.com/hredan/esp-board-overview
+Author: hredan
+Copyright (c) 2025 hredan
+"""
+import os
+import json
+
+DEFAULT_CATALOG_PATH = os.path.join(os.path.dirname(__file__), "..", "core_catalog.json")
+
+class CoreCatalogEntry:
+    """Class to hold the package index of a single core."""
+    def __init__(self, core_name: str, index_url: str):
+        self.core_name = core_name
+        self.index_url = index_url
+
+    @property
+    def index_file_name(self) -> str:
+        """File name of the package index, e.g. package_esp32_index.json"""
+        return self.index_url.rsplit('/', 1)[-1]
+
+    def get_index_path(self, directory_path: str) -> str:
+        """Path of the downloaded package index in a directory, e.g. ./esp_data/package_esp32_index.json"""
+        return f"{directory_path}/{self.index_file_name}"
+
+class CoreCatalog(list[CoreCatalogEntry]):
+    """Class to hold the list of cores, the order of the catalog is the order of the core list."""
+    def get_entry(self, core_name: str) -> CoreCatalogEntry:
+        """Get the catalog entry of a core.
+        :raises ValueError: if the core is not part of the catalog"""
+        for entry in self:
+            if entry.core_name == core_name:
+                return entry
+        raise ValueError(f"Error: core {core_name} is not part of the core catalog")
+
+    def get_core_names(self) -> list[str]:
+        """Get the names of all cores in the catalog."""
+        return [entry.core_name for entry in self]
+
+def load_core_catalog(catalog_path: str = DEFAULT_CATALOG_PATH) -> CoreCatalog:
+    """ Load the core catalog from a JSON file.
+    [{"core_name": "esp32", "index_url": "https://.../package_esp32_index.json"}, ...]
+    :param catalog_path: Path to the catalog file.
+    :return: Core catalog."""
+    with open(catalog_path, 'r', encoding="utf8") as file:
+        catalog_data: list[dict[str, str]] = json.load(file)
+    return CoreCatalog(CoreCatalogEntry(entry["core_name"], entry["index_url"]) for entry in catalog_data)
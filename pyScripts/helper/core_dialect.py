@@ -0,0 +1,90 @@
+"""
+Registry of core dialects. A dialect describes how an Arduino core differs from the others:
+boards.txt keys, path layout of the source archive and installed core, and LED resolution.
+The dialect is selected once per core, the collectors use its precomputed handlers.
+Part of repository: www.github.com/hredan/esp-board-overview
+Author: hredan
+Copyright (c) 2025 hredan
+"""
+from collections.abc import Mapping
+from types import MappingProxyType
+
+from helper.board_fields import BOARD_FIELDS, FieldSpec, KeyPathMatcher, add_byte_unit
+from helper.header_evaluator import HeaderScanner, SOC_GPIO_PIN_COUNT
+
+class CoreDialect:
+    """
+    Generic Arduino core dialect, used for cores without a registered dialect.
+    Subclasses override the class attributes and handlers.
+    """
+    name = ""
+    # boards.txt has PartitionScheme menus and tools/partitions/*.csv files
+    partition_schemes = False
+    # boards.txt keys collected into BoardData, see board_fields.py
+    board_fields: list[FieldSpec] = BOARD_FIELDS
+    # boards.txt keys of the flash sizes a board can be built with, checked against the partition schemes
+    flash_fields: list[FieldSpec] = [FieldSpec("build.flash_size", "flash_size", multi=True)]
+    # symbols known by the compiler, used to resolve LED_BUILTIN, read-only as it is shared by all instances
+    predefined_symbols: Mapping[str, int] = MappingProxyType({})
+
+    def __init__(self, core_name: str):
+        self.core_name = core_name
+        # compiled once, used for every line of boards.txt
+        self.board_matcher = KeyPathMatcher(self.board_fields)
+
+    def resolve_led(self, header: HeaderScanner) -> int | None:
+        """
+        Resolve the built-in LED gpio of a variant header.
+        :return: gpio or None if it could not be resolved
+        """
+        return header.scan_symbol("LED_BUILTIN")
+
+    def archive_directory(self, version: str) -> str:
+        """ Directory name of the extracted source archive, e.g. esp8266-3.1.2 """
+        return f"{self.core_name}-{version}"
+
+    def installed_path(self, packages_path: str, version: str) -> str:
+        """ Path of the core installed by arduino-cli below the packages directory """
+        return f"{packages_path}/{self.core_name}/hardware/{self.core_name}/{version}"
+
+# registered dialects by core name
+DIALECTS: dict[str, type[CoreDialect]] = {}
+
+def register_dialect(dialect: type[CoreDialect]) -> type[CoreDialect]:
+    """ Register a dialect class by its name, usable as class decorator """
+    DIALECTS[dialect.name] = dialect
+    return dialect
+
+def get_dialect(core_name: str) -> CoreDialect:
+    """
+    Get the dialect of a core.
+    :return: registered dialect or the generic CoreDialect
+    """
+    return DIALECTS.get(core_name, CoreDialect)(core_name)
+
+@register_dialect
+class Esp8266Dialect(CoreDialect):
+    """ esp8266 core: flash sizes are part of the eesz menu """
+    name = "esp8266"
+    board_fields = [
+        FieldSpec("build.variant", "variant"),
+        FieldSpec("build.mcu", "mcu"),
+        # the flash size of autoflash is detected at upload, it is not a flash size of the board
+        FieldSpec("menu.eesz.*.build.flash_size", "flash_size", multi=True, skip=("autoflash",),
+                  convert=add_byte_unit),
+    ]
+
+@register_dialect
+class Esp32Dialect(CoreDialect):
+    """ esp32 core: partition schemes and LEDs behind SOC_GPIO_PIN_COUNT (RGB LEDs) """
+    name = "esp32"
+    partition_schemes = True
+    # the flash size of the FlashSize menu is selected at build time, next to the partition scheme
+    flash_fields = [
+        FieldSpec("build.flash_size", "flash_size", multi=True),
+        FieldSpec("menu.FlashSize.*.build.flash_size", "flash_size", multi=True),
+    ]
+    predefined_symbols = MappingProxyType({"SOC_GPIO_PIN_COUNT": SOC_GPIO_PIN_COUNT})
+
+    def archive_directory(self, version: str) -> str:
+        return f"{self.core_name}-core-{version}"
@@ -0,0 +1,87 @@
+"""
+This module discovers the cores installed in an Arduino data directory and collects them
+in parallel on a process pool.
+Every packages/<packager>/hardware/<arch>/<version>/boards.txt is a core.
+Part of repository: www.github.com/hredan/esp-board-overview
+Author: hredan
+Copyright (c) 2025 hredan
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, NamedTuple
+
+from helper.collecting_core_data import CollectingCoreData
+
+class InstalledCore(NamedTuple):
+    """Class to hold an installed core version."""
+    packager: str
+    core_name: str
+    version: str
+    core_path: str
+
+    def get_export_name(self) -> str:
+        """ base name of the exported json files, e.g. esp32-esp32-3.3.0 """
+        return f"{self.packager}-{self.core_name}-{self.version}"
+
+def _scan_directories(path: str) -> list[os.DirEntry[str]]:
+    """ sorted sub directories, an empty list if path is not a directory """
+    try:
+        with os.scandir(path) as entries:
+            return sorted((entry for entry in entries if entry.is_dir()), key=lambda entry: entry.name)
+    except (FileNotFoundError, NotADirectoryError):
+        return []
+
+def discover_cores(data_path: str) -> list[InstalledCore]:
+    """
+    Find all installed cores of an Arduino data directory.
+    :param data_path: Arduino data directory (e.g. ~/.arduino15) or its packages directory
+    :return: list of InstalledCore sorted by packager, core name and version
+    """
+    packages_path = os.path.join(data_path, "packages")
+    if not os.path.isdir(packages_path):
+        packages_path = data_path
+    cores: list[InstalledCore] = []
+    for packager in _scan_directories(packages_path):
+        for arch in _scan_directories(os.path.join(packager.path, "hardware")):
+            for version in _scan_directories(arch.path):
+                if os.path.isfile(os.path.join(version.path, "boards.txt")):
+                    cores.append(InstalledCore(packager.name, arch.name, version.name, version.path))
+    return cores
+
+def collect_installed_core(core: InstalledCore, output_path: str) -> dict[str, Any]:
+    """
+    Collect and export an installed core, runs in a worker process.
+    :param core: installed core
+    :param output_path: directory of the exported json files
+    :return: report entry of the core
+    """
+    report: dict[str, Any] = {
+        "packager": core.packager,
+        "core_name": core.core_name,
+        "version": core.version,
+        "core_path": core.core_path,
+    }
+    try:
+        core_data = CollectingCoreData(core.core_name, core.version, core.core_path)
+        core_data.export_json(output_path, core.get_export_name())
+    except (ValueError, OSError, UnicodeDecodeError) as error:
+        report["error"] = str(error)
+        return report
+    report["boards"] = len(core_data.boards)
+    report["boards_without_led"] = core_data.num_of_boards_without_led
+    report["flash_mismatches"] = len(core_data.flash_mismatches)
+    return report
+
+def collect_installed_cores(cores: list[InstalledCore], output_path: str,
+                            max_workers: int | None = None) -> list[dict[str, Any]]:
+    """
+    Collect and export the cores in parallel.
+    :param cores: installed cores, e.g. of discover_cores
+    :param output_path: directory of the exported json files
+    :param max_workers: number of worker processes, default is the number of CPUs
+    :return: combined report with an entry for each core in the order of cores
+    """
+    if not cores:
+        return []
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(collect_installed_core, cores, [output_path] * len(cores)))
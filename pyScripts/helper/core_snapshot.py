@@ -0,0 +1,71 @@
+"""
+This module provides a binary snapshot of collected core data, e.g. esp_data/esp32_snapshot.pickle.
+A snapshot stores the schema version and a fingerprint of the input files of the core
+(boards.txt, headers and partition csv files) in front of the pickled data, so a snapshot
+of another core version, of changed input files or of an older schema is detected
+without unpickling the data and the data is collected again.
+Part of repository: www.github.com/hredan/esp-board-overview
+Author: hredan
+Copyright (c) 2025 hredan
+"""
+import hashlib
+import mmap
+import os
+import pickle
+from typing import Any, cast
+
+from helper.publish_data import write_file
+
+# increase if the pickled classes or the stored fields change
+SNAPSHOT_SCHEMA_VERSION = 2
+
+def get_input_files(core_path: str, core_name: str) -> list[str]:
+    """
+    Get the files of a core read by the collection.
+    :return: sorted paths relative to core_path
+    """
+    input_files: list[str] = ["boards.txt"] if os.path.isfile(os.path.join(core_path, "boards.txt")) else []
+    for sub_directory, extension in ((os.path.join("cores", core_name), ".h"), ("variants", ".h"),
+                                     (os.path.join("tools", "partitions"), ".csv")):
+        for directory, _, file_names in os.walk(os.path.join(core_path, sub_directory)):
+            input_files.extend(os.path.relpath(os.path.join(directory, file_name), core_path)
+                               for file_name in file_names if file_name.endswith(extension))
+    return sorted(input_files)
+
+def get_input_fingerprint(core_path: str, core_name: str, core_version: str) -> str:
+    """
+    Fingerprint of the core and its input files by path, size and modification time,
+    the files are not read.
+    """
+    digest = hashlib.sha256(f"{SNAPSHOT_SCHEMA_VERSION}:{core_name}:{core_version}\n".encode("utf-8"))
+    for input_file in get_input_files(core_path, core_name):
+        stat = os.stat(os.path.join(core_path, input_file))
+        digest.update(f"{input_file}:{stat.st_size}:{stat.st_mtime_ns}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+def save_snapshot(path: str, fingerprint: str, data: dict[str, Any]):
+    """
+    Write the header with schema version and fingerprint followed by the data.
+    The file is replaced atomically.
+    """
+    header = pickle.dumps({"schema": SNAPSHOT_SCHEMA_VERSION, "fingerprint": fingerprint},
+                          protocol=pickle.HIGHEST_PROTOCOL)
+    write_file(path, header + pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL))
+
+def load_snapshot(path: str, fingerprint: str) -> dict[str, Any] | None:
+    """
+    Read the data of a snapshot, the file is memory-mapped and only unpickled if the header matches.
+    A snapshot which can not be unpickled, e.g. a truncated file or changed classes, is a cache miss.
+    :return: data or None if the file is missing, unreadable or of another schema version or fingerprint
+    """
+    if not os.path.isfile(path) or os.path.getsize(path) == 0:
+        return None
+    try:
+        with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            if pickle.load(mapped) != {"schema": SNAPSHOT_SCHEMA_VERSION, "fingerprint": fingerprint}:
+                return None
+            data = pickle.load(mapped)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError, IndexError, KeyError,
+            TypeError, ValueError, MemoryError, RecursionError):
+        return None
+    return cast(dict[str, Any], data) if isinstance(data, dict) else None
@@ -0,0 +1,53 @@
+""" Module for polling the files of an installed core for changes """
+import os
+
+FileState = tuple[int, int]
+
+class CoreWatcher:
+    """
+    Stat based polling of boards.txt, the variant and core headers and the partition csv files of a core.
+    """
+    def __init__(self, core_path: str):
+        self.core_path = core_path
+        self.snapshot: dict[str, FileState] = self.scan()
+
+    @classmethod
+    def __scan_dir(cls, path: str, extension: str, files: dict[str, FileState], depth: int = 0):
+        try:
+            entries = list(os.scandir(path))
+        except OSError:
+            return
+        for entry in entries:
+            if entry.is_dir():
+                if depth > 0:
+                    CoreWatcher.__scan_dir(entry.path, extension, files, depth - 1)
+            elif entry.name.endswith(extension):
+                stat = entry.stat()
+                files[entry.path] = (stat.st_mtime_ns, stat.st_size)
+
+    def scan(self) -> dict[str, FileState]:
+        """
+        Get modification time and size of all watched files.
+        :return: dictionary of file path to (mtime in ns, size)
+        """
+        files: dict[str, FileState] = {}
+        boards_txt = os.path.join(self.core_path, "boards.txt")
+        if os.path.isfile(boards_txt):
+            stat = os.stat(boards_txt)
+            files[boards_txt] = (stat.st_mtime_ns, stat.st_size)
+        CoreWatcher.__scan_dir(os.path.join(self.core_path, "variants"), ".h", files, depth=1)
+        # headers of cores/<core> are included by the variants
+        CoreWatcher.__scan_dir(os.path.join(self.core_path, "cores"), ".h", files, depth=1)
+        CoreWatcher.__scan_dir(os.path.join(self.core_path, "tools", "partitions"), ".csv", files)
+        return files
+
+    def poll(self) -> list[str]:
+        """
+        Compare the watched files with the last snapshot.
+        :return: sorted paths of added, modified and removed files
+        """
+        current = self.scan()
+        changed = {path for path, state in current.items() if self.snapshot.get(path) != state}
+        changed.update(path for path in self.snapshot if path not in current)
+        self.snapshot = current
+        return sorted(changed)
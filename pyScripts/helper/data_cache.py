@@ -0,0 +1,157 @@
+"""
+This module provides a persistent cache of downloaded package indexes, core archives and
+extracted cores, e.g. in ./esp_data. Every entry is a file or directory in the cache directory
+with metadata (source url, version, checksum, size and last use) in cache_index.json.
+If the cache is larger than its byte budget, the least recently used entries are removed.
+Files which are not entries, e.g. the generated json files, are never touched.
+Part of repository: www.github.com/hredan/esp-board-overview
+Author: hredan
+Copyright (c) 2025 hredan
+"""
+import json
+import os
+import shutil
+import time
+from collections.abc import Callable
+from typing import Any
+
+from helper.publish_data import write_file
+from helper.verified_download import get_file_digest
+
+CACHE_INDEX_FILE = "cache_index.json"
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3
+
+class CacheEntry:
+    """Metadata of a cached file or directory, size and last use are set when the entry is added or used."""
+    def __init__(self, key: str, url: str = "", version: str = "", checksum: str = ""):
+        self.key = key
+        self.url = url
+        self.version = version
+        self.checksum = checksum
+        self.size = 0
+        self.last_used = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        """ Convert the entry to a dictionary for cache_index.json """
+        return {"url": self.url, "version": self.version, "checksum": self.checksum,
+                "size": self.size, "last_used": self.last_used}
+
+    @classmethod
+    def from_dict(cls, key: str, data: dict[str, Any]) -> "CacheEntry":
+        """ Create an entry from a dictionary of cache_index.json """
+        entry = cls(key, data.get("url", ""), data.get("version", ""), data.get("checksum", ""))
+        entry.size = data.get("size", 0)
+        entry.last_used = data.get("last_used", 0.0)
+        return entry
+
+def get_path_size(path: str) -> int:
+    """ Size of a file or the total size of the files below a directory in bytes """
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    size = 0
+    for directory, _, file_names in os.walk(path):
+        for file_name in file_names:
+            file_path = os.path.join(directory, file_name)
+            if not os.path.islink(file_path):
+                size += os.path.getsize(file_path)
+    return size
+
+class DataCache:
+    """
+    Persistent cache directory with LRU eviction under a byte budget.
+    Entries used by this instance (get or put) are never evicted, so a run keeps what it needs.
+    """
+    def __init__(self, cache_dir: str, max_bytes: int = DEFAULT_MAX_BYTES,
+                 clock: Callable[[], float] = time.time):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self.entries: dict[str, CacheEntry] = {}
+        self.__used: set[str] = set()
+        os.makedirs(cache_dir, exist_ok=True)
+        index_path = os.path.join(cache_dir, CACHE_INDEX_FILE)
+        # False for a new cache directory or one of an older version without cache index
+        self.has_index = os.path.isfile(index_path)
+        if self.has_index:
+            with open(index_path, 'r', encoding='utf-8') as file:
+                index: dict[str, dict[str, Any]] = json.load(file)
+            self.entries = {key: CacheEntry.from_dict(key, data) for key, data in index.items()}
+
+    def get_path(self, key: str) -> str:
+        """ Path of an entry in the cache directory """
+        return os.path.join(self.cache_dir, key)
+
+    def get(self, key: str, checksum: str = "", version: str = "") -> str | None:
+        """
+        Look up an entry and mark it as used.
+        :param checksum: expected checksum of the entry, not compared if empty
+        :param version: expected version of the entry, not compared if empty
+        :return: path of the entry, None if it is missing, removed from disk or outdated
+        """
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if not os.path.exists(self.get_path(key)):
+            del self.entries[key]
+            return None
+        if (checksum and entry.checksum != checksum) or (version and entry.version != version):
+            return None
+        entry.last_used = self.clock()
+        self.__used.add(key)
+        return self.get_path(key)
+
+    def put(self, key: str, url: str = "", version: str = "", checksum: str = "") -> CacheEntry:
+        """
+        Add or update the entry of a file or directory already written to get_path(key).
+        The checksum of a file is computed if not given.
+        :raises ValueError: if the path does not exist
+        """
+        path = self.get_path(key)
+        if not os.path.exists(path):
+            raise ValueError(f"Error: {path} does not exist, it can not be added to the cache")
+        if not checksum and os.path.isfile(path):
+            checksum = "SHA-256:" + get_file_digest(path)
+        entry = CacheEntry(key, url, version, checksum)
+        entry.size = get_path_size(path)
+        entry.last_used = self.clock()
+        self.entries[key] = entry
+        self.__used.add(key)
+        return entry
+
+    def remove(self, key: str):
+        """ Remove an entry and its file or directory """
+        self.entries.pop(key, None)
+        self.__used.discard(key)
+        path = self.get_path(key)
+        if os.path.isdir(path) and not os.path.islink(path):
+            shutil.rmtree(path)
+        elif os.path.lexists(path):
+            os.unlink(path)
+
+    def get_total_size(self) -> int:
+        """ Total size of all entries in bytes """
+        return sum(entry.size for entry in self.entries.values())
+
+    def evict(self) -> list[str]:
+        """
+        Remove the least recently used entries until the cache fits into max_bytes,
+        entries used by this instance are kept.
+        :return: keys of the removed entries
+        """
+        removed: list[str] = []
+        total_size = self.get_total_size()
+        for entry in sorted(self.entries.values(), key=lambda entry: entry.last_used):
+            if total_size <= self.max_bytes:
+                break
+            if entry.key in self.__used:
+                continue
+            self.remove(entry.key)
+            total_size -= entry.size
+            removed.append(entry.key)
+        return removed
+
+    def save(self):
+        """ Write the metadata of all entries to cache_index.json """
+        index = {key: entry.to_dict() for key, entry in sorted(self.entries.items())}
+        write_file(os.path.join(self.cache_dir, CACHE_INDEX_FILE),
+                   json.dumps(index, indent=4).encode("utf-8"))
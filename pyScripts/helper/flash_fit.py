@@ -0,0 +1,139 @@
+"""
+This module checks if the partition schemes of the boards fit into the flash sizes of the boards.
+A board offers its default flash size and the options of its flash size menu, a scheme fits
+if it fits into the largest flash size the board can be built with.
+The flash sizes of the boards and the end offsets of the schemes are arrays, the fit of all
+board and scheme pairs is computed in one vectorized pass with numpy.
+Without numpy the pairs are checked one by one.
+Part of repository: www.github.com/hredan/esp-board-overview
+Author: hredan
+Copyright (c) 2025 hredan
+"""
+import logging
+import re
+from collections.abc import Iterable
+from typing import Any, NamedTuple
+
+from helper.board_fields import FieldSpec, KeyPathMatcher, get_board_id, split_line
+from helper.partitions_data import PartitionList
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, see check_pairs
+    np = None
+
+log_flash = logging.getLogger(__name__)
+
+_FLASH_SIZE_PATTERN = re.compile(r"(\d+)\s*([KM])B?$", re.IGNORECASE)
+_FLASH_UNITS = {"K": 1024, "M": 1024 * 1024}
+
+def parse_flash_size(flash_size: str) -> int:
+    """
+    Parse a flash size of a board.
+    :param flash_size: e.g. "4MB", "512KB" or "4M"
+    :return: size in bytes, 0 if the size is unknown
+    """
+    match_size = _FLASH_SIZE_PATTERN.match(flash_size.strip())
+    if not match_size:
+        return 0
+    return int(match_size.group(1)) * _FLASH_UNITS[match_size.group(2).upper()]
+
+class FlashMismatch(NamedTuple):
+    """ A partition scheme of a board which is larger than every flash size of the board """
+    board: str
+    build: str
+    scheme_end: int
+    flash_size: int
+
+    def __repr__(self) -> str:
+        return f"FlashMismatch({self.board}, {self.build}, {self.scheme_end:#x} > {self.flash_size:#x})"
+
+def collect_flash_sizes(lines: Iterable[str], flash_fields: Iterable[FieldSpec]) -> dict[str, int]:
+    """
+    Get the largest flash size each board can be built with.
+    :param lines: lines of boards.txt
+    :param flash_fields: keys of the flash sizes, e.g. "build.flash_size" and "menu.FlashSize.*.build.flash_size"
+    :return: flash size in bytes of each board with a known flash size
+    """
+    matcher = KeyPathMatcher(flash_fields)
+    flash_sizes: dict[str, int] = {}
+    board_id = ""
+    for line in lines:
+        board_id = get_board_id(*split_line(line)) or board_id
+        match_line = matcher.match_line(board_id, line) if board_id else None
+        if match_line is not None:
+            flash_sizes[board_id] = max(flash_sizes.get(board_id, 0), parse_flash_size(match_line[1]))
+    return {board: flash_size for board, flash_size in flash_sizes.items() if flash_size > 0}
+
+def get_board_builds(partitions: PartitionList) -> dict[str, list[str]]:
+    """ Get the scheme build names of each board, the default partition and the menu schemes """
+    board_builds: dict[str, list[str]] = {}
+    for board, partition_data in partitions.items():
+        builds = [scheme.build for scheme in partition_data.schemes.values() if scheme.build]
+        if partition_data.default and partition_data.default not in builds:
+            builds.insert(0, partition_data.default)
+        board_builds[board] = builds
+    return board_builds
+
+def check_pairs(flash_sizes: list[int], scheme_ends: list[int],
+                board_index: list[int], scheme_index: list[int]) -> list[int]:
+    """
+    Check board and scheme pairs, a scheme fits if its end offset is not larger than the
+    flash size of the board.
+    :param flash_sizes: largest flash size of each board
+    :param scheme_ends: end offset of each scheme
+    :param board_index: board of each pair
+    :param scheme_index: scheme of each pair
+    :return: sorted positions of the pairs which do not fit
+    """
+    if np is not None:
+        ends: Any = np.asarray(scheme_ends, dtype=np.int64)[np.asarray(scheme_index, dtype=np.intp)]
+        flash: Any = np.asarray(flash_sizes, dtype=np.int64)[np.asarray(board_index, dtype=np.intp)]
+        return [int(position) for position in np.flatnonzero(ends > flash)]
+    return [position for position, (board, scheme) in enumerate(zip(board_index, scheme_index))
+            if scheme_ends[scheme] > flash_sizes[board]]
+
+def get_pairs(boards: Iterable[str], partitions: PartitionList,
+              builds: list[str]) -> tuple[list[str], list[int], list[int]]:
+    """
+    Get the board and scheme pairs to check.
+    :param boards: boards with a known flash size
+    :param builds: scheme build names with a known end offset
+    :return: board ids, board of each pair and scheme of each pair as positions in builds
+    """
+    board_builds = get_board_builds(partitions)
+    build_positions = {build: position for position, build in enumerate(builds)}
+    board_ids = [board for board in boards if board in board_builds]
+    board_index: list[int] = []
+    scheme_index: list[int] = []
+    for position, board in enumerate(board_ids):
+        for build in board_builds[board]:
+            if build in build_positions:
+                board_index.append(position)
+                scheme_index.append(build_positions[build])
+    return board_ids, board_index, scheme_index
+
+def find_flash_mismatches(flash_sizes: dict[str, int], partitions: PartitionList,
+                          scheme_ends: dict[str, int]) -> list[FlashMismatch]:
+    """
+    Find the partition schemes which do not fit into any flash size of their boards.
+    Boards without a known flash size and schemes without an end offset are skipped.
+    :param flash_sizes: largest flash size of each board, see collect_flash_sizes
+    :param partitions: collected partition schemes of the boards
+    :param scheme_ends: end offset of each scheme build name
+    :return: list of FlashMismatch
+    """
+    builds = sorted(scheme_ends)
+    board_ids, board_index, scheme_index = get_pairs(flash_sizes, partitions, builds)
+    mismatches: list[FlashMismatch] = []
+    for position in check_pairs([flash_sizes[board] for board in board_ids],
+                                [scheme_ends[build] for build in builds], board_index, scheme_index):
+        board, build = board_ids[board_index[position]], builds[scheme_index[position]]
+        mismatch = FlashMismatch(board, build, scheme_ends[build], flash_sizes[board])
+        mismatches.append(mismatch)
+        log_flash.info("Partition scheme '%s' of '%s' ends at %#x, flash size is %#x",
+                       mismatch.build, mismatch.board, mismatch.scheme_end, mismatch.flash_size)
+    if mismatches:
+        log_flash.warning("%s partition schemes do not fit into the flash size of their board",
+                          len(mismatches))
+    return mismatches
@@ -0,0 +1,387 @@
+""" Tokenizing evaluator for #define and static const entries of pins_arduino.h files """
+import re
+import os
+from collections.abc import Iterable, Iterator
+
+#components/soc/esp32/include/soc/soc_caps.h
+SOC_GPIO_PIN_COUNT = 40
+
+# directives, identifiers/numbers (a directly following '(' is kept, e.g. function like macros),
+# strings and single character operators
+_TOKEN_PATTERN = re.compile(r'#\s*[A-Za-z_]+|\w+\(?|"[^"]*"|\S')
+
+class HeaderTokenizer:
+    """ Line based C tokenizer, keeps track of block comments spanning several lines """
+    def __init__(self):
+        self.in_block_comment = False
+
+    def strip_comments(self, line: str) -> str:
+        """ Remove line and block comments from a line """
+        code = ""
+        pos = 0
+        while True:
+            if self.in_block_comment:
+                close = line.find("*/", pos)
+                if close == -1:
+                    return code
+                self.in_block_comment = False
+                pos = close + 2
+            block = line.find("/*", pos)
+            comment = line.find("//", pos)
+            if comment != -1 and (block == -1 or comment < block):
+                return code + line[pos:comment]
+            if block == -1:
+                return code + line[pos:]
+            code += line[pos:block] + " "
+            self.in_block_comment = True
+            pos = block + 2
+
+    def tokenize(self, line: str) -> list[str]:
+        """ Split a line into tokens, comments and whitespace are dropped """
+        if "/" in line or self.in_block_comment:
+            line = self.strip_comments(line)
+        tokens: list[str] = _TOKEN_PATTERN.findall(line)
+        if tokens and tokens[0][0] == "#":
+            tokens[0] = "#" + tokens[0][1:].lstrip()
+        return tokens
+
+def is_identifier(token: str) -> bool:
+    """ Check if a token is a C identifier """
+    return (token[0].isalpha() or token[0] == "_") and token[-1] != "("
+
+def parse_number(text: str) -> int:
+    """ Convert a C integer literal (decimal, hex or octal, optional U/L suffix) to int """
+    literal = text.rstrip("uUlL")
+    if literal[:2] in ("0x", "0X"):
+        return int(literal, 16)
+    if len(literal) > 1 and literal[0] == "0":
+        return int(literal, 8)
+    return int(literal)
+
+class HeaderEvaluator:
+    """
+    Symbol table of #define and static const values of a header file.
+    Each line is lexed once, definitions are stored as token lists and
+    evaluated on demand as integer expressions with '+' and parentheses.
+    """
+    def __init__(self, predefined: dict[str, int] | None = None):
+        self.predefined: dict[str, int] = dict(predefined or {})
+        self.symbols: dict[str, list[str]] = {}
+        self.tokenizer = HeaderTokenizer()
+
+    @classmethod
+    def get_definition(cls, tokens: list[str]) -> tuple[str, list[str]] | None:
+        """
+        Get name and value tokens of a definition.
+        #define NAME value
+        static const uint8_t NAME = value;
+        :return: tuple of name and value tokens or None if the tokens are no definition
+        """
+        if len(tokens) < 3:
+            return None
+        if tokens[0] == "#define":
+            # NAME( is a function like macro, e.g. #define digitalPinToInterrupt(p) ...
+            if not is_identifier(tokens[1]):
+                return None
+            return tokens[1], tokens[2:]
+        if "const" not in tokens or "=" not in tokens:
+            return None
+        index = tokens.index("=")
+        if index == 0 or not is_identifier(tokens[index - 1]) or tokens.index("const") > index:
+            return None
+        value_tokens: list[str] = []
+        for value in tokens[index + 1:]:
+            if value in (";", ","):
+                break
+            value_tokens.append(value)
+        return tokens[index - 1], value_tokens
+
+    def feed_line(self, line: str) -> tuple[str, list[str]] | None:
+        """
+        Lex a line and store a found definition in the symbol table,
+        the first definition of a symbol wins.
+        :return: found definition or None
+        """
+        if "#" not in line and "=" not in line and "/*" not in line \
+                and not self.tokenizer.in_block_comment:
+            # cannot be a definition and does not change the comment state
+            return None
+        definition = HeaderEvaluator.get_definition(self.tokenizer.tokenize(line))
+        if definition is not None:
+            name, value = definition
+            if name not in self.symbols:
+                self.symbols[name] = value
+        return definition
+
+    def resolve(self, name: str, visiting: frozenset[str] = frozenset()) -> int | None:
+        """
+        Resolve a symbol to an integer value.
+        :return: value of the symbol or None if it could not be resolved
+        """
+        if name in self.predefined:
+            return self.predefined[name]
+        if name in visiting:
+            return None
+        value = self.lookup(name)
+        if value is None:
+            return None
+        return self.evaluate(value, visiting | {name})
+
+    def lookup(self, name: str) -> list[str] | None:
+        """
+        Get the value tokens of a symbol.
+        :return: value tokens or None if the symbol is not defined
+        """
+        return self.symbols.get(name)
+
+    def evaluate(self, tokens: list[str], visiting: frozenset[str] = frozenset()) -> int | None:
+        """
+        Evaluate a token list as integer expression of numbers, symbols, '+' and parentheses.
+        :return: value of the expression or None if it could not be evaluated
+        """
+        result, index = self.__evaluate_sum(tokens, 0, visiting)
+        if index != len(tokens):
+            return None
+        return result
+
+    def __evaluate_sum(self, tokens: list[str], index: int,
+                       visiting: frozenset[str]) -> tuple[int | None, int]:
+        total, index = self.__evaluate_term(tokens, index, visiting)
+        while total is not None and index < len(tokens) and tokens[index] == "+":
+            value, index = self.__evaluate_term(tokens, index + 1, visiting)
+            total = None if value is None else total + value
+        return total, index
+
+    def __evaluate_term(self, tokens: list[str], index: int,
+                        visiting: frozenset[str]) -> tuple[int | None, int]:
+        token = tokens[index] if index < len(tokens) else ""
+        if token[:1].isdigit():
+            try:
+                return parse_number(token), index + 1
+            except ValueError:
+                return None, index
+        if token and is_identifier(token):
+            return self.resolve(token, visiting), index + 1
+        if token == "(":
+            value, index = self.__evaluate_sum(tokens, index + 1, visiting)
+            closed = index < len(tokens) and tokens[index] == ")"
+            return (value, index + 1) if closed else (None, index)
+        return None, index
+
+    def find_symbol(self, line: str, name: str) -> int | None:
+        """
+        Feed a line and, if it defines the given symbol, evaluate the definition.
+        :return: value of the symbol or None if the line does not resolve it
+        """
+        definition = self.feed_line(line)
+        if definition is None or definition[0] != name:
+            return None
+        return self.evaluate(definition[1], frozenset({name}))
+
+
+class HeaderScanner(HeaderEvaluator):
+    """
+    Evaluator working on the raw bytes of a header file. Instead of lexing every line,
+    a substring search jumps to the lines mentioning a symbol and only these lines are
+    parsed. Symbols are looked up on demand and cached in the symbol table.
+    With a HeaderCache, quoted #include files are followed.
+    """
+    def __init__(self, data: bytes, predefined: dict[str, int] | None = None,
+                 path: str = "", cache: "HeaderCache | None" = None):
+        super().__init__(predefined)
+        self.data = data
+        self.path = path
+        self.cache = cache
+        self.undefined: set[str] = set()
+        self.results: dict[str, int | None] = {}
+        self.__includes: list[tuple[int, str]] | None = None
+
+    def reset(self):
+        """ Forget the resolved symbols, the raw buffer and the #include entries are kept """
+        self.symbols.clear()
+        self.undefined.clear()
+        self.results.clear()
+
+    def __in_block_comment(self, pos: int) -> bool:
+        comment_end = self.data.rfind(b"*/", 0, pos)
+        end = pos
+        while True:
+            start = self.data.rfind(b"/*", 0, end)
+            if start <= comment_end:
+                return False
+            # a "/*" behind "//" is part of the line comment
+            line_start = self.data.rfind(b"\n", 0, start) + 1
+            if b"//" not in self.data[line_start:start]:
+                return True
+            end = start
+
+    def __is_word(self, start: int, end: int) -> bool:
+        before = self.data[start - 1:start]
+        after = self.data[end:end + 1]
+        return not (before.isalnum() or before == b"_") and not (after.isalnum() or after == b"_")
+
+    def __iter_lines(self, word: str) -> Iterator[tuple[int, list[str]]]:
+        """ Yield position and tokens of every line containing the word """
+        needle = word.encode()
+        line_end = 0
+        pos = self.data.find(needle)
+        while pos != -1:
+            if pos >= line_end and self.__is_word(pos, pos + len(needle)):
+                line_start = self.data.rfind(b"\n", 0, pos) + 1
+                line_end = self.data.find(b"\n", pos)
+                if line_end == -1:
+                    line_end = len(self.data)
+                tokenizer = HeaderTokenizer()
+                tokenizer.in_block_comment = self.__in_block_comment(line_start)
+                line = self.data[line_start:line_end].decode("utf8", errors="replace")
+                yield line_start, tokenizer.tokenize(line)
+            pos = self.data.find(needle, pos + len(needle))
+
+    def get_includes(self) -> list[tuple[int, str]]:
+        """
+        Get position and file name of the quoted #include entries, e.g. #include "pins_common.h"
+        :return: list of position and file name tuples
+        """
+        if self.__includes is None:
+            self.__includes = []
+            for pos, tokens in self.__iter_lines("include"):
+                if len(tokens) >= 2 and tokens[0] == "#include" and tokens[1][0] == '"':
+                    self.__includes.append((pos, tokens[1].strip('"')))
+        return self.__includes
+
+    def iter_definitions(self, name: str,
+                         seen: frozenset[str] = frozenset()) -> Iterator[list[str]]:
+        """
+        Yield the value tokens of all definitions of a symbol in file order,
+        definitions of included headers are yielded at the position of the #include.
+        :param name: name of the symbol
+        :param seen: headers already on the include chain
+        """
+        includes: list[tuple[int, str]] = []
+        if self.cache is not None:
+            includes = self.get_includes()
+        include_index = 0
+        for pos, tokens in self.__iter_lines(name):
+            while include_index < len(includes) and includes[include_index][0] < pos:
+                yield from self.__iter_included(includes[include_index][1], name, seen)
+                include_index += 1
+            definition = HeaderEvaluator.get_definition(tokens)
+            if definition is not None and definition[0] == name:
+                yield definition[1]
+        for _, include in includes[include_index:]:
+            yield from self.__iter_included(include, name, seen)
+
+    def __iter_included(self, include: str, name: str, seen: frozenset[str]) -> Iterator[list[str]]:
+        if self.cache is None:
+            return
+        header = self.cache.get_include(self.path, include)
+        if header is not None and header.path not in seen and header.path != self.path:
+            yield from header.iter_definitions(name, seen | {self.path})
+
+    def lookup(self, name: str) -> list[str] | None:
+        """
+        Get the value tokens of the first definition of a symbol, searching the buffer on demand.
+        :return: value tokens or None if the symbol is not defined
+        """
+        if name in self.symbols:
+            return self.symbols[name]
+        if name in self.undefined:
+            return None
+        for value in self.iter_definitions(name):
+            self.symbols[name] = value
+            return value
+        self.undefined.add(name)
+        return None
+
+    def scan_symbols(self, names: Iterable[str]) -> dict[str, int | None]:
+        """
+        Evaluate several symbols of the buffer, e.g. all pins of a variant.
+        The header is read once, each symbol costs a substring search of the buffer.
+        :return: value of each symbol, None if no definition could be resolved
+        """
+        return {name: self.scan_symbol(name) for name in names}
+
+    def scan_symbol(self, name: str) -> int | None:
+        """
+        Evaluate the definitions of a symbol in file order, stop at the first resolvable one.
+        :return: value of the symbol or None if no definition could be resolved
+        """
+        if name in self.results:
+            return self.results[name]
+        result: int | None = None
+        for value in self.iter_definitions(name):
+            self.symbols.setdefault(name, value)
+            result = self.evaluate(value, frozenset({name}))
+            if result is not None:
+                break
+        self.results[name] = result
+        return result
+
+class HeaderCache:
+    """
+    Cache of parsed headers for a whole run, every header file is read and scanned only once,
+    also if it is included by many variants. Includes are only followed inside the core tree.
+    """
+    def __init__(self, root: str, predefined: dict[str, int] | None = None,
+                 include_dirs: list[str] | None = None):
+        self.root = os.path.realpath(root)
+        self.predefined: dict[str, int] = dict(predefined or {})
+        self.include_dirs = [os.path.realpath(path) for path in include_dirs or []]
+        self.headers: dict[str, HeaderScanner | None] = {}
+        # reverse include graph, path of a header -> paths of the headers looking it up by #include
+        self.included_by: dict[str, set[str]] = {}
+
+    def get(self, path: str) -> HeaderScanner | None:
+        """
+        Get the scanner of a header file, the file is read on first access.
+        :return: scanner or None if the file does not exist
+        """
+        path = os.path.realpath(path)
+        if path not in self.headers:
+            header: HeaderScanner | None = None
+            if os.path.isfile(path):
+                with open(path, 'rb') as infile:
+                    header = HeaderScanner(infile.read(), self.predefined, path, self)
+            self.headers[path] = header
+        return self.headers[path]
+
+    def invalidate(self, path: str):
+        """
+        Drop a changed header, the resolved symbols of all other headers are reset
+        because they could depend on it by an #include.
+        """
+        self.headers.pop(os.path.realpath(path), None)
+        for header in self.headers.values():
+            if header is not None:
+                header.reset()
+
+    def get_dependents(self, path: str) -> set[str]:
+        """
+        Get a header and all headers including it directly or indirectly, as far as the
+        includes were followed, e.g. the pins_arduino.h files affected by a changed header.
+        :return: real paths of the headers
+        """
+        pending = [os.path.realpath(path)]
+        dependents: set[str] = set()
+        while pending:
+            current = pending.pop()
+            if current not in dependents:
+                dependents.add(current)
+                pending.extend(self.included_by.get(current, ()))
+        return dependents
+
+    def get_include(self, including_path: str, include: str) -> HeaderScanner | None:
+        """
+        Find a quoted include relative to the including header or the include directories.
+        :return: scanner or None if the include is not found inside the core tree
+        """
+        for directory in [os.path.dirname(including_path)] + self.include_dirs:
+            path = os.path.realpath(os.path.join(directory, include))
+            if os.path.commonpath([self.root, path]) != self.root:
+                continue
+            # also missing candidates are recorded, they could be created later
+            self.included_by.setdefault(path, set()).add(os.path.realpath(including_path))
+            header = self.get(path)
+            if header is not None:
+                return header
+        return None
@@ -4,47 +4,54 @@ Part of repository: www.github.com/hredan/esp-board-overview
 Author: hredan
 Copyright (c) 2025 hredan
 """
-import json
-LAST_VERSION_INDEX = 0
+from helper.core_catalog import CoreCatalog, load_core_catalog
+from helper.index_stream import PlatformEntry, iter_platforms
+ESP_DATA_PATH = "./esp_data"
 class IndexData:
-    """Class to handle ESP core package index data."""
-    def __init__(self, core_name: str):
+    """Class to handle core package index data of any core in the core catalog."""
+    def __init__(self, core_name: str, catalog: CoreCatalog | None = None):
         self.core_name = core_name
-        if core_name == "esp32":
-            self.package_index_path = "./esp_data/package_esp32_index.json"
-        elif core_name == "esp8266":
-            self.package_index_path = "./esp_data/package_esp8266com_index.json"
-        self.index_data = self.__load_index_data()
+        if catalog is None:
+            catalog = load_core_catalog()
+        catalog_entry = catalog.get_entry(core_name)
+        self.package_index_path = catalog_entry.get_index_path(ESP_DATA_PATH)
+        self.latest_platform = self.__load_index_data()
 
-    def __load_index_data(self):
-        """ Load the index data from the JSON file.
-        :return: Parsed JSON data."""
+    def __load_index_data(self) -> PlatformEntry:
+        """ Stream the index file until the latest platform of the first package is found.
+        :return: Latest platform entry."""
         with open(self.package_index_path, 'r', encoding="utf8") as file:
-            index_data = json.load(file)
-        return index_data
+            latest_platform = next(iter_platforms(file, latest_only=True), None)
+        if latest_platform is None:
+            raise ValueError(f"Error: no platform found in {self.package_index_path}")
+        return latest_platform
 
-    def get_core_name(self):
+    def get_core_name(self) -> str:
         """ Get the core name from the index data.
         :return: Core name as a string."""
-        return self.index_data["packages"][LAST_VERSION_INDEX]["name"]
+        return self.latest_platform.package
 
-    def get_last_core_version(self):
+    def get_last_core_version(self) -> str:
         """ Get the last core version from the index data.
         :return: Last core version as a string."""
-        return self.index_data["packages"][LAST_VERSION_INDEX]["platforms"][LAST_VERSION_INDEX]["version"]
+        return self.latest_platform.version
 
-def get_core_list() -> list[dict[str, str]]:
+def get_core_list(catalog: CoreCatalog | None = None) -> list[dict[str, str]]:
     """Retrieve a list of core names from the index data.
+    :param catalog: Core catalog, the default catalog is loaded if not given.
     :return: List of core names."""
     core_list: list[dict[str, str]] = []
-    core_names = ["esp8266", "esp32"]
-    for core_name in core_names:
-        index_data = IndexData(core_name)
+    if catalog is None:
+        catalog = load_core_catalog()
+    for core_name in catalog.get_core_names():
+        index_data = IndexData(core_name, catalog)
+        name = index_data.get_core_name()
+        version = index_data.get_last_core_version()
         core_info: dict[str, str] = {
-            "core": f"{index_data.get_core_name()}:{index_data.get_core_name()}",
-            "installed_version": index_data.get_last_core_version(),
-            "latest_version": index_data.get_last_core_version(),
-            "core_name": index_data.get_core_name()
+            "core": f"{name}:{name}",
+            "installed_version": version,
+            "latest_version": version,
+            "core_name": name
         }
         core_list.append(core_info)
     return core_list
@@ -0,0 +1,208 @@
+"""
+This module provides an asyncio based fetcher for package indexes and core archives.
+Part of repository: www.github.com/hredan/esp-board-overview
+Author: hredan
+Copyright (c) 2025 hredan
+"""
+import asyncio
+import http.client
+import os
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Protocol
+from urllib.parse import urljoin, urlsplit
+
+from helper.index_stream import PlatformEntry
+from helper.verified_download import file_matches_checksum, save_stream_verified
+
+MAX_REDIRECTS = 5
+REDIRECT_CODES = (301, 302, 303, 307, 308)
+
+class RangeNotSupported(OSError):
+    """Raised if the server answers a range request with the complete file."""
+
+class Transport(Protocol):
+    """Blocking transport used by the AsyncFetcher, e.g. HttpTransport or a test stand-in."""
+    def fetch(self, url: str, save_path: str, checksum: str = "", size: int = 0) -> None:
+        """Download url to save_path, verify checksum and size if given."""
+
+    def close(self) -> None:
+        """Close the idle connections."""
+
+class HttpTransport:
+    """
+    Stdlib HTTP transport with a bounded pool of keep-alive connections.
+    At most max_connections requests are active at the same time, idle connections
+    are kept per host and reused by the next request to the same host.
+    """
+    def __init__(self, max_connections: int = 4, timeout: float = 60.0):
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.__slots = threading.BoundedSemaphore(max_connections)
+        self.__lock = threading.Lock()
+        self.__idle: dict[tuple[str, str], list[http.client.HTTPConnection]] = {}
+        self.num_of_connections = 0
+
+    def __acquire(self, scheme: str, netloc: str,
+                  reuse: bool = True) -> tuple[http.client.HTTPConnection, bool]:
+        with self.__lock:
+            idle = self.__idle.get((scheme, netloc))
+            if idle and reuse:
+                return idle.pop(), True
+            self.num_of_connections += 1
+        if scheme == "https":
+            return http.client.HTTPSConnection(netloc, timeout=self.timeout), False
+        return http.client.HTTPConnection(netloc, timeout=self.timeout), False
+
+    def __release(self, scheme: str, netloc: str, connection: http.client.HTTPConnection, reusable: bool):
+        kept = False
+        if reusable:
+            with self.__lock:
+                idle = self.__idle.setdefault((scheme, netloc), [])
+                if len(idle) < self.max_connections:
+                    idle.append(connection)
+                    kept = True
+        if not kept:
+            connection.close()
+
+    def __send(self, scheme: str, netloc: str, path: str,
+               headers: dict[str, str]) -> tuple[http.client.HTTPConnection, http.client.HTTPResponse]:
+        """ send a request, an idle connection closed by the server is replaced once """
+        connection, reused = self.__acquire(scheme, netloc)
+        try:
+            connection.request("GET", path, headers=headers)
+            return connection, connection.getresponse()
+        except (http.client.RemoteDisconnected, ConnectionError):
+            self.__release(scheme, netloc, connection, False)
+            if not reused:
+                raise
+        connection, _ = self.__acquire(scheme, netloc, reuse=False)
+        try:
+            connection.request("GET", path, headers=headers)
+            return connection, connection.getresponse()
+        except Exception:
+            self.__release(scheme, netloc, connection, False)
+            raise
+
+    @contextmanager
+    def __open(self, url: str, headers: dict[str, str]) -> Iterator[http.client.HTTPResponse]:
+        """
+        Send a GET request, redirects are followed. The response is read within the context,
+        its connection is held until the context ends and is reused if the response was read completely.
+        """
+        for _ in range(MAX_REDIRECTS + 1):
+            parts = urlsplit(url)
+            path = parts.path or "/"
+            if parts.query:
+                path += "?" + parts.query
+            # at most max_connections requests are active at the same time
+            with self.__slots:
+                connection, response = self.__send(parts.scheme, parts.netloc, path, headers)
+                reusable = False
+                try:
+                    location = response.getheader("Location")
+                    if response.status in REDIRECT_CODES and location:
+                        response.read()
+                        reusable = not response.will_close
+                        url = urljoin(url, location)
+                        continue
+                    yield response
+                    reusable = not response.will_close and response.isclosed()
+                    return
+                finally:
+                    self.__release(parts.scheme, parts.netloc, connection, reusable)
+        raise OSError(f"Error: too many redirects for {url}")
+
+    def request(self, url: str, headers: dict[str, str] | None = None,
+                require_partial: bool = False) -> tuple[int, dict[str, str], bytes]:
+        """
+        Send a GET request, redirects are followed.
+        :param require_partial: for Range requests, raise RangeNotSupported without reading the body
+            if the server answers with the complete file (status 200)
+        :return: status, response headers (lower case names) and body
+        """
+        with self.__open(url, headers or {}) as response:
+            if require_partial and response.status == 200:
+                raise RangeNotSupported(f"Error: {url} does not support range requests")
+            response_headers = {name.lower(): value for name, value in response.getheaders()}
+            return response.status, response_headers, response.read()
+
+    def fetch(self, url: str, save_path: str, checksum: str = "", size: int = 0) -> None:
+        """
+        Download url to save_path, the body is streamed to a temporary file and
+        checksum and size are verified before the file is renamed to save_path.
+        :raises OSError: if the server does not answer with a success status
+        :raises ChecksumError: if checksum or size do not match
+        """
+        with self.__open(url, {}) as response:
+            status = response.status
+            if status < 300:
+                save_stream_verified(response, save_path, checksum, size)
+            else:
+                response.read()
+        if status >= 300:
+            raise OSError(f"Error: could not download {url}, HTTP status {status}")
+
+    def close(self):
+        """Close all idle connections."""
+        with self.__lock:
+            for idle in self.__idle.values():
+                for connection in idle:
+                    connection.close()
+            self.__idle.clear()
+
+class AsyncFetcher:
+    """
+    Download several files concurrently, at most concurrency downloads are in flight.
+    The fetcher owns its transport, close() closes it.
+    """
+    def __init__(self, transport: Transport | None = None, concurrency: int = 4):
+        self.transport: Transport = transport if transport is not None else HttpTransport(max_connections=concurrency)
+        self.concurrency = concurrency
+        self.__semaphore: asyncio.Semaphore | None = None
+        # save paths of downloads skipped because the file on disk matched the checksum
+        self.skipped: list[str] = []
+
+    def close(self):
+        """Close the idle connections of the transport."""
+        self.transport.close()
+
+    async def fetch(self, url: str, save_path: str, checksum: str = "", size: int = 0) -> str:
+        """
+        Download a single file, the download is skipped if save_path already matches the checksum.
+        :return: save_path
+        """
+        if self.__semaphore is None:
+            self.__semaphore = asyncio.Semaphore(self.concurrency)
+        async with self.__semaphore:
+            if await asyncio.to_thread(file_matches_checksum, save_path, checksum, size):
+                self.skipped.append(save_path)
+            else:
+                await asyncio.to_thread(self.transport.fetch, url, save_path, checksum, size)
+        return save_path
+
+    async def fetch_all(self, downloads: list[tuple[str, str]]) -> list[str]:
+        """
+        Download all (url, save_path) pairs concurrently.
+        :return: save paths in the order of the downloads
+        """
+        return list(await asyncio.gather(*(self.fetch(url, path) for url, path in downloads)))
+
+    async def fetch_to_directory(self, urls: list[str], directory_path: str) -> list[str]:
+        """
+        Download all urls into a directory, the file name is taken from the url.
+        :return: save paths in the order of the urls
+        """
+        return await self.fetch_all([(url, os.path.join(directory_path, url.rsplit('/', 1)[-1]))
+                                     for url in urls])
+
+    async def fetch_platforms(self, platforms: list[PlatformEntry], directory_path: str) -> list[str]:
+        """
+        Download the archives of platform entries, verified with checksum and size of the index.
+        :return: archive paths in the order of the platforms
+        """
+        return list(await asyncio.gather(*(
+            self.fetch(platform.url, os.path.join(directory_path, platform.url.rsplit('/', 1)[-1]),
+                       platform.checksum, platform.size)
+            for platform in platforms)))
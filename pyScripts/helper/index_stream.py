@@ -0,0 +1,205 @@
+"""
+This module provides a streaming parser for Arduino package index files.
+Only the platform entries are decoded, tool and system lists are skipped while reading.
+Platforms are yielded as soon as the name of their package is known, platforms in front of
+the package name are held back until the name is read.
+Part of repository: www.github.com/hredan/esp-board-overview
+Author: hredan
+Copyright (c) 2025 hredan
+"""
+import json
+import re
+from collections.abc import Iterator
+from typing import Any, NamedTuple, TextIO
+
+CHUNK_SIZE = 64 * 1024
+# next structural character or the start of a string
+_STRUCTURE_PATTERN = re.compile(r'["{}\[\]:,]')
+_STRING_PATTERN = re.compile(r'"(?:[^"\\]|\\.)*"')
+
+class PlatformEntry(NamedTuple):
+    """Class to hold the fields of a platform entry of a package index."""
+    package: str
+    name: str
+    architecture: str
+    version: str
+    url: str
+    archive_file_name: str
+    checksum: str
+    size: int
+
+    @classmethod
+    def from_json(cls, package: str, platform: dict[str, Any]) -> "PlatformEntry":
+        """
+        Create the entry of a decoded platform object.
+        :param package: name of the package of the platform
+        """
+        return cls(package, str(platform.get("name", "")), str(platform.get("architecture", "")),
+                   str(platform.get("version", "")), str(platform.get("url", "")),
+                   str(platform.get("archiveFileName", "")), str(platform.get("checksum", "")),
+                   int(platform.get("size", 0) or 0))
+
+class _JsonReader:
+    """ Chunked reader with a token scanner and a decoder for complete values """
+    def __init__(self, file: TextIO, chunk_size: int):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def __read_more(self) -> bool:
+        if self.eof:
+            return False
+        chunk = self.file.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        # drop the consumed part of the buffer
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def next_token(self) -> tuple[str, str]:
+        """
+        Get the next token, scalars (numbers, true, false, null) are returned as kind "scalar".
+        :return: tuple of kind ('{', '}', '[', ']', ':', ',', 'string', 'scalar', '') and text
+        """
+        while True:
+            match = _STRUCTURE_PATTERN.search(self.buffer, self.pos)
+            if match is None:
+                if not self.__read_more():
+                    return "", ""
+                continue
+            scalar = self.buffer[self.pos:match.start()].strip()
+            if scalar:
+                self.pos = match.start()
+                return "scalar", scalar
+            if match.group() != '"':
+                self.pos = match.end()
+                return match.group(), match.group()
+            string_match = _STRING_PATTERN.match(self.buffer, match.start())
+            if string_match is None:
+                self.pos = match.start()
+                if not self.__read_more():
+                    return "", ""
+                continue
+            self.pos = string_match.end()
+            return "string", string_match.group()
+
+    def decode_object(self) -> Any:
+        """ Decode the complete JSON object whose '{' token was just read """
+        self.pos -= 1
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if not self.__read_more():
+                    raise
+                continue
+            self.pos = end
+            return value
+
+    def skip_object(self):
+        """ Scan past the JSON object whose '{' token was just read without decoding it """
+        depth = 1
+        while depth:
+            kind, _ = self.next_token()
+            if kind == "":
+                raise json.JSONDecodeError("Unterminated object", self.buffer, self.pos)
+            if kind in ("{", "["):
+                depth += 1
+            elif kind in ("}", "]"):
+                depth -= 1
+
+class _Frame:
+    """ Open JSON container while streaming """
+    def __init__(self, kind: str):
+        self.kind = kind
+        self.key: str | None = None
+        self.index = 0
+        self.expect_key = kind == "{"
+
+    def set_key(self, text: str):
+        """ Set the key of the next value of an object """
+        self.key = json.loads(text)
+        self.expect_key = False
+
+    def next_item(self):
+        """ Handle the ',' in front of the next item of the container """
+        if self.kind == "[":
+            self.index += 1
+        else:
+            self.expect_key = True
+
+class _PackagePlatforms:
+    """ Platforms of the current package, held back while the name of the package is unknown """
+    def __init__(self):
+        self.name: str | None = None
+        self.pending: list[dict[str, Any]] = []
+
+    def add(self, platform: dict[str, Any]) -> list[PlatformEntry]:
+        """ :return: entry of the platform, empty if the package name is not read yet """
+        if self.name is None:
+            self.pending.append(platform)
+            return []
+        return [PlatformEntry.from_json(self.name, platform)]
+
+    def set_name(self, name: str) -> list[PlatformEntry]:
+        """ :return: entries of the platforms held back """
+        self.name = name
+        entries = [PlatformEntry.from_json(name, platform) for platform in self.pending]
+        self.pending = []
+        return entries
+
+    def close(self) -> list[PlatformEntry]:
+        """
+        End of the package, the next package starts without name.
+        :return: entries of the platforms held back, a package without name has the name ""
+        """
+        entries = self.set_name(self.name or "")
+        self.name = None
+        return entries
+
+def _in_packages(stack: list[_Frame], depth: int) -> bool:
+    """ Check the stack is depth containers deep inside the packages list, packages[i] has depth 3 """
+    return len(stack) == depth and stack[0].key == "packages" and stack[1].kind == "["
+
+def iter_platforms(file: TextIO, latest_only: bool = False,
+                   chunk_size: int = CHUNK_SIZE) -> Iterator[PlatformEntry]:
+    """
+    Stream a package index and yield the platform entries of all packages.
+    The file is read lazily, stop iterating to stop reading the file.
+    :param file: opened package index file
+    :param latest_only: only yield the first (latest) platform of each package
+    :return: iterator of PlatformEntry
+    """
+    reader = _JsonReader(file, chunk_size)
+    stack: list[_Frame] = []
+    package = _PackagePlatforms()
+    while True:
+        kind, text = reader.next_token()
+        if kind == "":
+            return
+        if stack and stack[-1].expect_key and kind == "string":
+            stack[-1].set_key(text)
+        elif kind in ("}", "]"):
+            # end of packages[i]
+            if kind == "}" and _in_packages(stack, 3):
+                yield from package.close()
+            stack.pop()
+        elif kind == "," and stack:
+            stack[-1].next_item()
+        elif kind == "[" or (kind == "{" and (not stack or _in_packages(stack, 2))):
+            # lists, the root object and packages[i] are streamed
+            stack.append(_Frame(kind))
+        elif kind == "{" and _in_packages(stack, 4) and stack[2].key == "platforms" \
+                and (not latest_only or stack[3].index == 0):
+            # a platform object is decoded at once, it is small compared to the index
+            yield from package.add(reader.decode_object())
+        elif kind == "{":
+            # any other object is skipped, e.g. packages[i].tools[j] or older platforms
+            reader.skip_object()
+        elif kind == "string" and _in_packages(stack, 3) and stack[2].key == "name":
+            yield from package.set_name(json.loads(text))
@@ -0,0 +1,221 @@
+"""
+This module computes the sizes of the partition schemes of the esp32 core and the reverse
+index from a scheme build name to the boards offering it. Partition csv files with the same
+content after normalization are stored once with an alias map from build names to layout ids.
+Part of repository: www.github.com/hredan/esp-board-overview
+Author: hredan
+Copyright (c) 2025 hredan
+"""
+import hashlib
+import json
+from typing import Any
+
+# alignment of partitions without an offset in the csv file
+APP_ALIGNMENT = 0x10000
+DATA_ALIGNMENT = 0x1000
+# first offset after bootloader and partition table
+FIRST_OFFSET = 0x9000
+SIZE_UNITS = {"K": 1024, "M": 1024 * 1024}
+LAYOUT_FIELDS = ["app", "ota_slots", "ota_data", "nvs", "spiffs", "fat", "coredump", "data", "end"]
+# number of hex digits of the content hash used as layout id
+LAYOUT_ID_LENGTH = 12
+
+def parse_size(text: str) -> int:
+    """
+    Parse an offset or size of a partition csv file.
+    :param text: hex (0x10000), decimal or with unit (1500K, 4M)
+    :return: size in bytes
+    """
+    text = text.strip()
+    if not text:
+        raise ValueError("Error: empty partition size")
+    unit = SIZE_UNITS.get(text[-1].upper(), 1)
+    if unit != 1:
+        text = text[:-1]
+    return int(text, 0) * unit
+
+def read_partition_csv(path: str) -> list[dict[str, str]]:
+    """
+    Read the rows of a partition csv file, comments and incomplete lines are skipped.
+    :param path: path of the csv file
+    :return: list of rows with name, type, subtype, offset and size
+    """
+    rows: list[dict[str, str]] = []
+    with open(path, 'r', encoding='utf-8') as csv_file:
+        for line in csv_file:
+            if line.startswith('#') or not line.strip():
+                continue
+            parts = [part.strip() for part in line.split(',')]
+            if len(parts) < 5:
+                continue
+            rows.append(dict(zip(["name", "type", "subtype", "offset", "size"], parts[:5])))
+    return rows
+
+def canonicalize_rows(rows: list[dict[str, str]]) -> list[dict[str, str]]:
+    """
+    Normalize the rows of a partition csv file, so equal layouts have equal rows:
+    whitespace is stripped, type and subtype are lower case and offsets and sizes are hex, e.g. "20K" -> "0x5000".
+    Missing offsets stay empty, they depend on the previous partition.
+    The canonical rows are only used for the layout id, the stored rows keep the text of the csv file.
+    """
+    canonical_rows: list[dict[str, str]] = []
+    for partition in rows:
+        offset = partition["offset"].strip()
+        canonical_rows.append({
+            "name": partition["name"].strip(),
+            "type": partition["type"].strip().lower(),
+            "subtype": partition["subtype"].strip().lower(),
+            "offset": f"0x{parse_size(offset):X}" if offset else "",
+            "size": f"0x{parse_size(partition['size']):X}",
+        })
+    return canonical_rows
+
+def get_layout_id(canonical_rows: list[dict[str, str]]) -> str:
+    """ Content hash of canonical rows """
+    content = json.dumps(canonical_rows, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha256(content).hexdigest()[:LAYOUT_ID_LENGTH]
+
+def compute_layout(partitions: list[dict[str, str]]) -> dict[str, int]:
+    """
+    Compute the sizes of a partition scheme.
+    app is the largest app partition (the maximum sketch size), ota_slots the number of OTA
+    app partitions, data the sum of all data partitions and end the flash size the scheme needs.
+    :param partitions: rows of the partition csv (name, type, subtype, offset, size)
+    :return: dictionary of LAYOUT_FIELDS and sizes in bytes
+    """
+    layout = dict.fromkeys(LAYOUT_FIELDS, 0)
+    offset = FIRST_OFFSET
+    for partition in partitions:
+        size = parse_size(partition["size"])
+        is_app = partition["type"].strip().lower() == "app"
+        if partition["offset"].strip():
+            offset = parse_size(partition["offset"])
+        else:
+            alignment = APP_ALIGNMENT if is_app else DATA_ALIGNMENT
+            offset = (offset + alignment - 1) // alignment * alignment
+        subtype = partition["subtype"].strip().lower()
+        if is_app:
+            layout["app"] = max(layout["app"], size)
+            if subtype.startswith("ota_"):
+                layout["ota_slots"] += 1
+        else:
+            layout["data"] += size
+            key = "ota_data" if subtype == "ota" else subtype
+            if key in layout:
+                layout[key] += size
+        offset += size
+        layout["end"] = max(layout["end"], offset)
+    return layout
+
+def get_scheme_boards(board_partitions: dict[str, dict[str, Any]]) -> dict[str, list[str]]:
+    """
+    Get the reverse index of scheme build names to boards.
+    :param board_partitions: content of esp32_partitions.json
+    :return: dictionary of scheme build name and sorted board ids
+    """
+    scheme_boards: dict[str, set[str]] = {}
+    for board, partition_data in board_partitions.items():
+        builds: set[str] = set()
+        if partition_data.get("default"):
+            builds.add(partition_data["default"])
+        for scheme in partition_data.get("schemes", {}).values():
+            if scheme.get("build"):
+                builds.add(scheme["build"])
+        for build in builds:
+            scheme_boards.setdefault(build, set()).add(board)
+    return {build: sorted(boards) for build, boards in sorted(scheme_boards.items())}
+
+class SchemeStore:
+    """ Distinct partition layouts by id and the layout id of each scheme build name """
+    def __init__(self, layouts: dict[str, list[dict[str, str]]], aliases: dict[str, str]):
+        self.layouts = layouts
+        self.aliases = aliases
+
+    @classmethod
+    def from_schemes(cls, schemes: dict[str, list[dict[str, str]]]) -> "SchemeStore":
+        """
+        Store the loaded partition schemes, schemes with the same canonical rows share one layout.
+        The layout keeps the rows of the first scheme build name in sorted order as written in its csv file.
+        :param schemes: dictionary of scheme build name and rows of its csv file
+        """
+        layouts: dict[str, list[dict[str, str]]] = {}
+        aliases: dict[str, str] = {}
+        for build, rows in sorted(schemes.items()):
+            layout_id = get_layout_id(canonicalize_rows(rows))
+            layouts.setdefault(layout_id, rows)
+            aliases[build] = layout_id
+        return cls(dict(sorted(layouts.items())), aliases)
+
+    @classmethod
+    def from_json(cls, text: str) -> "SchemeStore":
+        """ Load an exported store """
+        data: dict[str, Any] = json.loads(text)
+        return cls(data["layouts"], data["aliases"])
+
+    def to_json(self) -> str:
+        """ Convert to JSON format with the layouts and the alias map """
+        return json.dumps({"layouts": self.layouts, "aliases": self.aliases}, ensure_ascii=False, indent=4)
+
+    def get_rows(self, build: str) -> list[dict[str, str]] | None:
+        """ Get the rows of a scheme build name, None if the scheme is unknown """
+        layout_id = self.aliases.get(build)
+        return self.layouts[layout_id] if layout_id is not None else None
+
+    def get_builds(self, layout_id: str) -> list[str]:
+        """ Get the scheme build names sharing a layout """
+        return [build for build, alias in self.aliases.items() if alias == layout_id]
+
+    def expand(self) -> dict[str, list[dict[str, str]]]:
+        """ Get the rows of each scheme build name """
+        return {build: self.layouts[layout_id] for build, layout_id in self.aliases.items()}
+
+class SchemeLayouts:
+    """ Computed layouts of the partition schemes and the boards offering them """
+    def __init__(self, layouts: dict[str, dict[str, int]], boards: dict[str, list[str]]):
+        self.layouts = layouts
+        self.boards = boards
+
+    @classmethod
+    def from_schemes(cls, schemes: dict[str, list[dict[str, str]]],
+                     board_partitions: dict[str, dict[str, Any]]) -> "SchemeLayouts":
+        """
+        Create the layouts from the loaded partition schemes, schemes without rows are skipped.
+        :param schemes: rows of each scheme build name, e.g. SchemeStore.expand()
+        :param board_partitions: content of esp32_partitions.json
+        """
+        layouts = {build: compute_layout(rows) for build, rows in sorted(schemes.items()) if rows}
+        return cls(layouts, get_scheme_boards(board_partitions))
+
+    @classmethod
+    def from_json(cls, text: str) -> "SchemeLayouts":
+        """ Load exported layouts """
+        data: dict[str, Any] = json.loads(text)
+        layouts = {build: dict(zip(data["fields"], values)) for build, values in data["layouts"].items()}
+        board_ids: list[str] = data["boards"]
+        scheme_boards: dict[str, list[int]] = data["scheme_boards"]
+        boards = {build: [board_ids[position] for position in positions]
+                  for build, positions in scheme_boards.items()}
+        return cls(layouts, boards)
+
+    def to_json(self) -> str:
+        """
+        Convert to compact JSON format, the sizes of a layout are in the order of fields
+        and the boards of a scheme are sorted positions in the list of board ids.
+        """
+        layouts = {build: [layout[field] for field in LAYOUT_FIELDS] for build, layout in self.layouts.items()}
+        board_ids = sorted({board for boards in self.boards.values() for board in boards})
+        positions = {board: position for position, board in enumerate(board_ids)}
+        scheme_boards = {build: [positions[board] for board in boards] for build, boards in self.boards.items()}
+        return json.dumps({"fields": LAYOUT_FIELDS, "layouts": layouts, "boards": board_ids,
+                           "scheme_boards": scheme_boards}, separators=(",", ":"))
+
+    def find_schemes(self, field: str, min_size: int) -> list[str]:
+        """ Get the scheme build names with a field of at least min_size, e.g. ("app", 3 MB) """
+        return [build for build, layout in self.layouts.items() if layout[field] >= min_size]
+
+    def find_boards(self, field: str, min_size: int) -> list[str]:
+        """ Get the boards offering a scheme with a field of at least min_size """
+        boards: set[str] = set()
+        for build in self.find_schemes(field, min_size):
+            boards.update(self.boards.get(build, []))
+        return sorted(boards)
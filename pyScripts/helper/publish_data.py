@@ -0,0 +1,227 @@
+"""
+This module compares the generated json files with the published files of the web-app.
+Each board or partition record is hashed, the changelog lists the added, removed and changed
+records, and only files whose content changed are written.
+Part of repository: www.github.com/hredan/esp-board-overview
+Author: hredan
+Copyright (c) 2025 hredan
+"""
+import hashlib
+import json
+import os
+import re
+from typing import Any, cast
+
+from helper.partition_layout import SchemeStore
+
+PUBLISHED_FILES = [
+    "core_list.json",
+    "esp8266.json",
+    "esp8266_search.json",
+    "esp32.json",
+    "esp32_search.json",
+    "esp32_partitions.json",
+    "esp32_partition_schemes.json",
+    "esp32_scheme_layouts.json",
+]
+# directories of json files loaded on demand, e.g. the pin table of a variant
+PUBLISHED_DIRECTORIES = [
+    "esp8266_pins",
+    "esp32_pins",
+]
+# keys identifying the records of json lists, e.g. boards or cores
+RECORD_KEYS = ["board", "core_name"]
+MANIFEST_FILE = "manifest.json"
+# number of hex digits of the content hash in hashed file names
+HASH_LENGTH = 12
+
+def record_digest(record: Any) -> str:
+    """ sha256 of a record, independent of the key order """
+    text = json.dumps(record, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def index_records(data: Any) -> dict[str, Any]:
+    """
+    Get the records of a json file by their key.
+    Objects are keyed by their keys, lists by the board or core name of their items.
+    Partition schemes stored as layouts and aliases are keyed by the scheme build names
+    with their rows, so a changed layout is reported for every scheme using it.
+    :param data: loaded json data
+    :return: dictionary of record key and record
+    """
+    if isinstance(data, dict) and set(cast(dict[str, Any], data)) == {"layouts", "aliases"}:
+        store = cast(dict[str, Any], data)
+        return dict(SchemeStore(store["layouts"], store["aliases"]).expand())
+    if isinstance(data, dict):
+        return {str(key): value for key, value in cast(dict[Any, Any], data).items()}
+    records: dict[str, Any] = {}
+    if isinstance(data, list):
+        for index, item in enumerate(cast(list[Any], data)):
+            key = str(index)
+            if isinstance(item, dict):
+                fields = cast(dict[str, Any], item)
+                key = next((str(fields[name]) for name in RECORD_KEYS if name in fields), key)
+            records[key] = item
+    return records
+
+def changed_fields(old: Any, new: Any) -> list[str]:
+    """ Get the top level fields which differ between two records """
+    if not isinstance(old, dict) or not isinstance(new, dict):
+        return []
+    old_fields = cast(dict[str, Any], old)
+    new_fields = cast(dict[str, Any], new)
+    fields = set(old_fields) | set(new_fields)
+    return sorted(field for field in fields if old_fields.get(field) != new_fields.get(field))
+
+def diff_records(old_data: Any, new_data: Any) -> dict[str, Any]:
+    """
+    Compare the records of the published and the generated data.
+    :return: changelog entry with added, removed and changed records,
+             changed maps the record key to the changed fields
+    """
+    old_records = index_records(old_data)
+    new_records = index_records(new_data)
+    old_digests = {key: record_digest(record) for key, record in old_records.items()}
+    changed: dict[str, list[str]] = {}
+    for key, record in new_records.items():
+        if key in old_digests and old_digests[key] != record_digest(record):
+            changed[key] = changed_fields(old_records[key], record)
+    return {
+        "added": sorted(key for key in new_records if key not in old_records),
+        "removed": sorted(key for key in old_records if key not in new_records),
+        "changed": changed,
+    }
+
+def publish_file(source_path: str, target_path: str) -> dict[str, Any]:
+    """
+    Publish a generated json file, the target is only written if its content changed.
+    :param source_path: generated json file
+    :param target_path: published json file
+    :return: changelog entry of the file, "written" is True if the target was written
+    """
+    with open(source_path, "rb") as source_file:
+        content = source_file.read()
+    old_content = b""
+    old_data: Any = None
+    if os.path.exists(target_path):
+        with open(target_path, "rb") as target_file:
+            old_content = target_file.read()
+        try:
+            old_data = json.loads(old_content)
+        except ValueError:
+            old_data = None
+    entry = diff_records(old_data, json.loads(content))
+    entry["written"] = content != old_content
+    if entry["written"]:
+        write_file(target_path, content)
+    return entry
+
+def write_file(path: str, content: bytes):
+    """ Replace a file atomically, readers never see a partly written file """
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as target_file:
+        target_file.write(content)
+    os.replace(temp_path, path)
+
+def hashed_file_name(file_name: str, content: bytes) -> str:
+    """ File name with the content hash, e.g. esp32.0123456789ab.json """
+    base, extension = os.path.splitext(file_name)
+    return f"{base}.{hashlib.sha256(content).hexdigest()[:HASH_LENGTH]}{extension}"
+
+def remove_stale_hashed_files(target_dir: str, file_names: list[str], keep: set[str]) -> list[str]:
+    """
+    Remove the hashed files of logical files which are not kept.
+    :param file_names: logical files whose hashed files are checked
+    :param keep: hashed file names which are kept
+    :return: sorted names of the removed files
+    """
+    patterns = [re.compile(rf"{re.escape(base)}\.[0-9a-f]{{{HASH_LENGTH}}}{re.escape(extension)}")
+                for base, extension in (os.path.splitext(file_name) for file_name in file_names)]
+    removed = sorted(name for name in os.listdir(target_dir)
+                     if name not in keep and any(pattern.fullmatch(name) for pattern in patterns))
+    for name in removed:
+        os.remove(os.path.join(target_dir, name))
+    return removed
+
+def publish_hashed_files(target_dir: str, file_names: list[str] | None = None) -> dict[str, str]:
+    """
+    Write content hashed copies of the published files and the manifest.json mapping the
+    logical names to the hashed names. The hashed files never change and can be cached forever,
+    clients only fetch the manifest to detect updates. A new manifest keeps the hashed files of
+    the previous manifest, clients which loaded it can still fetch them until the next publish
+    removes them.
+    :param target_dir: directory of the published files, e.g. web-app/data
+    :param file_names: logical files, default PUBLISHED_FILES
+    :return: manifest
+    """
+    if file_names is None:
+        file_names = PUBLISHED_FILES
+    manifest_path = os.path.join(target_dir, MANIFEST_FILE)
+    old_content = b""
+    old_manifest: dict[str, str] = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path, "rb") as manifest_file:
+            old_content = manifest_file.read()
+        old_manifest = json.loads(old_content)
+    manifest: dict[str, str] = {}
+    for file_name in file_names:
+        with open(os.path.join(target_dir, file_name), "rb") as source_file:
+            content = source_file.read()
+        manifest[file_name] = hashed_file_name(file_name, content)
+        hashed_path = os.path.join(target_dir, manifest[file_name])
+        if not os.path.exists(hashed_path):
+            write_file(hashed_path, content)
+    manifest_content = json.dumps(manifest, indent=4).encode("utf-8")
+    if manifest_content != old_content:
+        write_file(manifest_path, manifest_content)
+        remove_stale_hashed_files(target_dir, sorted(set(file_names) | set(old_manifest)),
+                                  set(manifest.values()) | set(old_manifest.values()))
+    return manifest
+
+def publish_directory(source_dir: str, target_dir: str) -> dict[str, list[str]]:
+    """
+    Publish the json files of a directory, only changed files are written and
+    published files which are no longer generated are removed.
+    :param source_dir: directory of the generated files, e.g. esp_data/esp32_pins
+    :param target_dir: directory of the published files, e.g. web-app/data/esp32_pins
+    :return: names of the written and the removed files
+    """
+    if not os.path.isdir(source_dir):
+        raise ValueError(f"Error: could not found {source_dir}")
+    os.makedirs(target_dir, exist_ok=True)
+    file_names = sorted(name for name in os.listdir(source_dir) if name.endswith(".json"))
+    written: list[str] = []
+    for file_name in file_names:
+        with open(os.path.join(source_dir, file_name), "rb") as source_file:
+            content = source_file.read()
+        target_path = os.path.join(target_dir, file_name)
+        old_content = b""
+        if os.path.exists(target_path):
+            with open(target_path, "rb") as target_file:
+                old_content = target_file.read()
+        if content != old_content:
+            write_file(target_path, content)
+            written.append(file_name)
+    removed = sorted(name for name in set(os.listdir(target_dir)) - set(file_names) if name.endswith(".json"))
+    for file_name in removed:
+        os.remove(os.path.join(target_dir, file_name))
+    return {"written": written, "removed": removed}
+
+def publish_data(source_dir: str, target_dir: str,
+                 file_names: list[str] | None = None) -> dict[str, dict[str, Any]]:
+    """
+    Publish the generated json files to the web-app data directory.
+    :param source_dir: directory of the generated files, e.g. esp_data
+    :param target_dir: directory of the published files, e.g. web-app/data
+    :param file_names: files to publish, default PUBLISHED_FILES
+    :return: changelog with an entry for each file
+    """
+    if file_names is None:
+        file_names = PUBLISHED_FILES
+    changelog: dict[str, dict[str, Any]] = {}
+    for file_name in file_names:
+        source_path = os.path.join(source_dir, file_name)
+        if not os.path.exists(source_path):
+            raise ValueError(f"Error: could not found {source_path}")
+        changelog[file_name] = publish_file(source_path, os.path.join(target_dir, file_name))
+    return changelog
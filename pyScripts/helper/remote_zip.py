@@ -0,0 +1,142 @@
+"""
+This module reads members of a remote zip archive with HTTP Range requests.
+The end of central directory and the central directory are read from the end of the archive,
+afterwards only the byte ranges of the wanted members are fetched.
+If the server does not support range requests, the archive is downloaded completely.
+Part of repository: www.github.com/hredan/esp-board-overview
+Author: hredan
+Copyright (c) 2025 hredan
+"""
+import io
+import os
+import re
+import zipfile
+from collections.abc import Callable
+from typing import NamedTuple
+
+from helper.index_fetcher import HttpTransport, RangeNotSupported
+from helper.verified_download import file_matches_checksum
+
+# end of central directory record with the maximum zip comment
+TAIL_SIZE = 22 + 0xFFFF
+BLOCK_SIZE = 64 * 1024
+_CONTENT_RANGE_PATTERN = re.compile(r"bytes (\d+)-(\d+)/(\d+)")
+
+class RangeOptions(NamedTuple):
+    """Options of the range requests of a RemoteFile."""
+    # size of the first request at the end of the file, e.g. the end of central directory of a zip archive
+    tail_size: int = TAIL_SIZE
+    # minimum size of the following requests, small reads are merged into one request
+    block_size: int = BLOCK_SIZE
+
+class ArchiveSource(NamedTuple):
+    """Remote zip archive with the checksum and size of the package index."""
+    url: str
+    checksum: str = ""
+    size: int = 0
+
+class RemoteFile(io.RawIOBase):
+    """
+    Seekable read-only file of a remote url, reads are served by HTTP Range requests.
+    Fetched ranges are kept as segments, reads are extended to the block size to merge small reads,
+    e.g. the local header and the data of a zip member.
+    """
+    def __init__(self, transport: HttpTransport, url: str, options: RangeOptions = RangeOptions()):
+        super().__init__()
+        self.transport = transport
+        self.url = url
+        self.options = options
+        self.num_of_requests = 0
+        self.__pos = 0
+        self.__segments: list[tuple[int, bytes]] = []
+        # the first request gets the size and the end of the archive
+        start, data, self.size = self.__fetch(f"bytes=-{options.tail_size}")
+        self.__segments.append((start, data))
+
+    @property
+    def bytes_fetched(self) -> int:
+        """ Number of bytes fetched by the range requests """
+        return sum(len(segment) for _, segment in self.__segments)
+
+    def __fetch(self, byte_range: str) -> tuple[int, bytes, int]:
+        """ fetch a range, :return: start, data and size of the file """
+        status, headers, body = self.transport.request(self.url, {"Range": byte_range}, require_partial=True)
+        self.num_of_requests += 1
+        match_range = _CONTENT_RANGE_PATTERN.fullmatch(headers.get("content-range", ""))
+        if status != 206 or match_range is None:
+            raise OSError(f"Error: unexpected response {status} for range {byte_range} of {self.url}")
+        return int(match_range.group(1)), body, int(match_range.group(3))
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self.__pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self.__pos
+        elif whence == io.SEEK_END:
+            offset += self.size
+        if offset < 0:
+            raise OSError(f"Error: negative seek position {offset}")
+        self.__pos = offset
+        return self.__pos
+
+    def read(self, size: int = -1) -> bytes:
+        length = self.size - self.__pos if size < 0 else min(size, self.size - self.__pos)
+        if length <= 0:
+            return b""
+        end = self.__pos + length
+        data = next((segment[self.__pos - start:end - start] for start, segment in self.__segments
+                     if start <= self.__pos and end <= start + len(segment)), None)
+        if data is None:
+            fetch_end = min(max(end, self.__pos + self.options.block_size), self.size) - 1
+            start, segment, _ = self.__fetch(f"bytes={self.__pos}-{fetch_end}")
+            self.__segments.append((start, segment))
+            data = segment[self.__pos - start:end - start]
+        self.__pos += len(data)
+        return data
+
+def extract_members(archive: zipfile.ZipFile, member_filter: Callable[[str], bool],
+                    extract_to: str) -> list[str]:
+    """
+    Extract the members accepted by member_filter, the CRC of each member is checked while reading.
+    :return: names of the extracted members
+    """
+    names = [info.filename for info in archive.infolist()
+             if not info.is_dir() and member_filter(info.filename)]
+    for name in names:
+        archive.extract(name, extract_to)
+    return names
+
+def extract_remote_members(source: ArchiveSource, member_filter: Callable[[str], bool], extract_to: str,
+                           transport: HttpTransport | None = None) -> list[str]:
+    """
+    Extract members of a remote zip archive, only the ranges of the wanted members are fetched.
+    If the server does not support range requests, the archive is downloaded to extract_to
+    and the members are extracted from the local archive.
+    :param source: url of the zip archive, its checksum and size are only verified for the complete download
+    :param member_filter: function returning True for the names of the wanted members
+    :param extract_to: directory where the members are extracted
+    :param transport: HTTP transport, a new one is used if None
+    :return: names of the extracted members
+    """
+    own_transport = transport is None
+    http_transport = transport if transport is not None else HttpTransport(max_connections=1)
+    try:
+        try:
+            with RemoteFile(http_transport, source.url) as remote_file, zipfile.ZipFile(remote_file) as archive:
+                return extract_members(archive, member_filter, extract_to)
+        except RangeNotSupported:
+            archive_path = os.path.join(extract_to, source.url.rsplit('/', 1)[-1])
+            if not file_matches_checksum(archive_path, source.checksum, source.size):
+                http_transport.fetch(source.url, archive_path, source.checksum, source.size)
+            with zipfile.ZipFile(archive_path) as archive:
+                return extract_members(archive, member_filter, extract_to)
+    finally:
+        if own_transport:
+            http_transport.close()
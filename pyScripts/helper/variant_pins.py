@@ -0,0 +1,75 @@
+"""
+This module extracts the pin table of each variant from its pins_arduino.h file:
+built-in LEDs, I2C, UART and SPI pins. Each header is read once through the HeaderCache shared with
+the LED resolution, the tables are cached per variant and exported as one json file
+per variant, e.g. esp32_pins/d1_mini32.json, which the web-app loads by BoardData.variant.
+Part of repository: www.github.com/hredan/esp-board-overview
+Author: hredan
+Copyright (c) 2025 hredan
+"""
+import json
+import os
+from collections.abc import Iterable
+
+from helper.board_data import BoardData
+from helper.header_evaluator import HeaderCache
+
+# well-known pin symbols of pins_arduino.h in the order of the exported tables
+PIN_SYMBOLS = ["LED_BUILTIN", "RGB_BUILTIN", "SDA", "SCL", "TX", "RX", "SS", "MOSI", "MISO", "SCK"]
+
+class VariantPins:
+    """ Pin tables of the variants of a core, each variant is resolved once """
+    def __init__(self, core_path: str, header_cache: HeaderCache, symbols: list[str] | None = None):
+        self.core_path = core_path
+        self.header_cache = header_cache
+        self.symbols = symbols if symbols is not None else PIN_SYMBOLS
+        self.tables: dict[str, dict[str, int] | None] = {}
+
+    def get_table(self, variant: str) -> dict[str, int] | None:
+        """
+        Get the pin table of a variant, symbols which are not defined are left out.
+        :return: dictionary of symbol and gpio or None if the variant has no pins_arduino.h
+        """
+        if variant not in self.tables:
+            header = self.header_cache.get(f"{self.core_path}/variants/{variant}/pins_arduino.h")
+            table: dict[str, int] | None = None
+            if header is not None:
+                table = {name: gpio for name, gpio in header.scan_symbols(self.symbols).items()
+                         if gpio is not None}
+            self.tables[variant] = table
+        return self.tables[variant]
+
+    def get_tables(self, boards: Iterable[BoardData]) -> dict[str, dict[str, int]]:
+        """
+        Get the pin tables of the variants of boards, variants without a pins_arduino.h are left out.
+        :return: dictionary of variant and pin table, sorted by variant
+        """
+        tables: dict[str, dict[str, int]] = {}
+        for variant in sorted({board.variant for board in boards if board.variant != "N/A"}):
+            table = self.get_table(variant)
+            if table is not None:
+                tables[variant] = table
+        return tables
+
+    def clear(self):
+        """ Forget the tables, e.g. after headers changed """
+        self.tables.clear()
+
+    def export_json(self, directory: str, boards: Iterable[BoardData]) -> list[str]:
+        """
+        Write a json file of the pin table of each variant, files of variants which are gone are removed.
+        :param directory: output directory, created if needed, e.g. esp_data/esp32_pins
+        :return: names of the written files
+        """
+        os.makedirs(directory, exist_ok=True)
+        file_names: list[str] = []
+        for variant, table in self.get_tables(boards).items():
+            if os.path.basename(variant) != variant or variant.startswith("."):
+                raise ValueError(f"Error: invalid variant name {variant}")
+            file_names.append(variant + ".json")
+            with open(os.path.join(directory, variant + ".json"), "w", encoding="utf8") as file:
+                file.write(json.dumps(table, indent=4))
+        for file_name in set(os.listdir(directory)) - set(file_names):
+            if file_name.endswith(".json"):
+                os.remove(os.path.join(directory, file_name))
+        return file_names
@@ -0,0 +1,95 @@
+"""
+This module provides checksum verified saving of downloads.
+The package index publishes a checksum ("SHA-256:<hex>") and the size of every archive.
+Part of repository: www.github.com/hredan/esp-board-overview
+Author: hredan
+Copyright (c) 2025 hredan
+"""
+import hashlib
+import os
+import tempfile
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import BinaryIO
+
+CHUNK_SIZE = 1024 * 1024
+
+class ChecksumError(OSError):
+    """Raised if a download does not match the checksum or size of the package index."""
+
+def parse_checksum(checksum: str) -> tuple[str, str]:
+    """
+    Split a package index checksum into hashlib algorithm name and hex digest.
+    :param checksum: e.g. "SHA-256:0123abcd"
+    :return: tuple of algorithm (e.g. "sha256") and lower case hex digest
+    """
+    algorithm, _, digest = checksum.partition(":")
+    if not digest:
+        raise ValueError(f"Error: invalid checksum {checksum}")
+    return algorithm.replace("-", "").lower(), digest.lower()
+
+def get_file_digest(file_path: str, algorithm: str = "sha256") -> str:
+    """
+    Hash a file in chunks.
+    :param algorithm: hashlib algorithm name, e.g. "sha256"
+    :return: lower case hex digest
+    """
+    file_hash = hashlib.new(algorithm)
+    with open(file_path, 'rb') as file:
+        while chunk := file.read(CHUNK_SIZE):
+            file_hash.update(chunk)
+    return file_hash.hexdigest()
+
+def file_matches_checksum(file_path: str, checksum: str, size: int = 0) -> bool:
+    """
+    Check if a file on disk matches the checksum and size of the package index.
+    :param size: expected size in bytes, 0 if unknown
+    :return: True if the file exists and matches
+    """
+    if not checksum or not os.path.isfile(file_path):
+        return False
+    if size and os.path.getsize(file_path) != size:
+        return False
+    algorithm, digest = parse_checksum(checksum)
+    return get_file_digest(file_path, algorithm) == digest
+
+@contextmanager
+def temporary_download(save_path: str) -> Iterator[str]:
+    """
+    Create an empty temporary file next to save_path for a download, it is renamed to save_path
+    if the context ends without error, else it is removed. Nothing is written to save_path on error.
+    :return: path of the temporary file
+    """
+    directory, file_name = os.path.split(os.path.abspath(save_path))
+    file_descriptor, temp_path = tempfile.mkstemp(prefix=file_name + ".", suffix=".part", dir=directory)
+    os.close(file_descriptor)
+    try:
+        yield temp_path
+        os.replace(temp_path, save_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+
+def save_stream_verified(stream: BinaryIO, save_path: str, checksum: str = "", size: int = 0):
+    """
+    Stream data to a temporary file next to save_path while hashing it, verify checksum and size
+    and atomically rename the temporary file to save_path. Nothing is written to save_path on error.
+    :param stream: readable binary stream, e.g. an HTTP response
+    :param checksum: expected checksum, e.g. "SHA-256:0123abcd", empty to skip the verification
+    :param size: expected size in bytes, 0 if unknown
+    :raises ChecksumError: if checksum or size do not match
+    """
+    file_hash = hashlib.new(parse_checksum(checksum)[0]) if checksum else None
+    with temporary_download(save_path) as temp_path:
+        received = 0
+        with open(temp_path, 'wb') as file:
+            while chunk := stream.read(CHUNK_SIZE):
+                file.write(chunk)
+                received += len(chunk)
+                if file_hash is not None:
+                    file_hash.update(chunk)
+        if size and received != size:
+            raise ChecksumError(f"Error: size of {save_path} is {received} bytes, expected {size}")
+        if file_hash is not None and file_hash.hexdigest() != parse_checksum(checksum)[1]:
+            raise ChecksumError(f"Error: checksum of {save_path} does not match {checksum}")
@@ -0,0 +1,43 @@
+"""
+publish_data.py
+This script publishes the generated json files of esp_data to web-app/data.
+Only files with changed content are written and a changelog of the boards is created.
+
+Part of repository: www.github.com/hredan/esp-board-overview
+Author: hredan
+Copyright (c) 2025 hredan
+"""
+import os.path
+import json
+import argparse
+
+from helper.publish_data import PUBLISHED_DIRECTORIES, publish_data, publish_directory, publish_hashed_files
+
+if __name__ == "__main__":
+    root_path = os.path.join(os.path.dirname(__file__), "..")
+    parser = argparse.ArgumentParser(description="Publish the generated json files to the web-app.")
+    parser.add_argument("--source", default=os.path.join(root_path, "esp_data"),
+                        help="directory of the generated json files")
+    parser.add_argument("--target", default=os.path.join(root_path, "web-app", "data"),
+                        help="directory of the published json files")
+    parser.add_argument("--changelog", default=os.path.join(root_path, "esp_data", "changelog.json"),
+                        help="path of the changelog json file")
+    parser.add_argument("--hashed", action="store_true",
+                        help="also write content hashed file names and a manifest.json")
+    args = parser.parse_args()
+
+    changelog = publish_data(args.source, args.target)
+    with open(args.changelog, 'w', encoding='utf-8') as f:
+        json.dump(changelog, f, ensure_ascii=False, indent=4)
+    for file_name, entry in changelog.items():
+        state = "written" if entry["written"] else "unchanged"
+        print(f"{file_name}: {state}, added: {len(entry['added'])}, removed: {len(entry['removed'])}, "
+              f"changed: {len(entry['changed'])}")
+    for directory_name in PUBLISHED_DIRECTORIES:
+        directory_entry = publish_directory(os.path.join(args.source, directory_name),
+                                            os.path.join(args.target, directory_name))
+        print(f"{directory_name}: written: {len(directory_entry['written'])}, "
+              f"removed: {len(directory_entry['removed'])}")
+    if args.hashed:
+        manifest = publish_hashed_files(args.target)
+        print(f"manifest: {len(manifest)} hashed files")
@@ -0,0 +1,115 @@
+"""Fixture with a local HTTP stand-in for package index and archive downloads."""
+import re
+import threading
+import time
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+
+class StandInServer:  # pylint: disable=too-many-instance-attributes
+    """Local HTTP server serving in memory files, the attributes configure and record the requests."""
+    def __init__(self):
+        self.files: dict[str, bytes] = {}
+        self.redirects: dict[str, str] = {}
+        self.latency = 0.0
+        self.accept_ranges = True
+        # number of failures (503 Service Unavailable) of the requests with a Range header
+        self.failures: dict[str, int] = {}
+        self.requests: list[str] = []
+        # Range headers of the requests, "" for requests without range
+        self.ranges: list[str] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), self.__create_handler())
+
+    @property
+    def url(self) -> str:
+        """Base url of the server."""
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def start(self):
+        """Serve the requests in a background thread."""
+        threading.Thread(target=self.httpd.serve_forever, args=(0.05,), daemon=True).start()
+
+    def stop(self):
+        """Stop serving and close the socket."""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __create_handler(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            """Request handler of the stand-in server."""
+            protocol_version = "HTTP/1.1"
+            # set by BaseHTTPRequestHandler for each request, True closes the connection after the response
+            close_connection = True
+
+            def do_GET(self):  # pylint: disable=invalid-name
+                """Serve a file or a redirect."""
+                with server.lock:
+                    server.requests.append(self.path)
+                    server.ranges.append(self.headers.get("Range", ""))
+                    server.in_flight += 1
+                    server.max_in_flight = max(server.max_in_flight, server.in_flight)
+                    byte_range = self.headers.get("Range", "")
+                    failure = server.failures.get(byte_range, 0) > 0
+                    if failure:
+                        server.failures[byte_range] -= 1
+                try:
+                    time.sleep(server.latency)
+                    if failure:
+                        self.send_error(503)
+                    elif self.path in server.redirects:
+                        self.send_response(302)
+                        self.send_header("Location", server.redirects[self.path])
+                        self.send_header("Content-Length", "0")
+                        self.end_headers()
+                    elif self.path in server.files:
+                        self.send_file(server.files[self.path])
+                    else:
+                        self.send_error(404)
+                finally:
+                    with server.lock:
+                        server.in_flight -= 1
+
+            def send_file(self, body: bytes):
+                """Send a file or a part of it for a Range request."""
+                match_range = re.fullmatch(r"bytes=(\d*)-(\d*)", self.headers.get("Range", ""))
+                if not server.accept_ranges or match_range is None:
+                    self.send_response(200)
+                    if server.accept_ranges:
+                        self.send_header("Accept-Ranges", "bytes")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    try:
+                        self.wfile.write(body)
+                    except (BrokenPipeError, ConnectionResetError):
+                        # the client closed the connection after the headers
+                        self.close_connection = True
+                    return
+                first, last = match_range.groups()
+                if first:
+                    start, end = int(first), min(int(last) if last else len(body) - 1, len(body) - 1)
+                else:
+                    start, end = max(len(body) - int(last), 0), len(body) - 1
+                self.send_response(206)
+                self.send_header("Accept-Ranges", "bytes")
+                self.send_header("Content-Range", f"bytes {start}-{end}/{len(body)}")
+                self.send_header("Content-Length", str(end - start + 1))
+                self.end_headers()
+                self.wfile.write(body[start:end + 1])
+
+            def log_message(self, format: str, *args: object):  # pylint: disable=redefined-builtin
+                """Keep the test output quiet."""
+
+        return Handler
+
+@pytest.fixture(name="http_server")
+def fixture_http_server() -> Iterator[StandInServer]:
+    """Fixture to start a local HTTP stand-in server."""
+    server = StandInServer()
+    server.start()
+    yield server
+    server.stop()
@@ -0,0 +1,70 @@
+"""Unit tests for board_fields.py"""
+import pytest
+
+from helper.board_data import BoardData
+from helper.board_fields import BOARD_FIELDS, FieldSpec, KeyPathMatcher, get_board_id, split_line
+from helper.core_dialect import get_dialect
+
+class TestBoardFields:
+    """Test cases for the field specs and the key path trie."""
+    def test_split_line(self):
+        """Test key, value and the board id of name keys."""
+        assert split_line("d1_mini.name=LOLIN(WEMOS) D1 R2 & mini\n") == ("d1_mini.name", "LOLIN(WEMOS) D1 R2 & mini")
+        assert split_line("d1.build.extra_flags=-DA=1\n") == ("d1.build.extra_flags", "-DA=1")
+        assert split_line("##############\n") == ("##############\n", "")
+        assert get_board_id("d1_mini.name", "LOLIN") == "d1_mini"
+        assert get_board_id("d1_mini.name", "") == ""
+        assert get_board_id(".name", "x") == ""
+        assert get_board_id("d1_mini.menu.eesz.4M", "4MB") == ""
+
+    def test_match(self):
+        """Test exact segments, wildcards and skipped wildcard values."""
+        matcher = KeyPathMatcher(get_dialect("esp8266").board_fields)
+        assert matcher.match("build.mcu") is not None
+        spec = matcher.match("menu.eesz.4M2M.build.flash_size")
+        assert spec is not None and spec.field == "flash_size"
+        assert matcher.match("menu.eesz.autoflash.build.flash_size") is None
+        assert matcher.match("menu.eesz.4M2M.build") is None
+        assert matcher.match("menu.eesz.4M2M.x.build.flash_size") is None
+        assert matcher.match("build.flash_size") is None
+
+    def test_exact_before_wildcard(self):
+        """Test an exact segment is preferred, the wildcard is used if the exact path has no spec."""
+        matcher = KeyPathMatcher([FieldSpec("menu.*.build.mcu", "mcu"),
+                                  FieldSpec("menu.ChipType.s3", "variant"),
+                                  FieldSpec("menu.ChipType.*.build.mcu", "name")])
+        spec = matcher.match("menu.ChipType.s3")
+        assert spec is not None and spec.field == "variant"
+        spec = matcher.match("menu.ChipType.s3.build.mcu")
+        assert spec is not None and spec.field == "name"
+        spec = matcher.match("menu.Other.build.mcu")
+        assert spec is not None and spec.field == "mcu"
+        with pytest.raises(ValueError):
+            KeyPathMatcher([FieldSpec("build.mcu", "mcu"), FieldSpec("build.mcu", "variant")])
+
+    def test_match_line(self):
+        """Test only keys of the board with a value are matched, values are converted."""
+        matcher = KeyPathMatcher(get_dialect("esp8266").board_fields)
+        match_line = matcher.match_line("d1", "d1.menu.eesz.4M.build.flash_size=4M\n")
+        assert match_line is not None and match_line[1] == "4MB"
+        assert matcher.match_line("d1", "d1_mini.build.mcu=esp8266") is None
+        assert matcher.match_line("d1", "d1.build.mcu=") is None
+        assert matcher.match_line("d1", "d1.build.mcu") is None
+
+    def test_apply(self):
+        """Test setters and multi value lists, fields must be declared by BoardData."""
+        board = BoardData()
+        matcher = KeyPathMatcher(BOARD_FIELDS)
+        for line in ("d1.build.mcu=esp32", "d1.build.flash_size=4MB", "d1.build.flash_size=8MB",
+                     "d1.build.flash_size=4MB"):
+            match_line = matcher.match_line("d1", line)
+            assert match_line is not None
+            match_line[0].apply(board, match_line[1])
+        assert board.mcu == "esp32"
+        assert board.flash_size == ["4MB", "8MB"]
+        with pytest.raises(ValueError):
+            KeyPathMatcher([FieldSpec("upload.speed", "upload_speeds", multi=True)])
+        with pytest.raises(ValueError):
+            KeyPathMatcher([FieldSpec("build.mcu", "mcu", multi=True)])
+        with pytest.raises(ValueError):
+            KeyPathMatcher([FieldSpec("build.board", "to_json")])
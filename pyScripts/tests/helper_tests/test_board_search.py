@@ -0,0 +1,55 @@
+"""Unit tests for board_search.py"""
+from helper.board_data import BoardData
+from helper.board_search import BoardSearchIndex, get_grams, get_words, search_boards
+
+def create_board(name: str, board_id: str, variant: str, mcu: str) -> BoardData:
+    """Create a board with the searchable fields."""
+    board = BoardData()
+    board.set_name(name)
+    board.set_board_id(board_id)
+    board.set_variant(variant)
+    board.set_mcu(mcu)
+    return board
+
+BOARDS = [
+    create_board("LOLIN C3 Mini", "lolin_c3_mini", "lolin_c3_mini", "esp32c3"),
+    create_board("ESP32 Dev Module", "esp32", "esp32", "esp32"),
+    create_board("Adafruit QT Py ESP32-S3", "adafruit_qtpy_esp32s3", "adafruit_qtpy_esp32s3", "esp32s3"),
+    create_board("LOLIN S2 Mini", "lolin_s2_mini", "lolin_s2_mini", "esp32s2"),
+]
+
+class TestBoardSearch:
+    """Test cases for the board search index."""
+    def test_words_and_grams(self):
+        """Test words are lower case and split into trigrams."""
+        assert get_words("QT Py ESP32-S3") == ["qt", "py", "esp32", "s3"]
+        assert get_grams("esp32") == {"esp", "sp3", "p32"}
+        assert get_grams("c3") == {"c3"}
+
+    def test_index_order(self):
+        """Test the postings refer to the boards sorted by board id."""
+        index = BoardSearchIndex.from_boards(BOARDS)
+        assert index.boards == sorted(board.board for board in BOARDS)
+        assert index.grams["lol"] == [2, 3]
+        assert all(posting == sorted(posting) for posting in index.grams.values())
+
+    def test_search(self):
+        """Test the index finds the same boards as a full scan."""
+        index = BoardSearchIndex.from_boards(BOARDS)
+        boards = sorted(BOARDS, key=lambda board: board.board)
+        for query in ["mini", "c3 mini", "LOLIN", "s3", "esp32s3", "qtpy", "3", "dev", "xyz", "c3 s2"]:
+            words = get_words(query)
+            expected = [board.board for board in boards
+                        if all(word in " ".join(get_words(f"{board.name} {board.board} {board.variant} "
+                                                          f"{board.mcu}")) for word in words)]
+            assert [board.board for board in search_boards(index, boards, query)] == expected, query
+        assert index.search("c3 mini") == [2]
+        assert index.search("") == [0, 1, 2, 3]
+
+    def test_json(self):
+        """Test the exported index can be loaded again."""
+        index = BoardSearchIndex.from_boards(BOARDS)
+        loaded = BoardSearchIndex.from_json(index.to_json())
+        assert loaded.boards == index.boards
+        assert loaded.grams == index.grams
+        assert loaded.search("mini") == index.search("mini")
@@ -0,0 +1,82 @@
+"""Unit tests for board_table.py"""
+import pytest
+
+from helper.board_data import BoardData, BoardList
+from helper.board_table import BoardTable, LED_NONE
+
+def create_board(board_id: str, mcu: str, flash_sizes: list[str], led_builtin: str) -> BoardData:
+    """Create a board like the collector."""
+    board = BoardData()
+    board.set_name(board_id.upper())
+    board.set_board_id(board_id)
+    board.set_variant(board_id)
+    board.set_mcu(mcu)
+    for flash_size in flash_sizes:
+        board.set_flash_size(flash_size)
+    board.set_led_builtin(led_builtin)
+    return board
+
+BOARDS = [
+    create_board("generic", "esp8266", ["1MB", "2MB", "4MB", "512KB"], "N/A"),
+    create_board("d1_mini", "esp8266", ["4MB"], "2"),
+    create_board("s3_box", "esp32s3", ["16MB (128Mb)"], "N/A"),
+    create_board("c3_mini", "esp32c3", ["4MB"], "7"),
+    create_board("unordered", "esp32c3", ["8MB", "4MB"], "0"),
+]
+
+class TestBoardTable:
+    """Test cases for the columnar board table."""
+    def test_columns(self):
+        """Test the dictionary encoded columns, the flash mask and the LED sentinel."""
+        table = BoardTable.from_boards(BOARDS)
+        assert len(table) == 5
+        assert list(table.mcu.codes) == [0, 0, 1, 2, 2]
+        assert table.mcu.values == ["esp8266", "esp32s3", "esp32c3"]
+        assert table.decode_flash(table.flash.codes[0]) == ["512KB", "1MB", "2MB", "4MB"]
+        assert table.decode_flash(table.flash.codes[2]) == ["16MB (128Mb)"]
+        assert list(table.led.codes) == [LED_NONE, 2, LED_NONE, 7, 0]
+        # only the list which is not in the order of the flash mask is kept
+        assert table.flash_order == {4: ["8MB", "4MB"]}
+
+    def test_lossless_json(self):
+        """Test the table converts back to the same JSON as BoardList."""
+        expected = BoardList(BOARDS).to_json()
+        table = BoardTable.from_boards(BOARDS)
+        assert table.to_json() == expected
+        assert BoardTable.from_json(expected).to_json() == expected
+
+    def test_filter(self):
+        """Test filters on the encoded columns."""
+        table = BoardTable.from_boards(BOARDS)
+        assert table.filter(mcu="esp8266") == [0, 1]
+        assert table.filter(flash_size="4MB", has_led=True) == [1, 3, 4]
+        assert table.filter(mcu="esp32c3", variant="c3_mini") == [3]
+        assert table.filter(has_led=False) == [0, 2]
+        assert not table.filter(mcu="esp32p4")
+        assert not table.filter(flash_size="3MB")
+        assert table.filter() == [0, 1, 2, 3, 4]
+        assert [board.board for board in table.to_boards(table.filter(mcu="esp32c3"))] == \
+            ["c3_mini", "unordered"]
+
+    def test_filter_after_append(self):
+        """Test the rows of a column are updated after a new row."""
+        table = BoardTable.from_boards(BOARDS)
+        assert table.filter(mcu="esp32c3") == [3, 4]
+        table.append(create_board("c3_zero", "esp32c3", ["4MB"], "N/A"))
+        assert table.filter(mcu="esp32c3") == [3, 4, 5]
+
+    def test_group_by(self):
+        """Test the groups of the columns."""
+        table = BoardTable.from_boards(BOARDS)
+        assert table.group_by("mcu") == {"esp8266": [0, 1], "esp32s3": [2], "esp32c3": [3, 4]}
+        assert table.group_by("flash_size")["4MB"] == [0, 1, 3, 4]
+        assert table.group_by("led_builtin") == {"N/A": [0, 2], "2": [1], "7": [3], "0": [4]}
+        with pytest.raises(ValueError):
+            table.group_by("name")
+
+    def test_invalid_led(self):
+        """Test LED values which can not be stored losslessly."""
+        with pytest.raises(ValueError):
+            BoardTable.from_boards([create_board("bad", "esp32", [], "-1")])
+        with pytest.raises(ValueError):
+            BoardTable.from_boards([create_board("bad", "esp32", [], "02")])
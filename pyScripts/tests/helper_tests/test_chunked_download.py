@@ -0,0 +1,105 @@
+"""Unit tests for chunked_download.py with a local HTTP stand-in injecting latency"""
+import asyncio
+import hashlib
+import random
+from pathlib import Path
+import pytest
+
+from helper import chunked_download
+from helper.chunked_download import ChunkOptions, ChunkedTransport, count_missing_bytes, split_ranges
+from helper.index_fetcher import AsyncFetcher
+from helper.verified_download import ChecksumError
+
+# pylint: disable=unused-import
+from tests.helper_tests.http_server_fixture import StandInServer, fixture_http_server # pyright: ignore
+
+ARCHIVE = random.Random(42).randbytes(100_000)
+CHECKSUM = "SHA-256:" + hashlib.sha256(ARCHIVE).hexdigest()
+
+class TestChunkedDownload:
+    """Test cases for the parallel chunked download."""
+    def test_split_ranges(self):
+        """Test the ranges cover the file without gaps."""
+        assert split_ranges(100, 4, min_chunk_size=10) == [(0, 24), (25, 49), (50, 74), (75, 99)]
+        assert split_ranges(100, 4, min_chunk_size=40) == [(0, 39), (40, 79), (80, 99)]
+        assert split_ranges(100, 2, min_chunk_size=10, max_chunk_size=30) == \
+            [(0, 29), (30, 59), (60, 89), (90, 99)]
+        assert not split_ranges(0, 4)
+
+    def test_parallel_chunks(self, http_server: StandInServer, tmp_path: Path):
+        """Test the chunks are fetched concurrently and the assembled file is verified."""
+        http_server.files["/esp32-core-1.0.zip"] = ARCHIVE
+        http_server.latency = 0.2
+        progress: list[tuple[int, int]] = []
+        transport = ChunkedTransport(options=ChunkOptions(num_chunks=4, min_chunk_size=10_000),
+                                     progress=lambda url, received, total: progress.append((received, total)))
+        save_path = tmp_path / "esp32-core-1.0.zip"
+        transport.fetch(f"{http_server.url}/esp32-core-1.0.zip", str(save_path), CHECKSUM, len(ARCHIVE))
+        transport.close()
+        assert save_path.read_bytes() == ARCHIVE
+        assert http_server.ranges[0] == "bytes=0-0"
+        assert sorted(http_server.ranges[1:], key=lambda byte_range: int(byte_range[6:].split("-")[0])) == \
+            [f"bytes={first}-{last}" for first, last in split_ranges(len(ARCHIVE), 4, 10_000)]
+        assert http_server.max_in_flight == 4
+        assert len(progress) == 4
+        assert progress[-1] == (len(ARCHIVE), len(ARCHIVE))
+        assert [path.name for path in tmp_path.iterdir()] == ["esp32-core-1.0.zip"]
+
+    def test_retry_chunk(self, http_server: StandInServer, tmp_path: Path):
+        """Test failed chunk requests are retried."""
+        http_server.files["/esp32-core-1.0.zip"] = ARCHIVE
+        transport = ChunkedTransport(options=ChunkOptions(num_chunks=2, min_chunk_size=10_000, retry_delay=0.01))
+        http_server.failures["bytes=50000-99999"] = 2
+        transport.fetch(f"{http_server.url}/esp32-core-1.0.zip", str(tmp_path / "core.zip"), CHECKSUM)
+        assert (tmp_path / "core.zip").read_bytes() == ARCHIVE
+        assert transport.num_of_retries == 2
+        assert http_server.ranges.count("bytes=50000-99999") == 3
+        http_server.failures["bytes=0-49999"] = 100
+        with pytest.raises(OSError):
+            transport.fetch(f"{http_server.url}/esp32-core-1.0.zip", str(tmp_path / "failed.zip"))
+        transport.close()
+        assert not (tmp_path / "failed.zip").exists()
+
+    def test_invalid_checksum(self, http_server: StandInServer, tmp_path: Path):
+        """Test an assembled file not matching the checksum is removed."""
+        http_server.files["/esp32-core-1.0.zip"] = ARCHIVE
+        transport = ChunkedTransport(options=ChunkOptions(min_chunk_size=10_000))
+        with pytest.raises(ChecksumError):
+            transport.fetch(f"{http_server.url}/esp32-core-1.0.zip", str(tmp_path / "core.zip"),
+                            "SHA-256:" + "0" * 64)
+        with pytest.raises(ChecksumError):
+            transport.fetch(f"{http_server.url}/esp32-core-1.0.zip", str(tmp_path / "core.zip"),
+                            CHECKSUM, len(ARCHIVE) + 1)
+        transport.close()
+        assert not list(tmp_path.iterdir())
+
+    def test_missing_range(self, http_server: StandInServer, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+        """Test a file with a range which was not downloaded is removed, also without checksum."""
+        assert count_missing_bytes([(50, 100), (0, 25), (20, 40)], 100) == 10
+        assert count_missing_bytes([(0, 60), (40, 100)], 100) == 0
+        assert count_missing_bytes([(0, 60)], 100) == 40
+        http_server.files["/esp32-core-1.0.zip"] = ARCHIVE
+
+        def skip_first_range(size: int, num_chunks: int, min_chunk_size: int) -> list[tuple[int, int]]:
+            return split_ranges(size, num_chunks, min_chunk_size)[1:]
+        monkeypatch.setattr(chunked_download, "split_ranges", skip_first_range)
+        transport = ChunkedTransport(options=ChunkOptions(min_chunk_size=10_000))
+        with pytest.raises(ChecksumError):
+            transport.fetch(f"{http_server.url}/esp32-core-1.0.zip", str(tmp_path / "core.zip"))
+        transport.close()
+        assert not list(tmp_path.iterdir())
+
+    def test_single_request_fallback(self, http_server: StandInServer, tmp_path: Path):
+        """Test servers without range support and small files are downloaded with a single request."""
+        http_server.files["/esp32-core-1.0.zip"] = ARCHIVE
+        http_server.files["/package_esp32_index.json"] = b'{"packages": []}'
+        http_server.accept_ranges = False
+        fetcher = AsyncFetcher(ChunkedTransport(options=ChunkOptions(min_chunk_size=10_000)))
+        asyncio.run(fetcher.fetch(f"{http_server.url}/esp32-core-1.0.zip", str(tmp_path / "core.zip"),
+                                  CHECKSUM, len(ARCHIVE)))
+        assert (tmp_path / "core.zip").read_bytes() == ARCHIVE
+        assert http_server.ranges == ["bytes=0-0", ""]
+        http_server.accept_ranges = True
+        asyncio.run(fetcher.fetch(f"{http_server.url}/package_esp32_index.json", str(tmp_path / "index.json")))
+        assert (tmp_path / "index.json").read_bytes() == b'{"packages": []}'
+        assert http_server.ranges[2:] == ["bytes=0-0", ""]
@@ -3,6 +3,7 @@ import json
 from pathlib import Path
 import pytest
 
+from helper.collecting_board_data import CollectingBoardData
 from helper.collecting_core_data import CollectingCoreData
 from helper.board_data import BoardList
 
@@ -46,6 +47,54 @@ class TestBoardData:
         assert board_data.variant == "d1_mini"
         assert board_data.flash_size == ["4MB"]
 
+    def test_lazy_stages(self, setup_esp8266: pytest.Function):
+        """Test each stage is computed on first access only, partitions do not resolve the LEDs."""
+        core_data = CollectingCoreData("esp8266", "2.7.4", str(setup_esp8266))
+        assert not core_data.timings
+        assert list(core_data.partitions) == ["generic", "d1_mini"]
+        assert set(core_data.timings) == {"read", "partitions"}
+        board_data = core_data.parsed_boards.get_board_by_id("d1_mini")
+        assert board_data is not None and board_data.led_builtin == "N/A"
+        assert "leds" not in core_data.timings
+        assert core_data.num_of_boards_without_led == 1
+        assert board_data.led_builtin == "2"
+        assert core_data.boards is core_data.parsed_boards
+        assert core_data.board_table.to_json() == core_data.boards.to_json()
+        # esp8266 has no partition schemes, the flash fit stage is skipped
+        assert not core_data.flash_mismatches
+        assert set(core_data.timings) == {"read", "partitions", "boards", "leds"}
+
+    def test_iter_boards(self, setup_esp8266: pytest.Function):
+        """Test each board is yielded with its LED as soon as its block ends."""
+        core_path = str(setup_esp8266)
+        with open(core_path + "/boards.txt", 'r', encoding='utf8') as file:
+            lines = file.readlines()
+        read_lines: list[str] = []
+        def read(line: str) -> str:
+            read_lines.append(line)
+            return line
+        board_data = CollectingBoardData("esp8266", core_path)
+        boards = board_data.iter_boards(read(line) for line in lines)
+        first_board = next(boards)
+        assert first_board.board == "generic"
+        assert read_lines[-1].startswith("d1_mini.name=")
+        last_board = next(boards)
+        assert (last_board.board, last_board.led_builtin) == ("d1_mini", "2")
+        assert next(boards, None) is None
+        assert board_data.num_of_boards_without_led == 1
+        assert not board_data.get_collected_data()
+
+        core_data = CollectingCoreData("esp8266", "2.7.4", core_path)
+        assert [board.to_json() for board in core_data.iter_boards()] == \
+            [board.to_json() for board in core_data.boards]
+        # boards collected line by line are the same
+        board_data = CollectingBoardData("esp8266", core_path)
+        for line in lines:
+            board_data.collect_board_data(line)
+        board_data.final_data()
+        assert [board.to_json() for board in board_data.get_collected_data()] == \
+            [board.to_json() for board in core_data.boards]
+
     def test_sort_flash_size(self, setup_esp8266: pytest.Function):
         """Test the __get_data method of CoreData."""
         core_data = CollectingCoreData("esp8266", "2.7.4", str(setup_esp8266))
@@ -0,0 +1,76 @@
+"""Unit tests for core_dialect.py"""
+from types import MappingProxyType
+import pytest
+
+from helper import core_dialect
+from helper.core_dialect import CoreDialect, Esp32Dialect, Esp8266Dialect, get_dialect, register_dialect
+from helper.flash_fit import parse_flash_size
+from helper.header_evaluator import HeaderScanner, SOC_GPIO_PIN_COUNT
+from helper.collecting_partition_data import CollectingPartitionData
+
+class TestCoreDialect:
+    """Test cases for the dialect registry and the handlers of the dialects."""
+    def test_get_dialect(self):
+        """Test registered dialects and the generic fallback."""
+        assert isinstance(get_dialect("esp8266"), Esp8266Dialect)
+        assert isinstance(get_dialect("esp32"), Esp32Dialect)
+        generic = get_dialect("rp2040")
+        assert type(generic) is CoreDialect  # pylint: disable=unidiomatic-typecheck
+        assert generic.core_name == "rp2040"
+        assert not generic.partition_schemes
+
+    def test_register_dialect(self, monkeypatch: pytest.MonkeyPatch):
+        """Test a third party core can register its own dialect."""
+        class TestDialect(CoreDialect):
+            """ dialect of a test core """
+            name = "test_core"
+            predefined_symbols = MappingProxyType({"PIN_COUNT": 30})
+        # the registration is undone after the test
+        monkeypatch.setitem(core_dialect.DIALECTS, TestDialect.name, CoreDialect)
+        assert register_dialect(TestDialect) is TestDialect
+        assert get_dialect("test_core").predefined_symbols == {"PIN_COUNT": 30}
+        assert not get_dialect("rp2040").predefined_symbols
+
+    def test_flash_size_esp8266(self):
+        """Test the flash size of the eesz menu, autoflash is skipped."""
+        matcher = get_dialect("esp8266").board_matcher
+        match_line = matcher.match_line("d1", "d1.menu.eesz.4M2M.build.flash_size=4M")
+        assert match_line is not None and match_line[0].field == "flash_size"
+        assert match_line[1] == "4MB"
+        assert parse_flash_size(match_line[1]) == 0x400000
+        assert matcher.match_line("d1", "d1.menu.eesz.autoflash.build.flash_size=16M") is None
+        assert matcher.match_line("d1", "d1_mini.menu.eesz.4M.build.flash_size=4M") is None
+        assert matcher.match_line("d1", "d1.build.flash_size=4M") is None
+
+    def test_flash_size_esp32(self):
+        """Test the flash size of the build key."""
+        matcher = get_dialect("esp32").board_matcher
+        match_line = matcher.match_line("d32", "d32.build.flash_size=4MB")
+        assert match_line is not None and match_line[0].field == "flash_size"
+        assert parse_flash_size(match_line[1]) == 0x400000
+        assert matcher.match_line("d32", "d32_pro.build.flash_size=16MB") is None
+        assert matcher.match_line("d32", "d32.menu.FlashSize.4M.build.flash_size=4MB") is None
+
+    def test_paths(self):
+        """Test the directories of the source archive and the installed core."""
+        assert get_dialect("esp8266").archive_directory("3.1.2") == "esp8266-3.1.2"
+        assert get_dialect("esp32").archive_directory("3.3.0") == "esp32-core-3.3.0"
+        assert get_dialect("esp32").installed_path("/packages", "3.3.0") == \
+            "/packages/esp32/hardware/esp32/3.3.0"
+
+    def test_resolve_led(self):
+        """Test the LED resolver with the predefined symbols of the esp32 dialect."""
+        dialect = get_dialect("esp32")
+        header = HeaderScanner(b"#define PIN_RGB_LED 8\n"
+                               b"static const uint8_t LED_BUILTIN = SOC_GPIO_PIN_COUNT + PIN_RGB_LED;\n",
+                               dict(dialect.predefined_symbols))
+        assert dialect.resolve_led(header) == SOC_GPIO_PIN_COUNT + 8
+        assert get_dialect("esp8266").resolve_led(HeaderScanner(b"int a = 1;\n", {})) is None
+
+    def test_partitions_by_dialect(self):
+        """Test partition schemes are only collected for dialects with partition schemes."""
+        for core_name, expected in (("esp32", "default"), ("esp8266", "")):
+            partition_data = CollectingPartitionData(core_name, "")
+            partition_data.add_partition("board")
+            partition_data.collect_partition_data("board.build.partitions=default")
+            assert partition_data.get_partitions_data()["board"].default == expected
@@ -0,0 +1,72 @@
+"""Unit tests for core_discovery.py"""
+import json
+from pathlib import Path
+
+from helper.core_discovery import collect_installed_cores, discover_cores
+
+BOARDS_TXT = """
+d1_mini.name=LOLIN(WEMOS) D1 R2 & mini
+d1_mini.build.variant=d1_mini
+d1_mini.build.mcu=esp8266
+d1_mini.menu.eesz.4M.build.flash_size=4M
+"""
+
+def install_core(data_path: Path, packager: str, arch: str, version: str, boards_txt: bytes) -> Path:
+    """Create an installed core below the packages directory."""
+    core_path = data_path / "packages" / packager / "hardware" / arch / version
+    core_path.mkdir(parents=True)
+    (core_path / "boards.txt").write_bytes(boards_txt)
+    return core_path
+
+class TestCoreDiscovery:
+    """Test cases for the discovery and parallel collection of installed cores."""
+    def test_discover_cores(self, tmp_path: Path):
+        """Test every version with a boards.txt is found in a sorted order."""
+        install_core(tmp_path, "esp8266", "esp8266", "3.1.2", BOARDS_TXT.encode())
+        install_core(tmp_path, "esp8266", "esp8266", "2.7.4", BOARDS_TXT.encode())
+        install_core(tmp_path, "rp2040", "rp2040", "4.0.1", b"")
+        (tmp_path / "packages" / "esp32" / "hardware" / "esp32" / "3.3.0").mkdir(parents=True)
+        (tmp_path / "packages" / "esp32" / "tools").mkdir(parents=True)
+        cores = discover_cores(str(tmp_path))
+        assert [(core.packager, core.core_name, core.version) for core in cores] == [
+            ("esp8266", "esp8266", "2.7.4"), ("esp8266", "esp8266", "3.1.2"), ("rp2040", "rp2040", "4.0.1")]
+        assert cores[0].get_export_name() == "esp8266-esp8266-2.7.4"
+        # the packages directory can be used directly
+        assert len(discover_cores(str(tmp_path / "packages"))) == 3
+        assert not discover_cores(str(tmp_path / "missing"))
+
+    def test_collect_installed_cores(self, tmp_path: Path):
+        """Test all cores are collected and exported with a combined report."""
+        data_path = tmp_path / "arduino15"
+        output_path = tmp_path / "esp_data"
+        output_path.mkdir()
+        install_core(data_path, "esp8266", "esp8266", "2.7.4", BOARDS_TXT.encode())
+        install_core(data_path, "esp8266", "esp8266", "3.1.2", BOARDS_TXT.encode())
+        install_core(data_path, "broken", "broken", "1.0.0", b"\xff\xfe invalid")
+        report = collect_installed_cores(discover_cores(str(data_path)), str(output_path), max_workers=2)
+        assert [entry["core_name"] for entry in report] == ["broken", "esp8266", "esp8266"]
+        assert "error" in report[0]
+        assert report[1]["boards"] == 1
+        assert report[1]["boards_without_led"] == 1
+        assert report[2]["version"] == "3.1.2"
+        boards = json.loads((output_path / "esp8266-esp8266-3.1.2.json").read_text(encoding="utf-8"))
+        assert boards[0]["flash_size"] == ["4MB"]
+        assert (output_path / "esp8266-esp8266-2.7.4_search.json").exists()
+        assert not collect_installed_cores([], str(output_path))
+
+    def test_same_core_of_two_packagers(self, tmp_path: Path):
+        """Test the same core version of two packagers is exported to separate files."""
+        data_path = tmp_path / "arduino15"
+        output_path = tmp_path / "esp_data"
+        output_path.mkdir()
+        install_core(data_path, "esp8266", "esp8266", "3.1.2", BOARDS_TXT.encode())
+        install_core(data_path, "mirror", "esp8266", "3.1.2",
+                     BOARDS_TXT.replace("d1_mini", "mirror_mini").encode())
+        cores = discover_cores(str(data_path))
+        assert cores[0].get_export_name() != cores[1].get_export_name()
+        report = collect_installed_cores(cores, str(output_path), max_workers=2)
+        assert [entry["packager"] for entry in report] == ["esp8266", "mirror"]
+        boards = json.loads((output_path / "esp8266-esp8266-3.1.2.json").read_text(encoding="utf-8"))
+        mirror_boards = json.loads((output_path / "mirror-esp8266-3.1.2.json").read_text(encoding="utf-8"))
+        assert boards[0]["board"] == "d1_mini"
+        assert mirror_boards[0]["board"] == "mirror_mini"
@@ -0,0 +1,97 @@
+"""Unit tests for core_snapshot.py"""
+import pickle
+from pathlib import Path
+from typing import Any
+import pytest
+
+from helper import core_snapshot
+from helper.collecting_core_data import CollectingCoreData
+from helper.core_snapshot import get_input_files, load_snapshot, save_snapshot
+
+# pylint: disable=unused-import
+from tests.helper_tests.collection_core_data_fixture import fixture_setup_esp8266 # pyright: ignore
+
+class Unloadable: # pylint: disable=too-few-public-methods
+    """Object whose unpickling fails with a TypeError, like a class with a changed constructor."""
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (int, (None,))
+
+class TestCoreSnapshot:
+    """Test cases for the binary snapshot of collected core data."""
+    def test_input_files(self, setup_esp8266: Path):
+        """Test boards.txt, headers and partition csv files are inputs, other files are not."""
+        core_path = Path(str(setup_esp8266))
+        (core_path / "cores" / "esp8266").mkdir(parents=True)
+        (core_path / "cores" / "esp8266" / "core_esp8266_features.h").write_text("")
+        (core_path / "cores" / "esp8266" / "Esp.cpp").write_text("")
+        (core_path / "tools" / "partitions").mkdir(parents=True)
+        (core_path / "tools" / "partitions" / "default.csv").write_text("")
+        assert get_input_files(str(core_path), "esp8266") == [
+            "boards.txt", "cores/esp8266/core_esp8266_features.h", "tools/partitions/default.csv",
+            "variants/d1_mini/pins_arduino.h"]
+
+    def test_save_and_load(self, setup_esp8266: Path, tmp_path: Path):
+        """Test the collected data is reloaded until an input file changes."""
+        snapshot_path = str(tmp_path / "esp8266_snapshot.pickle")
+        core_data = CollectingCoreData("esp8266", "2.7.4", str(setup_esp8266))
+        assert not core_data.load_snapshot(snapshot_path)
+        # the stages are only computed on access, not by the constructor or a missed load
+        assert not core_data.timings
+        core_data.save_snapshot(snapshot_path)
+        assert Path(snapshot_path).exists()
+
+        reloaded = CollectingCoreData("esp8266", "2.7.4", str(setup_esp8266))
+        reloaded.boards.clear()
+        assert reloaded.load_snapshot(snapshot_path)
+        assert reloaded.boards.to_json() == core_data.boards.to_json()
+        assert reloaded.partitions.to_json() == core_data.partitions.to_json()
+        assert reloaded.num_of_boards_without_led == core_data.num_of_boards_without_led == 1
+        # another core version or changed input files need a new collection
+        assert not CollectingCoreData("esp8266", "3.1.2", str(setup_esp8266)).load_snapshot(snapshot_path)
+        with open(Path(str(setup_esp8266)) / "boards.txt", "a", encoding="utf8") as boards_txt:
+            boards_txt.write("d1.name=LOLIN(WEMOS) D1 R1\nd1.build.variant=d1_mini\n")
+        assert not reloaded.load_snapshot(snapshot_path)
+        assert len(reloaded.boards) == 2
+        changed = CollectingCoreData("esp8266", "2.7.4", str(setup_esp8266))
+        assert not changed.load_snapshot(snapshot_path)
+        assert [board.name for board in changed.boards][-1] == "LOLIN(WEMOS) D1 R1"
+        changed.save_snapshot(snapshot_path)
+        assert CollectingCoreData("esp8266", "2.7.4", str(setup_esp8266)).load_snapshot(snapshot_path)
+
+    def test_changed_classes(self, setup_esp8266: Path, tmp_path: Path):
+        """Test a snapshot of boards with another field layout is not loaded."""
+        snapshot_path = str(tmp_path / "esp8266_snapshot.pickle")
+        core_data = CollectingCoreData("esp8266", "2.7.4", str(setup_esp8266))
+        variant = core_data.boards[0].variant
+        del core_data.boards[0].variant
+        core_data.save_snapshot(snapshot_path)
+        reloaded = CollectingCoreData("esp8266", "2.7.4", str(setup_esp8266))
+        assert not reloaded.load_snapshot(snapshot_path)
+        assert reloaded.boards[0].variant == variant
+
+    def test_invalid_snapshot(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+        """Test missing, broken and outdated snapshots are ignored."""
+        path = tmp_path / "snapshot.pickle"
+        assert load_snapshot(str(path), "abc") is None
+        path.write_bytes(b"")
+        assert load_snapshot(str(path), "abc") is None
+        path.write_bytes(b"no pickle")
+        assert load_snapshot(str(path), "abc") is None
+        save_snapshot(str(path), "abc", {"boards": []})
+        assert load_snapshot(str(path), "abc") == {"boards": []}
+        assert load_snapshot(str(path), "def") is None
+        # truncated file
+        path.write_bytes(path.read_bytes()[:-3])
+        assert load_snapshot(str(path), "abc") is None
+        # unpickling raises another error or the data is no dictionary
+        save_snapshot(str(path), "abc", {"boards": Unloadable()})
+        with pytest.raises(TypeError):
+            pickle.loads(pickle.dumps(Unloadable()))
+        assert load_snapshot(str(path), "abc") is None
+        save_snapshot(str(path), "abc", {"boards": []})
+        path.write_bytes(path.read_bytes().replace(pickle.dumps({"boards": []}, protocol=pickle.HIGHEST_PROTOCOL),
+                                                   pickle.dumps([], protocol=pickle.HIGHEST_PROTOCOL)))
+        assert load_snapshot(str(path), "abc") is None
+        save_snapshot(str(path), "abc", {"boards": []})
+        monkeypatch.setattr(core_snapshot, "SNAPSHOT_SCHEMA_VERSION", core_snapshot.SNAPSHOT_SCHEMA_VERSION + 1)
+        assert load_snapshot(str(path), "abc") is None
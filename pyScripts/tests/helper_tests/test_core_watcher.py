@@ -0,0 +1,103 @@
+"""Unit tests for core_watcher.py and the refresh of CollectingCoreData"""
+import os
+from pathlib import Path
+import pytest
+
+from helper.core_watcher import CoreWatcher
+from helper.collecting_core_data import CollectingCoreData
+
+# wildcard import is only used for test fixtures
+# pylint: disable=unused-wildcard-import, wildcard-import
+from tests.helper_tests.collection_core_data_fixture import *
+
+def touch(path: Path, content: str):
+    """Write a file and move its modification time forward."""
+    path.write_text(content)
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+class TestCoreWatcher:
+    """Test cases for CoreWatcher polling."""
+    def test_poll_without_changes(self, setup_esp32: pytest.Function):
+        """Test polling an unchanged core."""
+        watcher = CoreWatcher(str(setup_esp32))
+        assert len(watcher.snapshot) == 2
+        assert not watcher.poll()
+
+    def test_poll_changes(self, setup_esp32: pytest.Function):
+        """Test modified, added and removed files are reported."""
+        core_path = Path(str(setup_esp32))
+        watcher = CoreWatcher(str(core_path))
+        header = core_path / "variants" / "d1_mini32" / "pins_arduino.h"
+        touch(header, "static const uint8_t LED_BUILTIN = 5;")
+        (core_path / "tools" / "partitions").mkdir(parents=True)
+        (core_path / "tools" / "partitions" / "default.csv").write_text("")
+        assert watcher.poll() == sorted([str(header), str(core_path / "tools" / "partitions" / "default.csv")])
+        header.unlink()
+        assert watcher.poll() == [str(header)]
+        assert not watcher.poll()
+
+class TestRefresh:
+    """Test cases for the refresh of CollectingCoreData."""
+    def test_refresh_header(self, setup_esp32: pytest.Function):
+        """Test a changed header only updates the LED of the boards of this variant."""
+        core_path = Path(str(setup_esp32))
+        core_data = CollectingCoreData("esp32", "3.2.0", str(core_path))
+        watcher = CoreWatcher(str(core_path))
+        touch(core_path / "variants" / "d1_mini32" / "pins_arduino.h", "#define LED_BUILTIN 5")
+        core_data.refresh(watcher.poll())
+        board_data = core_data.boards.get_board_by_id("d1_mini32")
+        assert board_data is not None
+        assert board_data.led_builtin == "5"
+        assert core_data.num_of_boards_without_led == 0
+        touch(core_path / "variants" / "d1_mini32" / "pins_arduino.h", "")
+        core_data.refresh(watcher.poll())
+        assert board_data.led_builtin == "N/A"
+        assert core_data.num_of_boards_without_led == 1
+
+    def test_refresh_included_header(self, setup_esp32: pytest.Function):
+        """Test a changed shared header or core header updates the LEDs of the variants including it."""
+        core_path = Path(str(setup_esp32))
+        (core_path / "variants" / "common").mkdir()
+        (core_path / "variants" / "common" / "pins_common.h").write_text("#define LED_PIN 5")
+        (core_path / "cores" / "esp32").mkdir(parents=True)
+        (core_path / "cores" / "esp32" / "core_pins.h").write_text("#define LED_OFFSET 0")
+        (core_path / "variants" / "d1_mini32" / "pins_arduino.h").write_text(
+            '#include "../common/pins_common.h"\n#include "core_pins.h"\n'
+            "static const uint8_t LED_BUILTIN = LED_PIN + LED_OFFSET;")
+        core_data = CollectingCoreData("esp32", "3.2.0", str(core_path))
+        board_data = core_data.boards.get_board_by_id("d1_mini32")
+        assert board_data is not None and board_data.led_builtin == "5"
+        watcher = CoreWatcher(str(core_path))
+        touch(core_path / "variants" / "common" / "pins_common.h", "#define LED_PIN 9")
+        core_data.refresh(watcher.poll())
+        assert board_data.led_builtin == "9"
+        touch(core_path / "cores" / "esp32" / "core_pins.h", "#define LED_OFFSET 1")
+        assert watcher.poll() == [str(core_path / "cores" / "esp32" / "core_pins.h")]
+        core_data.refresh([str(core_path / "cores" / "esp32" / "core_pins.h")])
+        assert board_data.led_builtin == "10"
+        # a header no variant includes does not change the boards
+        (core_path / "variants" / "common" / "unused.h").write_text("#define LED_PIN 1")
+        core_data.refresh(watcher.poll())
+        assert board_data.led_builtin == "10"
+
+    def test_refresh_boards_txt(self, setup_esp32: pytest.Function):
+        """Test a changed boards.txt collects the boards again."""
+        core_path = Path(str(setup_esp32))
+        core_data = CollectingCoreData("esp32", "3.2.0", str(core_path))
+        watcher = CoreWatcher(str(core_path))
+        boards_txt = (core_path / "boards.txt").read_text()
+        touch(core_path / "boards.txt", boards_txt + "\nnew_board.name=New Board\n")
+        core_data.refresh(watcher.poll())
+        assert len(core_data.boards) == 2
+
+    def test_refresh_partition_csv(self, setup_esp32_scheme_data: pytest.Function):
+        """Test an added partition csv collects the partitions again."""
+        core_path = Path(str(setup_esp32_scheme_data))
+        core_data = CollectingCoreData("esp32", "3.2.0", str(core_path))
+        assert "d1_mini32" not in core_data.partitions
+        watcher = CoreWatcher(str(core_path))
+        (core_path / "tools" / "partitions").mkdir(parents=True)
+        (core_path / "tools" / "partitions" / "default.csv").write_text("")
+        core_data.refresh(watcher.poll())
+        assert "d1_mini32" in core_data.partitions
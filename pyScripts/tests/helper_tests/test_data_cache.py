@@ -0,0 +1,90 @@
+"""Unit tests for data_cache.py"""
+import hashlib
+import itertools
+import json
+from pathlib import Path
+import pytest
+
+from helper.data_cache import CACHE_INDEX_FILE, DataCache
+
+def create_core(cache_path: Path, key: str, size: int) -> None:
+    """Create an extracted core directory with a file of size bytes."""
+    (cache_path / key / "variants").mkdir(parents=True)
+    (cache_path / key / "boards.txt").write_bytes(b"x" * (size - 10))
+    (cache_path / key / "variants" / "pins.h").write_bytes(b"y" * 10)
+
+class TestDataCache:
+    """Test cases for the persistent cache with LRU eviction."""
+    def test_put_and_get(self, tmp_path: Path):
+        """Test the metadata of files and directories and the reuse after a reload."""
+        clock = itertools.count(1.0)
+        cache = DataCache(str(tmp_path), clock=lambda: next(clock))
+        (tmp_path / "package_esp32_index.json").write_bytes(b"{}")
+        create_core(tmp_path, "esp32-core-3.3.0", 100)
+        index_entry = cache.put("package_esp32_index.json", url="https://example.com/package_esp32_index.json")
+        assert index_entry.checksum == "SHA-256:" + hashlib.sha256(b"{}").hexdigest()
+        assert index_entry.size == 2
+        core_entry = cache.put("esp32-core-3.3.0", "https://example.com/esp32-3.3.0.zip", "3.3.0", "SHA-256:ab")
+        assert core_entry.size == 100
+        assert core_entry.last_used == 2.0
+        cache.save()
+        # generated files are not part of the cache
+        (tmp_path / "esp32.json").write_text("[]")
+
+        reloaded = DataCache(str(tmp_path), clock=lambda: 10.0)
+        assert reloaded.has_index and not cache.has_index
+        assert reloaded.get_total_size() == 102
+        assert reloaded.get("esp32-core-3.3.0", checksum="SHA-256:ab", version="3.3.0") == \
+            str(tmp_path / "esp32-core-3.3.0")
+        assert reloaded.entries["esp32-core-3.3.0"].last_used == 10.0
+        assert reloaded.entries["esp32-core-3.3.0"].url == "https://example.com/esp32-3.3.0.zip"
+        assert reloaded.get("esp32-core-3.3.0", checksum="SHA-256:cd") is None
+        assert reloaded.get("esp32-core-3.3.0", version="3.2.0") is None
+        assert reloaded.get("esp8266-3.1.2") is None
+        with pytest.raises(ValueError):
+            reloaded.put("esp8266-3.1.2")
+
+    def test_removed_from_disk(self, tmp_path: Path):
+        """Test an entry removed from disk is dropped."""
+        cache = DataCache(str(tmp_path))
+        create_core(tmp_path, "esp32-core-3.3.0", 100)
+        cache.put("esp32-core-3.3.0")
+        cache.remove("esp32-core-3.3.0")
+        assert not (tmp_path / "esp32-core-3.3.0").exists()
+        create_core(tmp_path, "esp32-core-3.3.0", 100)
+        cache.put("esp32-core-3.3.0")
+        cache.save()
+        for path in (tmp_path / "esp32-core-3.3.0").rglob("*"):
+            if path.is_file():
+                path.unlink()
+        (tmp_path / "esp32-core-3.3.0" / "variants").rmdir()
+        (tmp_path / "esp32-core-3.3.0").rmdir()
+        reloaded = DataCache(str(tmp_path))
+        assert reloaded.get("esp32-core-3.3.0") is None
+        assert not reloaded.entries
+
+    def test_lru_eviction(self, tmp_path: Path):
+        """Test the least recently used entries are removed, entries used by the run are kept."""
+        clock = itertools.count(1.0)
+        cache = DataCache(str(tmp_path), clock=lambda: next(clock))
+        for key in ("esp32-core-3.1.0", "esp32-core-3.2.0", "esp32-core-3.3.0"):
+            create_core(tmp_path, key, 100)
+            cache.put(key)
+        cache.save()
+
+        run = DataCache(str(tmp_path), max_bytes=150, clock=lambda: 10.0)
+        assert run.get("esp32-core-3.1.0") is not None
+        assert run.evict() == ["esp32-core-3.2.0", "esp32-core-3.3.0"]
+        assert not (tmp_path / "esp32-core-3.2.0").exists()
+        # entries used by this run are kept even if they exceed the budget
+        create_core(tmp_path, "esp32-core-3.4.0", 100)
+        run.put("esp32-core-3.4.0")
+        assert not run.evict()
+        run.save()
+        index = json.loads((tmp_path / CACHE_INDEX_FILE).read_text(encoding="utf-8"))
+        assert list(index) == ["esp32-core-3.1.0", "esp32-core-3.4.0"]
+
+        next_run = DataCache(str(tmp_path), max_bytes=150, clock=lambda: 20.0)
+        assert next_run.get("esp32-core-3.4.0") is not None
+        assert next_run.evict() == ["esp32-core-3.1.0"]
+        assert (tmp_path / "esp32-core-3.4.0" / "boards.txt").exists()
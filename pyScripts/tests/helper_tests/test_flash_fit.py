@@ -0,0 +1,88 @@
+"""Unit tests for flash_fit.py"""
+from pathlib import Path
+import pytest
+
+from helper import flash_fit
+from helper.flash_fit import check_pairs, collect_flash_sizes, find_flash_mismatches, parse_flash_size
+from helper.partitions_data import PartitionData, PartitionList, Scheme
+from helper.collecting_core_data import CollectingCoreData
+from helper.core_dialect import get_dialect
+
+# pylint: disable=unused-import
+from tests.helper_tests.collection_core_data_fixture import fixture_setup_esp32_base # pyright: ignore
+
+def create_partitions(default: str, builds: list[str]) -> PartitionData:
+    """Create the partition data of a board."""
+    partition_data = PartitionData()
+    partition_data.set_default(default)
+    for build in builds:
+        scheme = Scheme()
+        scheme.set_build(build)
+        partition_data.add_scheme(build, scheme)
+    return partition_data
+
+@pytest.fixture(name="use_numpy", params=[True, False], ids=["numpy", "python"])
+def fixture_use_numpy(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch):
+    """Run a test with the vectorized and the python check."""
+    if request.param:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(flash_fit, "np", None)
+
+class TestFlashFit:
+    """Test cases for the flash fit of the partition schemes."""
+    def test_parse_flash_size(self):
+        """Test flash sizes of esp32 and esp8266 boards."""
+        assert parse_flash_size("4MB") == 0x400000
+        assert parse_flash_size("512KB") == 0x80000
+        assert parse_flash_size("16M") == 0x1000000
+        assert parse_flash_size("N/A") == 0
+
+    @pytest.mark.usefixtures("use_numpy")
+    def test_check_pairs(self):
+        """Test the pairs larger than the flash of the board are found."""
+        flash_sizes = [0x400000, 0x800000]
+        scheme_ends = [0x400000, 0x800000, 0x1000000]
+        assert check_pairs(flash_sizes, scheme_ends, [0, 0, 1, 1, 1], [0, 1, 0, 1, 2]) == [1, 4]
+        assert not check_pairs(flash_sizes, scheme_ends, [], [])
+
+    def test_collect_flash_sizes(self):
+        """Test the largest flash size of the default and the flash size menu of each board."""
+        lines = ["s3.name=ESP32S3 Dev Module\n", "s3.build.flash_size=4MB\n",
+                 "s3.menu.FlashSize.4M.build.flash_size=4MB\n", "s3.menu.FlashSize.16M.build.flash_size=16MB\n",
+                 "s3.menu.PartitionScheme.default_16MB.build.partitions=default_16MB\n",
+                 "c3.name=ESP32C3 Dev Module\n", "c3.build.flash_size=4MB\n", "c3.menu.FlashSize.8M=8MB\n",
+                 "unknown.name=Unknown\n", "unknown.build.flash_size=N/A\n"]
+        assert collect_flash_sizes(lines, get_dialect("esp32").flash_fields) == {"s3": 0x1000000, "c3": 0x400000}
+        assert collect_flash_sizes(lines, get_dialect("generic").flash_fields) == {"s3": 0x400000, "c3": 0x400000}
+
+    @pytest.mark.usefixtures("use_numpy")
+    def test_find_flash_mismatches(self):
+        """Test mismatches of default and menu schemes, unknown sizes are skipped."""
+        flash_sizes = {"small": 0x200000, "large": 0x1000000}
+        partitions = PartitionList()
+        partitions.add_partition("small", create_partitions("default", ["minimal"]))
+        partitions.add_partition("large", create_partitions("default", ["default_16MB", "missing"]))
+        partitions.add_partition("unknown", create_partitions("default_16MB", []))
+        scheme_ends = {"minimal": 0x200000, "default": 0x400000, "default_16MB": 0x1000000}
+        mismatches = find_flash_mismatches(flash_sizes, partitions, scheme_ends)
+        assert [(mismatch.board, mismatch.build) for mismatch in mismatches] == [("small", "default")]
+        assert mismatches[0].scheme_end == 0x400000
+        assert mismatches[0].flash_size == 0x200000
+
+    def test_collecting_core_data(self, setup_esp32_base: pytest.Function):
+        """Test the collection stage reports schemes larger than the board flash."""
+        partitions_path = Path(str(setup_esp32_base)) / "tools" / "partitions"
+        partitions_path.mkdir(parents=True)
+        (partitions_path / "default.csv").write_text(
+            "# Name, Type, SubType, Offset, Size\nnvs, data, nvs, 0x9000, 0x5000\n"
+            "app0, app, ota_0, 0x10000, 0x140000\nspiffs, data, spiffs, 0x150000, 0x2B0000\n")
+        (partitions_path / "no_ota.csv").write_text(
+            "nvs, data, nvs, 0x9000, 0x5000\napp0, app, factory, 0x10000, 0x7F0000\n")
+        core_data = CollectingCoreData("esp32", "3.2.0", str(setup_esp32_base))
+        assert [(mismatch.board, mismatch.build) for mismatch in core_data.flash_mismatches] == \
+            [("d1_mini32", "no_ota")]
+        # no_ota fits if the flash size menu offers a larger flash
+        with open(Path(str(setup_esp32_base)) / "boards.txt", "a", encoding="utf8") as boards_txt:
+            boards_txt.write("\nd1_mini32.menu.FlashSize.8M.build.flash_size=8MB\n")
+        assert not CollectingCoreData("esp32", "3.2.0", str(setup_esp32_base)).flash_mismatches
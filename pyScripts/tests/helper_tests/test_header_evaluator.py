@@ -0,0 +1,142 @@
+"""Unit tests for header_evaluator.py"""
+from pathlib import Path
+from helper.header_evaluator import HeaderCache, HeaderEvaluator, HeaderScanner, HeaderTokenizer, parse_number
+
+def test_tokenize_define():
+    """Test tokenizing a #define line with comment."""
+    tokenizer = HeaderTokenizer()
+    tokens = tokenizer.tokenize("#  define PIN_RGB_LED (40)  // ->2812 RGB !!!")
+    assert tokens == ["#define", "PIN_RGB_LED", "(", "40", ")"]
+
+def test_tokenize_block_comment():
+    """Test block comments spanning several lines are dropped."""
+    tokenizer = HeaderTokenizer()
+    assert tokenizer.tokenize("static /* comment") == ["static"]
+    assert tokenizer.in_block_comment
+    assert not tokenizer.tokenize("#define LED_BUILTIN 2")
+    assert tokenizer.tokenize("end */ const") == ["const"]
+    assert not tokenizer.in_block_comment
+
+def test_parse_number():
+    """Test parsing of C integer literals."""
+    assert parse_number("13") == 13
+    assert parse_number("0x1F") == 31
+    assert parse_number("010") == 8
+    assert parse_number("2U") == 2
+
+def test_function_like_macro_is_ignored():
+    """Test function like macros are not stored as symbols."""
+    evaluator = HeaderEvaluator()
+    evaluator.feed_line("#define digitalPinToInterrupt(p) (((p)<40)?(p):-1)")
+    assert not evaluator.symbols
+
+def test_first_definition_wins():
+    """Test the first definition of a symbol is kept."""
+    evaluator = HeaderEvaluator()
+    evaluator.feed_line("static const uint8_t D13 = 21;")
+    evaluator.feed_line("#define D13 5")
+    assert evaluator.resolve("D13") == 21
+
+def test_find_symbol_expression():
+    """Test resolving LED_BUILTIN with nested symbols and SOC_GPIO_PIN_COUNT."""
+    evaluator = HeaderEvaluator({"SOC_GPIO_PIN_COUNT": 40})
+    lines = [
+        "static const uint8_t RGB_DATA = 18;",
+        "#define RGB_BUILTIN    (RGB_DATA + SOC_GPIO_PIN_COUNT)",
+        "static const uint8_t LED_BUILTIN = RGB_BUILTIN;",
+    ]
+    results = [evaluator.find_symbol(line, "LED_BUILTIN") for line in lines]
+    assert results == [None, None, 58]
+
+def test_find_symbol_unresolved():
+    """Test self references and unknown symbols are not resolved."""
+    evaluator = HeaderEvaluator()
+    assert evaluator.find_symbol("#define LED_BUILTIN LED_BUILTIN", "LED_BUILTIN") is None
+    assert evaluator.find_symbol("#define LED_BUILTIN _LED_BUILTIN", "LED_BUILTIN") is None
+    assert evaluator.find_symbol("static const int8_t LED_BUILTIN = -1;", "LED_BUILTIN") is None
+    assert evaluator.evaluate(["(", "2", "+"]) is None
+    assert evaluator.evaluate(["(", "2"]) is None
+    assert evaluator.evaluate(["0x1G"]) is None
+
+def test_scan_symbol():
+    """Test scanning the raw header buffer resolves symbols defined on other lines."""
+    header = b"""
+static const uint8_t PIN_RGB_LED = 8;
+/* LED_BUILTIN = 5 in a comment
+#define LED_BUILTIN 7 */
+static const uint8_t RGB_BUILTIN = SOC_GPIO_PIN_COUNT + PIN_RGB_LED;
+static const uint8_t LED_BUILTIN_2 = 3;
+static const uint8_t LED_BUILTIN = RGB_BUILTIN;
+#define LED_BUILTIN LED_BUILTIN
+"""
+    scanner = HeaderScanner(header, {"SOC_GPIO_PIN_COUNT": 40})
+    assert scanner.scan_symbol("LED_BUILTIN") == 48
+    assert "RGB_BUILTIN" in scanner.symbols
+    assert "D13" not in scanner.symbols
+
+def test_scan_symbol_line_comment():
+    """Test a block comment start in a line comment does not hide the following lines."""
+    header = b"""
+// pins are numbered /* like the silkscreen
+#define LED_BUILTIN 2
+/* // LED_BUILTIN in a block comment
+#define LED_BUILTIN 4 */
+"""
+    assert HeaderScanner(header).scan_symbol("LED_BUILTIN") == 2
+    assert HeaderScanner(header.replace(b"#define LED_BUILTIN 2\n", b"")).scan_symbol("LED_BUILTIN") is None
+
+def test_scan_symbol_unresolved():
+    """Test scanning a header without a resolvable definition."""
+    scanner = HeaderScanner(b"// LED_BUILTIN\n#define LED_BUILTIN UNKNOWN\n")
+    assert scanner.scan_symbol("LED_BUILTIN") is None
+    assert scanner.lookup("UNKNOWN") is None
+    assert "UNKNOWN" in scanner.undefined
+
+def test_header_cache_follows_includes(tmp_path: Path):
+    """Test quoted includes are followed and shared headers are read once."""
+    (tmp_path / "core" / "variants" / "common").mkdir(parents=True)
+    (tmp_path / "core" / "variants" / "common" / "pins_common.h").write_text(
+        "#define PIN_RGB_LED 8\n#define LED_BUILTIN_COMMON 5\n")
+    for variant in ("board_a", "board_b"):
+        (tmp_path / "core" / "variants" / variant).mkdir()
+        (tmp_path / "core" / "variants" / variant / "pins_arduino.h").write_text(
+            '#include <stdint.h>\n#include "../common/pins_common.h"\n'
+            "static const uint8_t LED_BUILTIN = SOC_GPIO_PIN_COUNT + PIN_RGB_LED;\n")
+    cache = HeaderCache(str(tmp_path / "core"), {"SOC_GPIO_PIN_COUNT": 40})
+    for variant in ("board_a", "board_b"):
+        header = cache.get(str(tmp_path / "core" / "variants" / variant / "pins_arduino.h"))
+        assert header is not None
+        assert header.scan_symbol("LED_BUILTIN") == 48
+    assert len(cache.headers) == 3
+    assert cache.get(str(tmp_path / "core" / "missing.h")) is None
+
+def test_header_cache_stays_in_core_tree(tmp_path: Path):
+    """Test includes outside of the core tree are not followed."""
+    (tmp_path / "outside.h").write_text("#define PIN_LED 2\n")
+    (tmp_path / "core").mkdir()
+    (tmp_path / "core" / "pins_arduino.h").write_text(
+        '#include "../outside.h"\n#define LED_BUILTIN PIN_LED\n')
+    cache = HeaderCache(str(tmp_path / "core"))
+    header = cache.get(str(tmp_path / "core" / "pins_arduino.h"))
+    assert header is not None
+    assert header.get_includes() == [(0, "../outside.h")]
+    assert header.scan_symbol("LED_BUILTIN") is None
+
+def test_scan_symbols():
+    """Test several symbols resolve like separate scans, also with comments mentioning other symbols."""
+    header = b"""
+#define TX 1 /* RX 5 */
+#define RX 3
+/* #define SDA 4
+*/ #define SDA 21 // SCL 5
+static const uint8_t SCL = SDA + 1;
+static const uint8_t MOSI2 = 9;
+static const uint8_t LED_BUILTIN = SOC_GPIO_PIN_COUNT + 8;
+"""
+    names = ["LED_BUILTIN", "SDA", "SCL", "TX", "RX", "MOSI", "SCK"]
+    expected = {name: HeaderScanner(header, {"SOC_GPIO_PIN_COUNT": 40}).scan_symbol(name) for name in names}
+    assert expected == {"LED_BUILTIN": 48, "SDA": 21, "SCL": 22, "TX": 1, "RX": 3, "MOSI": None, "SCK": None}
+    scanner = HeaderScanner(header, {"SOC_GPIO_PIN_COUNT": 40})
+    assert scanner.scan_symbols(names) == expected
+    # resolved symbols are reused
+    assert scanner.scan_symbols(["SDA", "MOSI2"]) == {"SDA": 21, "MOSI2": 9}
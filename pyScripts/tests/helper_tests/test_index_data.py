@@ -5,6 +5,7 @@ from pathlib import Path
 from unittest.mock import patch, MagicMock
 import pytest
 from helper.index_data import IndexData, get_core_list
+from helper.core_catalog import CoreCatalog, CoreCatalogEntry, load_core_catalog
 
 
 class TestIndexData:
@@ -80,7 +81,7 @@ class TestGetCoreList:
     @pytest.fixture
     def mock_index_data(self):
         """Mock index data for both cores."""
-        def side_effect(core_name: str) -> MagicMock:
+        def side_effect(core_name: str, _catalog: CoreCatalog | None = None) -> MagicMock:
             if core_name == "esp32":
                 data = "3.0.0"
             else:
@@ -125,3 +126,38 @@ class TestGetCoreList:
 
             assert esp8266_core["installed_version"] == "2.7.4"
             assert esp32_core["installed_version"] == "3.0.0"
+
+
+class TestCoreCatalog:
+    """Test cases for the configurable core catalog."""
+
+    def test_default_catalog(self):
+        """Test the default catalog contains esp8266 and esp32."""
+        catalog = load_core_catalog()
+        assert catalog.get_core_names() == ["esp8266", "esp32"]
+        assert catalog.get_entry("esp32").index_file_name == "package_esp32_index.json"
+        assert catalog.get_entry("esp8266").get_index_path("./esp_data") == \
+            "./esp_data/package_esp8266com_index.json"
+
+    def test_unknown_core(self):
+        """Test an unknown core raises a ValueError."""
+        with pytest.raises(ValueError):
+            load_core_catalog().get_entry("rp2040")
+
+    def test_custom_catalog(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+        """Test IndexData and get_core_list with a third party core."""
+        monkeypatch.chdir(tmp_path)
+        catalog = CoreCatalog([CoreCatalogEntry(
+            "rp2040", "https://github.com/earlephilhower/arduino-pico/releases/download/global/"
+            "package_rp2040_index.json")])
+        index_path = tmp_path / "esp_data" / "package_rp2040_index.json"
+        index_path.parent.mkdir(parents=True)
+        index_path.write_text(json.dumps(
+            {"packages": [{"name": "rp2040", "platforms": [{"version": "4.0.0"}]}]}), encoding="utf8")
+        core_list = get_core_list(catalog)
+        assert core_list == [{
+            "core": "rp2040:rp2040",
+            "installed_version": "4.0.0",
+            "latest_version": "4.0.0",
+            "core_name": "rp2040"
+        }]
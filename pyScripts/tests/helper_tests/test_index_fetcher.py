@@ -0,0 +1,92 @@
+"""Unit tests for index_fetcher.py with a local HTTP stand-in"""
+import asyncio
+import threading
+import time
+from pathlib import Path
+import pytest
+
+from helper.index_fetcher import AsyncFetcher, HttpTransport
+
+# pylint: disable=unused-import
+from tests.helper_tests.http_server_fixture import StandInServer, fixture_http_server # pyright: ignore
+
+class CountingTransport:
+    """Transport stand-in counting the parallel downloads."""
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def fetch(self, url: str, save_path: str, checksum: str = "", size: int = 0) -> None:
+        """Write the url to save_path."""
+        assert not checksum and not size
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(0.02)
+        Path(save_path).write_text(url, encoding="utf-8")
+        with self.lock:
+            self.in_flight -= 1
+
+    def close(self) -> None:
+        """Nothing to close."""
+
+class TestAsyncFetcher:
+    """Test cases for the AsyncFetcher."""
+    def test_fetch_indexes_concurrently(self, http_server: StandInServer, tmp_path: Path):
+        """Test several indexes are downloaded concurrently."""
+        http_server.latency = 0.2
+        urls: list[str] = []
+        for index in range(4):
+            http_server.files[f"/package_{index}_index.json"] = f'{{"index": {index}}}'.encode()
+            urls.append(f"{http_server.url}/package_{index}_index.json")
+        fetcher = AsyncFetcher(concurrency=4)
+        start = time.perf_counter()
+        paths = asyncio.run(fetcher.fetch_to_directory(urls, str(tmp_path)))
+        duration = time.perf_counter() - start
+        fetcher.close()
+        assert paths == [str(tmp_path / f"package_{index}_index.json") for index in range(4)]
+        assert Path(paths[3]).read_text(encoding="utf-8") == '{"index": 3}'
+        assert http_server.max_in_flight > 1
+        assert duration < 0.2 * 4
+
+    def test_concurrency_limit(self, tmp_path: Path):
+        """Test the number of parallel downloads is bounded."""
+        transport = CountingTransport()
+        fetcher = AsyncFetcher(transport, concurrency=2)
+        downloads = [(f"http://stand-in/{index}", str(tmp_path / str(index))) for index in range(6)]
+        asyncio.run(fetcher.fetch_all(downloads))
+        assert transport.max_in_flight == 2
+        assert (tmp_path / "5").read_text(encoding="utf-8") == "http://stand-in/5"
+
+    def test_fetch_error(self, http_server: StandInServer, tmp_path: Path):
+        """Test a missing file raises an OSError."""
+        fetcher = AsyncFetcher()
+        with pytest.raises(OSError):
+            asyncio.run(fetcher.fetch(f"{http_server.url}/missing.json", str(tmp_path / "missing.json")))
+        fetcher.close()
+
+class TestHttpTransport:
+    """Test cases for the HttpTransport connection pool."""
+    def test_connection_reuse_and_redirect(self, http_server: StandInServer, tmp_path: Path):
+        """Test redirects are followed and idle connections are reused."""
+        http_server.files["/archive.zip"] = b"zip content"
+        http_server.redirects["/latest.zip"] = "/archive.zip"
+        transport = HttpTransport(max_connections=2)
+        for index in range(3):
+            transport.fetch(f"{http_server.url}/latest.zip", str(tmp_path / f"{index}.zip"))
+        transport.close()
+        assert (tmp_path / "2.zip").read_bytes() == b"zip content"
+        assert http_server.requests == ["/latest.zip", "/archive.zip"] * 3
+        assert transport.num_of_connections == 1
+
+    def test_error_status(self, http_server: StandInServer, tmp_path: Path):
+        """Test an error status raises an OSError and saves nothing."""
+        http_server.files["/archive.zip"] = b"zip content"
+        transport = HttpTransport(max_connections=1)
+        with pytest.raises(OSError):
+            transport.fetch(f"{http_server.url}/missing.zip", str(tmp_path / "missing.zip"))
+        transport.fetch(f"{http_server.url}/archive.zip", str(tmp_path / "archive.zip"))
+        assert transport.request(f"{http_server.url}/missing.zip")[0] == 404
+        transport.close()
+        assert sorted(path.name for path in tmp_path.iterdir()) == ["archive.zip"]
@@ -0,0 +1,103 @@
+"""Unit tests for index_stream.py"""
+import io
+import json
+from typing import Any
+
+import pytest
+
+from helper.index_stream import _JsonReader, iter_platforms  # pyright: ignore[reportPrivateUsage]
+
+INDEX_DATA = {
+    "packages": [
+        {
+            "name": "esp32",
+            "maintainer": "Espressif Systems",
+            "platforms": [
+                {
+                    "name": "esp32",
+                    "architecture": "esp32",
+                    "version": "3.3.5",
+                    "url": "https://example.com/esp32-3.3.5.zip",
+                    "archiveFileName": "esp32-3.3.5.zip",
+                    "checksum": "SHA-256:0123",
+                    "size": "26000000",
+                    "boards": [{"name": "ESP32 Dev Board"}],
+                    "toolsDependencies": [{"packager": "esp32", "name": "esptool_py", "version": "5.1.0"}]
+                },
+                {"name": "esp32", "version": "3.3.4", "url": "https://example.com/esp32-3.3.4.zip"}
+            ],
+            "tools": [
+                {"name": "esptool_py", "version": "5.1.0",
+                 "systems": [{"host": "x86_64-pc-linux-gnu", "url": "u", "checksum": "c", "size": "1"}]}
+            ]
+        },
+        {
+            "tools": [],
+            "name": "rp2040",
+            "platforms": [{"name": "Raspberry Pi RP2040 Boards", "version": "4.0.0", "url": "r"}]
+        }
+    ]
+}
+
+@pytest.mark.parametrize("chunk_size", [7, 64, 64 * 1024])
+def test_iter_platforms(chunk_size: int):
+    """Test all platforms are yielded with their package name, independent of the chunk size."""
+    index = io.StringIO(json.dumps(INDEX_DATA, indent=4))
+    platforms = list(iter_platforms(index, chunk_size=chunk_size))
+    assert [(platform.package, platform.version) for platform in platforms] == [
+        ("esp32", "3.3.5"), ("esp32", "3.3.4"), ("rp2040", "4.0.0")]
+    latest = platforms[0]
+    assert latest.architecture == "esp32"
+    assert latest.url == "https://example.com/esp32-3.3.5.zip"
+    assert latest.archive_file_name == "esp32-3.3.5.zip"
+    assert latest.checksum == "SHA-256:0123"
+    assert latest.size == 26000000
+    assert platforms[1].size == 0
+
+def test_iter_platforms_latest_only():
+    """Test only the first platform of each package is yielded."""
+    index = io.StringIO(json.dumps(INDEX_DATA))
+    platforms = list(iter_platforms(index, latest_only=True))
+    assert [(platform.package, platform.version) for platform in platforms] == [
+        ("esp32", "3.3.5"), ("rp2040", "4.0.0")]
+
+def test_iter_platforms_stops_reading():
+    """Test the file is only read until the requested platform is found."""
+    data = json.dumps(INDEX_DATA) + " " * 100_000
+    index = io.StringIO(data)
+    platform = next(iter_platforms(index, latest_only=True, chunk_size=256))
+    assert platform.version == "3.3.5"
+    assert index.tell() < 1024
+
+@pytest.mark.parametrize("latest_only", [False, True])
+def test_iter_platforms_name_after_platforms(latest_only: bool):
+    """Test platforms in front of the package name get the name, a package without name gets ""."""
+    index_data = {"packages": [
+        {"platforms": [{"version": "3.3.5"}, {"version": "3.3.4"}], "tools": [], "name": "esp32"},
+        {"platforms": [{"version": "1.0.0"}]},
+        {"name": "esp8266", "platforms": [{"version": "3.1.2"}]}
+    ]}
+    platforms = list(iter_platforms(io.StringIO(json.dumps(index_data)), latest_only=latest_only, chunk_size=16))
+    expected = [("esp32", "3.3.5"), ("esp32", "3.3.4"), ("", "1.0.0"), ("esp8266", "3.1.2")]
+    assert [(platform.package, platform.version) for platform in platforms] == \
+        [entry for entry in expected if not latest_only or entry[1] != "3.3.4"]
+
+@pytest.mark.parametrize("latest_only", [False, True])
+def test_iter_platforms_skips_tools(monkeypatch: pytest.MonkeyPatch, latest_only: bool):
+    """Test only the yielded platforms are decoded, tools and braces in their strings are skipped."""
+    index_data = json.loads(json.dumps(INDEX_DATA))
+    index_data["packages"][0]["tools"].append({"name": "tool } with { braces", "systems": [{"url": "]"}]})
+    decoded: list[Any] = []
+    decode_object = _JsonReader.decode_object
+    def count_decode(reader: _JsonReader) -> Any:
+        value = decode_object(reader)
+        decoded.append(value)
+        return value
+    monkeypatch.setattr(_JsonReader, "decode_object", count_decode)
+    platforms = list(iter_platforms(io.StringIO(json.dumps(index_data)), latest_only=latest_only, chunk_size=8))
+    assert len(decoded) == len(platforms) == (2 if latest_only else 3)
+    assert all("systems" not in value for value in decoded)
+
+def test_iter_platforms_empty_index():
+    """Test an index without packages yields nothing."""
+    assert not list(iter_platforms(io.StringIO('{"packages": []}')))
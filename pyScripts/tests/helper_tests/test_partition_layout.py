@@ -0,0 +1,95 @@
+"""Unit tests for partition_layout.py"""
+from typing import Any
+import pytest
+
+from helper.partition_layout import (SchemeLayouts, SchemeStore, canonicalize_rows, compute_layout,
+                                     get_scheme_boards, parse_size)
+
+def row(name: str, type_: str, subtype: str, offset: str, size: str) -> dict[str, str]:
+    """Create a row of a partition csv file."""
+    return {"name": name, "type": type_, "subtype": subtype, "offset": offset, "size": size}
+
+DEFAULT_4MB = [
+    row("nvs", "data", "nvs", "0x9000", "0x5000"),
+    row("otadata", "data", "ota", "0xe000", "0x2000"),
+    row("app0", "app", "ota_0", "0x10000", "0x140000"),
+    row("app1", "app", "ota_1", "0x150000", "0x140000"),
+    row("spiffs", "data", "spiffs", "0x290000", "0x160000"),
+    row("coredump", "data", "coredump", "0x3F0000", "0x10000"),
+]
+NO_OTA_FAT = [
+    row("nvs", "data", "nvs", "", "20K"),
+    row("factory", "app", "factory", "", "3M"),
+    row("ffat", "data", "fat", "", "0xC0000"),
+]
+BOARD_PARTITIONS: dict[str, dict[str, Any]] = {
+    "esp32": {"default": "default", "schemes": {"default": {"build": "default"},
+                                                "no_ota_fat": {"build": "no_ota_fat"}}},
+    "esp32c3": {"default": "default", "schemes": {}},
+    "esp32s3": {"default": "no_ota_fat"},
+}
+
+class TestPartitionLayout:
+    """Test cases for the computed scheme layouts and the reverse index."""
+    def test_parse_size(self):
+        """Test hex, decimal and unit sizes."""
+        assert parse_size("0x5000") == 0x5000
+        assert parse_size(" 4096 ") == 4096
+        assert parse_size("1500K") == 1500 * 1024
+        assert parse_size("4M") == 4 * 1024 * 1024
+        with pytest.raises(ValueError):
+            parse_size("")
+
+    def test_compute_layout(self):
+        """Test the sizes of a two OTA slot scheme."""
+        layout = compute_layout(DEFAULT_4MB)
+        assert layout["app"] == 0x140000
+        assert layout["ota_slots"] == 2
+        assert layout["ota_data"] == 0x2000
+        assert layout["spiffs"] == 0x160000
+        assert layout["data"] == 0x5000 + 0x2000 + 0x160000 + 0x10000
+        assert layout["end"] == 0x400000
+
+    def test_compute_layout_without_offsets(self):
+        """Test partitions without offsets are aligned after the previous one."""
+        layout = compute_layout(NO_OTA_FAT)
+        assert layout["app"] == 3 * 1024 * 1024
+        assert layout["ota_slots"] == 0
+        assert layout["fat"] == 0xC0000
+        # nvs 0x9000-0xe000, factory aligned to 0x10000, ffat after it
+        assert layout["end"] == 0x10000 + 3 * 1024 * 1024 + 0xC0000
+
+    def test_scheme_boards(self):
+        """Test the reverse index contains default and menu schemes."""
+        assert get_scheme_boards(BOARD_PARTITIONS) == {"default": ["esp32", "esp32c3"],
+                                                       "no_ota_fat": ["esp32", "esp32s3"]}
+
+    def test_find_and_json(self):
+        """Test the queries and the compact JSON round trip."""
+        layouts = SchemeLayouts.from_schemes({"default": DEFAULT_4MB, "no_ota_fat": NO_OTA_FAT,
+                                              "empty": []}, BOARD_PARTITIONS)
+        assert list(layouts.layouts) == ["default", "no_ota_fat"]
+        assert layouts.find_schemes("app", 3 * 1024 * 1024) == ["no_ota_fat"]
+        assert layouts.find_boards("app", 3 * 1024 * 1024) == ["esp32", "esp32s3"]
+        loaded = SchemeLayouts.from_json(layouts.to_json())
+        assert loaded.layouts == layouts.layouts
+        assert loaded.boards == layouts.boards
+
+    def test_scheme_store(self):
+        """Test schemes equal after normalization share one layout and the JSON round trip."""
+        no_ota_fat_copy = [row(" nvs", "DATA", "nvs ", "", "0x5000"), row("factory", "app", "factory", "", "3072K"),
+                           row("ffat", "data", "fat", "", "786432")]
+        assert canonicalize_rows(no_ota_fat_copy) == canonicalize_rows(NO_OTA_FAT)
+        assert canonicalize_rows(NO_OTA_FAT)[1] == row("factory", "app", "factory", "", "0x300000")
+        store = SchemeStore.from_schemes({"default": DEFAULT_4MB, "no_ota_fat": NO_OTA_FAT,
+                                          "ffat_copy": no_ota_fat_copy})
+        assert len(store.layouts) == 2
+        assert store.aliases["ffat_copy"] == store.aliases["no_ota_fat"] != store.aliases["default"]
+        assert store.get_builds(store.aliases["no_ota_fat"]) == ["ffat_copy", "no_ota_fat"]
+        # the rows keep the text of the csv file, e.g. lower case hex offsets
+        assert store.get_rows("default") == DEFAULT_4MB
+        assert store.get_rows("no_ota_fat") == no_ota_fat_copy
+        assert store.get_rows("unknown") is None
+        loaded = SchemeStore.from_json(store.to_json())
+        assert loaded.expand() == store.expand()
+        assert compute_layout(store.expand()["ffat_copy"]) == compute_layout(NO_OTA_FAT)
@@ -0,0 +1,133 @@
+"""Unit tests for publish_data.py"""
+import json
+import os
+import re
+from pathlib import Path
+import pytest
+
+from helper.publish_data import diff_records, index_records, publish_data, record_digest, \
+    hashed_file_name, publish_directory, publish_hashed_files, MANIFEST_FILE
+
+BOARDS = [
+    {"name": "D1 Mini", "variant": "d1_mini", "mcu": "esp8266", "flash_size": ["4MB"],
+     "led_builtin": "2", "board": "d1_mini"},
+    {"name": "NodeMCU", "variant": "nodemcu", "mcu": "esp8266", "flash_size": ["4MB"],
+     "led_builtin": "2", "board": "nodemcu"},
+]
+
+def write_json(path: Path, data: object):
+    """Write json data like the exporters."""
+    path.write_text(json.dumps(data, indent=4), encoding="utf-8")
+
+class TestPublishData:
+    """Test cases for the record diff and the publishing of changed files."""
+    def test_record_digest(self):
+        """Test the digest does not depend on the key order."""
+        assert record_digest({"a": 1, "b": [2]}) == record_digest({"b": [2], "a": 1})
+        assert record_digest({"a": 1}) != record_digest({"a": 2})
+
+    def test_index_records(self):
+        """Test boards, cores and partitions are keyed by their identifier."""
+        assert list(index_records(BOARDS)) == ["d1_mini", "nodemcu"]
+        assert list(index_records([{"core_name": "esp32"}])) == ["esp32"]
+        assert list(index_records({"esp32c3": {}})) == ["esp32c3"]
+        assert not index_records(None)
+
+    def test_diff_scheme_store(self):
+        """Test partition schemes stored as layouts and aliases are compared by scheme build name."""
+        nvs = [{"name": "nvs", "offset": "0x9000", "size": "0x5000"}]
+        spiffs = nvs + [{"name": "spiffs", "offset": "0x10000", "size": "0x3F0000"}]
+        old_store = {"layouts": {"a": nvs}, "aliases": {"default": "a", "min_spiffs": "a"}}
+        new_store = {"layouts": {"a": nvs, "b": spiffs},
+                     "aliases": {"default": "a", "min_spiffs": "b", "huge_app": "a"}}
+        assert list(index_records(new_store)) == ["default", "min_spiffs", "huge_app"]
+        diff = diff_records(old_store, new_store)
+        assert diff["added"] == ["huge_app"]
+        assert not diff["removed"]
+        assert list(diff["changed"]) == ["min_spiffs"]
+        # the schemes of the previous export without alias map are the same records
+        assert not diff_records({"default": nvs, "min_spiffs": nvs}, old_store)["changed"]
+
+    def test_diff_records(self):
+        """Test added, removed and changed boards with their changed fields."""
+        new_boards = [dict(BOARDS[0], led_builtin="N/A", mcu="esp8285"),
+                      dict(BOARDS[1], board="nodemcuv2")]
+        diff = diff_records(BOARDS, new_boards)
+        assert diff["added"] == ["nodemcuv2"]
+        assert diff["removed"] == ["nodemcu"]
+        assert diff["changed"] == {"d1_mini": ["led_builtin", "mcu"]}
+
+    def test_publish_only_changed(self, tmp_path: Path):
+        """Test unchanged files are not written again."""
+        source = tmp_path / "esp_data"
+        target = tmp_path / "data"
+        source.mkdir()
+        target.mkdir()
+        write_json(source / "esp8266.json", BOARDS)
+        write_json(source / "esp32.json", [])
+        write_json(target / "esp8266.json", BOARDS)
+        os.utime(target / "esp8266.json", ns=(0, 0))
+
+        changelog = publish_data(str(source), str(target), ["esp8266.json", "esp32.json"])
+        assert not changelog["esp8266.json"]["written"]
+        assert (target / "esp8266.json").stat().st_mtime_ns == 0
+        assert changelog["esp32.json"]["written"]
+        assert (target / "esp32.json").read_text(encoding="utf-8") == "[]"
+
+        write_json(source / "esp8266.json", BOARDS[:1])
+        changelog = publish_data(str(source), str(target), ["esp8266.json"])
+        assert changelog["esp8266.json"] == {"added": [], "removed": ["nodemcu"], "changed": {},
+                                             "written": True}
+        assert json.loads((target / "esp8266.json").read_text(encoding="utf-8")) == BOARDS[:1]
+
+    def test_publish_missing_source(self, tmp_path: Path):
+        """Test a missing generated file raises an error."""
+        with pytest.raises(ValueError):
+            publish_data(str(tmp_path), str(tmp_path), ["esp32.json"])
+
+class TestHashedFiles:
+    """Test cases for the content hashed files and the manifest."""
+    def test_manifest(self, tmp_path: Path):
+        """Test hashed files are written once, the previous generation is removed by the next publish."""
+        write_json(tmp_path / "esp32.json", BOARDS)
+        manifest = publish_hashed_files(str(tmp_path), ["esp32.json"])
+        hashed_name = manifest["esp32.json"]
+        assert hashed_name == hashed_file_name("esp32.json", (tmp_path / "esp32.json").read_bytes())
+        assert re.fullmatch(r"esp32\.[0-9a-f]{12}\.json", hashed_name)
+        assert (tmp_path / hashed_name).read_bytes() == (tmp_path / "esp32.json").read_bytes()
+        assert json.loads((tmp_path / MANIFEST_FILE).read_text(encoding="utf-8")) == manifest
+
+        os.utime(tmp_path / MANIFEST_FILE, ns=(0, 0))
+        assert publish_hashed_files(str(tmp_path), ["esp32.json"]) == manifest
+        assert (tmp_path / MANIFEST_FILE).stat().st_mtime_ns == 0
+
+        write_json(tmp_path / "esp32.json", BOARDS[:1])
+        new_manifest = publish_hashed_files(str(tmp_path), ["esp32.json"])
+        assert new_manifest["esp32.json"] != hashed_name
+        # clients of the previous manifest can still fetch its files
+        assert (tmp_path / hashed_name).exists()
+        assert (tmp_path / new_manifest["esp32.json"]).exists()
+        assert publish_hashed_files(str(tmp_path), ["esp32.json"]) == new_manifest
+        assert (tmp_path / hashed_name).exists()
+
+        write_json(tmp_path / "esp32.json", BOARDS[1:])
+        last_manifest = publish_hashed_files(str(tmp_path), ["esp32.json"])
+        assert sorted(path.name for path in tmp_path.glob("esp32.*.json")) == \
+            sorted([new_manifest["esp32.json"], last_manifest["esp32.json"]])
+
+    def test_publish_directory(self, tmp_path: Path):
+        """Test only changed files of a directory are written and removed files are deleted."""
+        source = tmp_path / "esp_data" / "esp32_pins"
+        target = tmp_path / "web-app" / "esp32_pins"
+        source.mkdir(parents=True)
+        write_json(source / "c3_mini.json", {"LED_BUILTIN": 7})
+        write_json(source / "d1_mini32.json", {"LED_BUILTIN": 2})
+        assert publish_directory(str(source), str(target)) == \
+            {"written": ["c3_mini.json", "d1_mini32.json"], "removed": []}
+        write_json(source / "c3_mini.json", {"LED_BUILTIN": 8})
+        (source / "d1_mini32.json").unlink()
+        assert publish_directory(str(source), str(target)) == \
+            {"written": ["c3_mini.json"], "removed": ["d1_mini32.json"]}
+        assert sorted(path.name for path in target.iterdir()) == ["c3_mini.json"]
+        with pytest.raises(ValueError):
+            publish_directory(str(tmp_path / "missing"), str(target))
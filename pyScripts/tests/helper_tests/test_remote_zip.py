@@ -0,0 +1,87 @@
+"""Unit tests for remote_zip.py"""
+import hashlib
+import io
+import random
+import zipfile
+from pathlib import Path
+import pytest
+
+from helper.index_fetcher import HttpTransport, RangeNotSupported
+from helper.remote_zip import ArchiveSource, RangeOptions, RemoteFile, extract_remote_members
+
+# pylint: disable=unused-import
+from tests.helper_tests.http_server_fixture import StandInServer, fixture_http_server # pyright: ignore
+
+BOARDS_TXT = b"d1_mini32.name=WEMOS D1 MINI ESP32\n" * 50
+PINS_ARDUINO = b"static const uint8_t LED_BUILTIN = 2;\n"
+
+def create_archive() -> bytes:
+    """Create a core archive with large members which are not needed."""
+    buffer = io.BytesIO()
+    random_bytes = random.Random(42)
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("esp32-core-1.0/boards.txt", BOARDS_TXT)
+        for index in range(20):
+            archive.writestr(f"esp32-core-1.0/tools/sdk/lib{index}.a", random_bytes.randbytes(50_000))
+        archive.writestr("esp32-core-1.0/variants/d1_mini32/pins_arduino.h", PINS_ARDUINO)
+    return buffer.getvalue()
+
+def is_wanted(name: str) -> bool:
+    """Filter of the needed members."""
+    return not name.endswith(".a")
+
+class TestRemoteZip:
+    """Test cases for the range based remote zip reader."""
+    def test_remote_file(self, http_server: StandInServer):
+        """Test seek and read of a remote file, fetched ranges are reused."""
+        http_server.files["/data.bin"] = bytes(range(256)) * 1000
+        transport = HttpTransport()
+        with RemoteFile(transport, f"{http_server.url}/data.bin", RangeOptions(block_size=1000)) as remote_file:
+            assert remote_file.size == 256_000
+            assert remote_file.seek(-2, io.SEEK_END) == 255_998
+            assert remote_file.read() == bytes([254, 255])
+            remote_file.seek(10)
+            assert remote_file.read(5) == bytes(range(10, 15))
+            assert remote_file.read(5) == bytes(range(15, 20))
+            assert remote_file.read(0) == b""
+            assert remote_file.num_of_requests == 2
+            assert remote_file.bytes_fetched == 65557 + 1000
+        assert http_server.ranges == ["bytes=-65557", "bytes=10-1009"]
+        transport.close()
+
+    def test_extract_members_with_ranges(self, http_server: StandInServer, tmp_path: Path):
+        """Test only the central directory and the wanted members are fetched."""
+        archive = create_archive()
+        http_server.files["/esp32-core-1.0.zip"] = archive
+        transport = HttpTransport()
+        with RemoteFile(transport, f"{http_server.url}/esp32-core-1.0.zip") as remote_file:
+            assert remote_file.size == len(archive)
+        names = extract_remote_members(ArchiveSource(f"{http_server.url}/esp32-core-1.0.zip"), is_wanted,
+                                       str(tmp_path), transport)
+        transport.close()
+        assert names == ["esp32-core-1.0/boards.txt", "esp32-core-1.0/variants/d1_mini32/pins_arduino.h"]
+        assert (tmp_path / "esp32-core-1.0" / "boards.txt").read_bytes() == BOARDS_TXT
+        assert (tmp_path / "esp32-core-1.0" / "variants" / "d1_mini32" / "pins_arduino.h").read_bytes() \
+            == PINS_ARDUINO
+        assert not (tmp_path / "esp32-core-1.0" / "tools").exists()
+        assert all(http_server.ranges)
+        assert len(http_server.ranges) <= 5
+
+    def test_fallback_without_ranges(self, http_server: StandInServer, tmp_path: Path):
+        """Test the archive is downloaded completely if the server does not support ranges."""
+        archive = create_archive()
+        http_server.files["/esp32-core-1.0.zip"] = archive
+        http_server.accept_ranges = False
+        transport = HttpTransport()
+        with pytest.raises(RangeNotSupported):
+            RemoteFile(transport, f"{http_server.url}/esp32-core-1.0.zip")
+        source = ArchiveSource(f"{http_server.url}/esp32-core-1.0.zip",
+                               "SHA-256:" + hashlib.sha256(archive).hexdigest(), len(archive))
+        names = extract_remote_members(source, is_wanted, str(tmp_path), transport)
+        assert len(names) == 2
+        assert (tmp_path / "esp32-core-1.0.zip").read_bytes() == archive
+        # the verified archive is reused
+        requests = len(http_server.requests)
+        assert len(extract_remote_members(source, is_wanted, str(tmp_path), transport)) == 2
+        assert len(http_server.requests) == requests + 1
+        transport.close()
@@ -0,0 +1,68 @@
+"""Unit tests for variant_pins.py"""
+import json
+from pathlib import Path
+import pytest
+
+from helper.board_data import BoardData
+from helper.header_evaluator import HeaderCache
+from helper.variant_pins import VariantPins
+
+def create_board(board_id: str, variant: str) -> BoardData:
+    """Create a board of a variant."""
+    board = BoardData()
+    board.set_board_id(board_id)
+    board.set_variant(variant)
+    return board
+
+@pytest.fixture(name="core_path")
+def fixture_core_path(tmp_path: Path) -> Path:
+    """Core with two variants sharing the pins of an included header."""
+    core_path = tmp_path / "esp32"
+    (core_path / "variants" / "common").mkdir(parents=True)
+    (core_path / "variants" / "common" / "pins_common.h").write_text(
+        "static const uint8_t TX = 43;\nstatic const uint8_t RX = 44;\n"
+        "static const uint8_t SDA = 8;\nstatic const uint8_t SCL = 9;\n")
+    (core_path / "variants" / "s3_rgb").mkdir()
+    (core_path / "variants" / "s3_rgb" / "pins_arduino.h").write_text(
+        '#include "../common/pins_common.h"\n#define PIN_RGB_LED 48\n'
+        "static const uint8_t LED_BUILTIN = SOC_GPIO_PIN_COUNT + PIN_RGB_LED;\n"
+        "#define RGB_BUILTIN LED_BUILTIN\n")
+    (core_path / "variants" / "c3_mini").mkdir()
+    (core_path / "variants" / "c3_mini" / "pins_arduino.h").write_text(
+        '#include "../common/pins_common.h"\n#define LED_BUILTIN 7\n'
+        "static const uint8_t SS = 5;\nstatic const uint8_t MOSI = 4;\n"
+        "static const uint8_t MISO = 3;\nstatic const uint8_t SCK = 2;\n")
+    return core_path
+
+class TestVariantPins:
+    """Test cases for the pin tables of the variants."""
+    def test_get_tables(self, core_path: Path):
+        """Test all pins of a variant and its includes, each variant and header is resolved once."""
+        cache = HeaderCache(str(core_path), {"SOC_GPIO_PIN_COUNT": 49})
+        variant_pins = VariantPins(str(core_path), cache)
+        boards = [create_board("s3_a", "s3_rgb"), create_board("s3_b", "s3_rgb"),
+                  create_board("c3", "c3_mini"), create_board("other", "missing"), create_board("na", "N/A")]
+        tables = variant_pins.get_tables(boards)
+        assert tables == {
+            "c3_mini": {"LED_BUILTIN": 7, "SDA": 8, "SCL": 9, "TX": 43, "RX": 44,
+                        "SS": 5, "MOSI": 4, "MISO": 3, "SCK": 2},
+            "s3_rgb": {"LED_BUILTIN": 97, "RGB_BUILTIN": 97, "SDA": 8, "SCL": 9, "TX": 43, "RX": 44},
+        }
+        assert list(tables["c3_mini"]) == ["LED_BUILTIN", "SDA", "SCL", "TX", "RX", "SS", "MOSI", "MISO", "SCK"]
+        assert variant_pins.tables["missing"] is None
+        assert len(cache.headers) == 4
+        assert variant_pins.get_table("s3_rgb") is tables["s3_rgb"]
+
+    def test_export_json(self, core_path: Path, tmp_path: Path):
+        """Test a json file per variant, files of removed variants are deleted."""
+        variant_pins = VariantPins(str(core_path), HeaderCache(str(core_path)), ["LED_BUILTIN", "SDA"])
+        output_path = tmp_path / "esp32_pins"
+        output_path.mkdir()
+        (output_path / "removed_variant.json").write_text("{}")
+        file_names = variant_pins.export_json(str(output_path), [create_board("c3", "c3_mini")])
+        assert file_names == ["c3_mini.json"]
+        assert sorted(path.name for path in output_path.iterdir()) == ["c3_mini.json"]
+        assert json.loads((output_path / "c3_mini.json").read_text(encoding="utf8")) == \
+            {"LED_BUILTIN": 7, "SDA": 8}
+        with pytest.raises(ValueError):
+            variant_pins.export_json(str(output_path), [create_board("bad", "../variants/c3_mini")])
@@ -0,0 +1,73 @@
+"""Unit tests for verified_download.py"""
+import hashlib
+import io
+import os
+import asyncio
+from pathlib import Path
+import pytest
+
+from helper.index_fetcher import AsyncFetcher
+from helper.index_stream import PlatformEntry
+from helper.verified_download import (ChecksumError, file_matches_checksum, parse_checksum,
+                                      save_stream_verified)
+
+# pylint: disable=unused-import
+from tests.helper_tests.http_server_fixture import StandInServer, fixture_http_server # pyright: ignore
+
+ARCHIVE = b"archive content" * 1000
+ARCHIVE_CHECKSUM = "SHA-256:" + hashlib.sha256(ARCHIVE).hexdigest()
+
+def test_parse_checksum():
+    """Test splitting the package index checksum."""
+    assert parse_checksum("SHA-256:ABCD") == ("sha256", "abcd")
+    with pytest.raises(ValueError):
+        parse_checksum("abcd")
+
+def test_save_stream_verified(tmp_path: Path):
+    """Test a matching stream is saved and no temporary file is left."""
+    save_path = tmp_path / "esp32.zip"
+    save_stream_verified(io.BytesIO(ARCHIVE), str(save_path), ARCHIVE_CHECKSUM, len(ARCHIVE))
+    assert save_path.read_bytes() == ARCHIVE
+    assert os.listdir(tmp_path) == ["esp32.zip"]
+    assert file_matches_checksum(str(save_path), ARCHIVE_CHECKSUM, len(ARCHIVE))
+    assert not file_matches_checksum(str(save_path), ARCHIVE_CHECKSUM, len(ARCHIVE) + 1)
+    assert not file_matches_checksum(str(tmp_path / "missing.zip"), ARCHIVE_CHECKSUM)
+
+@pytest.mark.parametrize("checksum, size", [
+    ("SHA-256:" + "0" * 64, len(ARCHIVE)),
+    (ARCHIVE_CHECKSUM, len(ARCHIVE) - 1),
+])
+def test_save_stream_verified_mismatch(tmp_path: Path, checksum: str, size: int):
+    """Test a wrong checksum or size keeps the existing file and removes the temporary file."""
+    save_path = tmp_path / "esp32.zip"
+    save_path.write_bytes(b"old archive")
+    with pytest.raises(ChecksumError):
+        save_stream_verified(io.BytesIO(ARCHIVE), str(save_path), checksum, size)
+    assert save_path.read_bytes() == b"old archive"
+    assert os.listdir(tmp_path) == ["esp32.zip"]
+
+def test_fetch_platforms_skips_present_archive(http_server: StandInServer, tmp_path: Path):
+    """Test the archive is downloaded once and skipped if it matches the index checksum."""
+    http_server.files["/esp32-3.3.5.zip"] = ARCHIVE
+    platform = PlatformEntry.from_json("esp32", {"version": "3.3.5", "url": f"{http_server.url}/esp32-3.3.5.zip",
+                                       "checksum": ARCHIVE_CHECKSUM, "size": str(len(ARCHIVE))})
+    archive_path = str(tmp_path / "esp32-3.3.5.zip")
+    # the second fetcher finds the archive of the first one
+    for skipped in ([], [archive_path]):
+        fetcher = AsyncFetcher()
+        paths = asyncio.run(fetcher.fetch_platforms([platform], str(tmp_path)))
+        fetcher.close()
+        assert paths == [archive_path]
+        assert fetcher.skipped == skipped
+    assert http_server.requests == ["/esp32-3.3.5.zip"]
+
+def test_fetch_platforms_checksum_error(http_server: StandInServer, tmp_path: Path):
+    """Test a corrupted download is not saved."""
+    http_server.files["/esp32-3.3.5.zip"] = ARCHIVE[:-1] + b"X"
+    platform = PlatformEntry.from_json("esp32", {"url": f"{http_server.url}/esp32-3.3.5.zip",
+                                       "checksum": ARCHIVE_CHECKSUM})
+    fetcher = AsyncFetcher()
+    with pytest.raises(ChecksumError):
+        asyncio.run(fetcher.fetch_platforms([platform], str(tmp_path)))
+    fetcher.close()
+    assert not os.listdir(tmp_path)
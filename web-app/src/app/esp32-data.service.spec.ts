@@ -1,6 +1,6 @@
 import { TestBed } from '@angular/core/testing';
 
-import { Esp32DataService } from './esp32-data.service';
+import { Esp32DataService, PartitionEntry, expandSchemes } from './esp32-data.service';
 
 describe('Esp32DataService', () => {
   let service: Esp32DataService;
@@ -13,4 +13,14 @@ describe('Esp32DataService', () => {
   it('should be created', () => {
     expect(service).toBeTruthy();
   });
+
+  it('should expand the scheme aliases', () => {
+    const nvs: PartitionEntry = { name: 'nvs', type: 'data', subtype: 'nvs', offset: '0x9000', size: '0x5000' };
+    const schemes = expandSchemes({
+      layouts: { '0123456789ab': [nvs] },
+      aliases: { default: '0123456789ab', default_copy: '0123456789ab', unknown: 'ba9876543210' },
+    });
+    expect(schemes).toEqual({ default: [nvs], default_copy: [nvs] });
+    expect(service.defaultSchemes['minimal'].length).toBeGreaterThan(0);
+  });
 });
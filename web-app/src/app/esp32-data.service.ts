@@ -10,7 +10,7 @@ import { BoardInfo } from './board-overview/board-overview.component';
 })
 export class Esp32DataService {
   partitionsData: BoardPartitionsInfo = esp32_partitions as BoardPartitionsInfo;
-  defaultSchemes: DefaultSchemes = esp32_schemes as DefaultSchemes;
+  defaultSchemes: DefaultSchemes = expandSchemes(esp32_schemes as SchemeStore);
   boardsData: BoardInfo[] = board_data as BoardInfo[];
 }
 
@@ -37,4 +37,25 @@ export interface PartitionEntry {
   size: string;
 }
 
-type DefaultSchemes = Record<string, PartitionEntry[]>;
\ No newline at end of file
+type DefaultSchemes = Record<string, PartitionEntry[]>;
+
+/**
+ * Distinct partition layouts by id and the layout id of each scheme build name
+ */
+export interface SchemeStore {
+  layouts: Record<string, PartitionEntry[]>;
+  aliases: Record<string, string>;
+}
+
+/**
+ * Get the partition entries of each scheme build name
+ */
+export function expandSchemes(store: SchemeStore): DefaultSchemes {
+  const schemes: DefaultSchemes = {};
+  for (const [build, layoutId] of Object.entries(store.aliases)) {
+    if (layoutId in store.layouts) {
+      schemes[build] = store.layouts[layoutId];
+    }
+  }
+  return schemes;
+}
\ No newline at end of file
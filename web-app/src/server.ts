@@ -6,6 +6,7 @@ import {
 } from '@angular/ssr/node';
 import express from 'express';
 import { join } from 'node:path';
+import { setDataCacheHeaders } from './static-cache';
 
 const browserDistFolder = join(import.meta.dirname, '../browser');
 
@@ -26,12 +27,14 @@ const angularApp = new AngularNodeAppEngine();
 
 /**
  * Serve static files from /browser
+ * manifest.json and the data files without content hash are revalidated, see static-cache.ts
  */
 app.use(
   express.static(browserDistFolder, {
     maxAge: '1y',
     index: false,
     redirect: false,
+    setHeaders: setDataCacheHeaders,
   }),
 );
 
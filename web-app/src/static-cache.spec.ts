@@ -0,0 +1,25 @@
+import { IMMUTABLE_CACHE_CONTROL, REVALIDATE_CACHE_CONTROL, getDataCacheControl, setDataCacheHeaders } from './static-cache';
+
+describe('getDataCacheControl', () => {
+  it('should cache only the hashed data files forever', () => {
+    expect(getDataCacheControl('/dist/browser/data/esp32.0123456789ab.json')).toBe(IMMUTABLE_CACHE_CONTROL);
+    expect(getDataCacheControl('/dist/browser/data/manifest.json')).toBe(REVALIDATE_CACHE_CONTROL);
+    expect(getDataCacheControl('/dist/browser/data/esp32.json')).toBe(REVALIDATE_CACHE_CONTROL);
+    expect(getDataCacheControl('/dist/browser/data/esp32.0123.json')).toBe(REVALIDATE_CACHE_CONTROL);
+    expect(getDataCacheControl('/dist/browser/main-ABCDEF12.js')).toBeNull();
+  });
+});
+
+describe('setDataCacheHeaders', () => {
+  it('should set the cache control header of json files', () => {
+    const headers = new Map<string, string>();
+    const res = { setHeader: (name: string, value: string) => headers.set(name, value) };
+    setDataCacheHeaders(res, '/data/manifest.json');
+    expect(headers.get('Cache-Control')).toBe('no-cache');
+    setDataCacheHeaders(res, '/data/esp8266.fedcba987654.json');
+    expect(headers.get('Cache-Control')).toBe('public, max-age=31536000, immutable');
+    headers.clear();
+    setDataCacheHeaders(res, '/favicon.ico');
+    expect(headers.size).toBe(0);
+  });
+});
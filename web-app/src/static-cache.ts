@@ -0,0 +1,31 @@
+/**
+ * Cache control of the static files of the data directory.
+ * Content hashed data files (see `publish_data.py --hashed`), e.g. `esp32.0123456789ab.json`, never change
+ * and are cached forever. `manifest.json` and the data files without hash change with every publish,
+ * clients have to revalidate them to find the new hashed names.
+ */
+export const IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable';
+export const REVALIDATE_CACHE_CONTROL = 'no-cache';
+
+const HASHED_DATA_FILE = /\.[0-9a-f]{12}\.json$/;
+
+/**
+ * Get the cache control of a json file, other static files keep the max age of express.static.
+ * @returns cache control or null for files which are not json
+ */
+export function getDataCacheControl(path: string): string | null {
+  if (!path.endsWith('.json')) {
+    return null;
+  }
+  return HASHED_DATA_FILE.test(path) ? IMMUTABLE_CACHE_CONTROL : REVALIDATE_CACHE_CONTROL;
+}
+
+/**
+ * setHeaders handler of express.static, the header set here is kept by express.static.
+ */
+export function setDataCacheHeaders(res: { setHeader(name: string, value: string): unknown }, path: string): void {
+  const cacheControl = getDataCacheControl(path);
+  if (cacheControl) {
+    res.setHeader('Cache-Control', cacheControl);
+  }
+}